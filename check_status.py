@@ -3,47 +3,59 @@
 Utility to check execution status of a running conversion
 """
 
+import re
 import sys
 from src.agents.orchestrator import get_execution_status
 
+# Matches the "triggering words" line of a safety block error message
+_TRIGGER_LINE_RE = re.compile(r'^.*triggering words.*$', re.IGNORECASE | re.MULTILINE)
+
+# Report separator
+_SEP = "=" * 60
+
 def main():
     status = get_execution_status()
     
-    print("=" * 60)
-    print("Conversion Execution Status")
-    print("=" * 60)
+    # Build the whole report first and emit it with a single writelines call
+    lines = [
+        _SEP + "\n",
+        "Conversion Execution Status\n",
+        _SEP + "\n",
+        f"\nCurrent Phase: {status.current_phase or 'Not Started'}\n",
+        f"Progress: {status.progress_percentage}%\n"
+    ]
     
-    print(f"\nCurrent Phase: {status['current_phase'] or 'Not Started'}")
-    print(f"Progress: {status['progress_percentage']}%")
+    if status.current_file:
+        lines.append(f"Current File: {status.current_file}\n")
     
-    if status['current_file']:
-        print(f"Current File: {status['current_file']}")
+    lines.append(f"\nFiles: {status.files_processed}/{status.files_total}\n")
     
-    print(f"\nFiles: {status['files_processed']}/{status['files_total']}")
+    if status.llm_cache_hits or status.llm_cache_misses:
+        lines.append(f"LLM cache: {status.llm_cache_hits} hits, {status.llm_cache_misses} misses\n")
     
-    if status['safety_blocks']:
-        print(f"\n⚠️  Safety Blocks: {len(status['safety_blocks'])}")
-        print("\nFiles with safety blocks:")
-        for i, block in enumerate(status['safety_blocks'][:10], 1):
-            print(f"  {i}. {block['file']} ({block['category']})")
+    if status.safety_blocks_total:
+        lines.append(f"\n⚠️  Safety Blocks: {status.safety_blocks_total}\n")
+        lines.append("\nFiles with safety blocks (most recent):\n")
+        for i, block in enumerate(status.recent_safety_blocks, 1):
+            lines.append(f"  {i}. {block['file']} ({block['category']})\n")
             # Show triggering words if available in error message
-            error = block.get('error', '')
-            if 'triggering words' in error.lower():
-                trigger_line = [line for line in error.split('\n') if 'triggering words' in line.lower()]
-                if trigger_line:
-                    print(f"     {trigger_line[0][:80]}...")
-        if len(status['safety_blocks']) > 10:
-            print(f"  ... and {len(status['safety_blocks']) - 10} more")
-    
-    if status['errors']:
-        print(f"\n❌ Errors: {len(status['errors'])}")
-        for i, error in enumerate(status['errors'][:5], 1):
-            print(f"  {i}. {error[:100]}...")
-    
-    if not status['current_phase'] and status['files_total'] > 0:
-        print("\n✅ Conversion appears to be completed or not running")
-    
-    print("\n" + "=" * 60)
+            match = _TRIGGER_LINE_RE.search(block.get('error', ''))
+            if match:
+                lines.append(f"     {match.group(0)[:80]}...\n")
+        if status.safety_blocks_total > len(status.recent_safety_blocks):
+            lines.append(f"  ... and {status.safety_blocks_total - len(status.recent_safety_blocks)} more\n")
+    
+    if status.errors_total:
+        lines.append(f"\n❌ Errors: {status.errors_total}\n")
+        for i, error in enumerate(status.recent_errors[-5:], 1):
+            lines.append(f"  {i}. {error['preview']}...\n")
+    
+    if not status.current_phase and status.files_total > 0:
+        lines.append("\n✅ Conversion appears to be completed or not running\n")
+    
+    lines.append("\n" + _SEP + "\n")
+    sys.stdout.writelines(lines)
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
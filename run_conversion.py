@@ -5,10 +5,74 @@ Command-line interface for the Java to Node.js Conversion Agent
 
 import os
 import sys
+import uuid
+import socket
 import argparse
-import time
-from src.agents.orchestrator import create_conversion_workflow, ConversionState, get_execution_status
-from src.config.llm_config_manager import LLMConfigManager
+import selectors
+import threading
+
+# Report separators
+_SEP = "=" * 60
+_SEP_MINOR = "-" * 50
+
+# Status line templates, filled from the renderer's view dict
+STATUS_LINE_TEMPLATE = "\r[{progress_percentage}%] {current_phase}"
+STATUS_FILE_TEMPLATE = " - {current_file}"
+STATUS_SAFETY_TEMPLATE = " [⚠️  {safety_blocks_total} safety blocks]"
+
+class StatusEventBuffer:
+    """
+    Coalesces status events so the printer only renders the latest value per event type
+    
+    A socket pair acts as a self-pipe: put() writes a wake-up byte and the
+    renderer blocks in a selector until one arrives, so it never polls.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._signaled = False
+        self._reader, self._writer = socket.socketpair()
+        self._reader.setblocking(False)
+        self._writer.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._reader, selectors.EVENT_READ)
+    
+    def put(self, event):
+        """Store an event, replacing any undelivered event of the same type"""
+        with self._lock:
+            self._pending[event["type"]] = event
+            if self._signaled:
+                return
+            self._signaled = True
+        self.wake()
+    
+    def wake(self):
+        """Wake a reader blocked in drain()"""
+        try:
+            self._writer.send(b"\0")
+        except (BlockingIOError, OSError):
+            # Buffer full (reader already has wake-ups queued) or buffer closed
+            pass
+    
+    def drain(self, timeout=None):
+        """Block until woken (or timeout seconds) and return the pending events keyed by type"""
+        if not self._selector.select(timeout):
+            return {}
+        try:
+            self._reader.recv(4096)
+        except BlockingIOError:
+            pass
+        with self._lock:
+            self._signaled = False
+            pending, self._pending = self._pending, {}
+        return pending
+    
+    def close(self):
+        """Release the selector and socket pair"""
+        self._selector.close()
+        self._reader.close()
+        self._writer.close()
 
 def main():
     parser = argparse.ArgumentParser(
@@ -61,6 +125,15 @@ Examples:
     parser.add_argument("--orm", default="sequelize", choices=["sequelize", "typeorm"], 
                         help="ORM choice (default: sequelize)")
     parser.add_argument("--output", help="Output directory (default: auto-generated)")
+    parser.add_argument("--max-parallel-conversions", type=int, default=8,
+                        help="Number of components converted concurrently across all stages (default: 8)")
+    parser.add_argument("--llm-cache-dir",
+                        help="Directory for a persistent LLM response cache reused across runs (default: in-memory only)")
+    parser.add_argument("--checkpoint-db",
+                        help="SQLite file for workflow checkpoints so an interrupted run can be resumed "
+                             "(requires langgraph-checkpoint-sqlite)")
+    parser.add_argument("--run-id",
+                        help="Run identifier; pass a previous run's id with --checkpoint-db to resume it")
     
     args = parser.parse_args()
     
@@ -72,21 +145,23 @@ Examples:
         if args.api_key:
             print("Warning: --api-token ignored when using --profile")
         
-        # Load profile to get model if not provided
+        # Load the profile once; it is passed to the workflow so the config file isn't re-read
+        from src.config.llm_config_manager import LLMConfigManager
+        try:
+            manager = LLMConfigManager(args.llm_config)
+            profile = manager.get_profile(args.profile)
+        except Exception as e:
+            parser.error(f"Failed to load profile: {e}")
+        if not profile:
+            parser.error(f"Profile '{args.profile}' not found")
+        
+        # Use the profile's model if not provided
         if not model_to_use:
-            try:
-                manager = LLMConfigManager(args.llm_config)
-                profile = manager.get_profile(args.profile)
-                if profile:
-                    model_to_use = profile.get("model")
-                    if model_to_use:
-                        print(f"Info: Using model '{model_to_use}' from profile '{args.profile}'")
-                    else:
-                        parser.error(f"Profile '{args.profile}' does not have a model specified")
-                else:
-                    parser.error(f"Profile '{args.profile}' not found")
-            except Exception as e:
-                parser.error(f"Failed to load profile: {e}")
+            model_to_use = profile.get("model")
+            if model_to_use:
+                print(f"Info: Using model '{model_to_use}' from profile '{args.profile}'")
+            else:
+                parser.error(f"Profile '{args.profile}' does not have a model specified")
         else:
             print(f"Info: Using model '{model_to_use}' (overriding profile's model)")
     else:
@@ -100,8 +175,22 @@ Examples:
     if not model_to_use or not model_to_use.strip():
         parser.error("Model is required. Either specify --model or use a profile with a model configured.")
     
+    # Import the workflow only after arguments are valid (pulls in langgraph and LLM SDKs)
+    from src.agents.orchestrator import (
+        create_conversion_workflow,
+        ConversionState,
+        get_execution_status,
+        register_status_listener,
+        unregister_status_listener,
+        release_run_resources,
+    )
+    
     # Create workflow
-    workflow = create_conversion_workflow()
+    try:
+        workflow = create_conversion_workflow(checkpoint_path=args.checkpoint_db)
+    except ValueError as e:
+        parser.error(str(e))
+    run_id = args.run_id or str(uuid.uuid4())
     
     # Initial state - support both new and legacy format
     state_data = {
@@ -110,13 +199,18 @@ Examples:
         "orm_choice": args.orm,
         "model": model_to_use.strip(),
         "repo_path": None,
+        "clone_dir": None,
         "codebase_text_file": None,
         "file_map": None,
         "metadata": None,
+        "modules_by_type": None,
         "converted_components": {},
         "output_path": args.output,
         "validation_result": None,
-        "errors": []
+        "errors": [],
+        "max_parallel_conversions": args.max_parallel_conversions,
+        "llm_cache_dir": args.llm_cache_dir,
+        "run_id": run_id
     }
     
     # LLM configuration
@@ -124,6 +218,7 @@ Examples:
         # Using config file profile
         state_data["llm_profile_name"] = args.profile
         state_data["llm_config_path"] = args.llm_config
+        state_data["llm_profile_preloaded"] = profile
         state_data["llm_provider"] = None
         state_data["llm_api_token"] = None
         state_data["gemini_api_token"] = None  # Legacy support
@@ -151,68 +246,122 @@ Examples:
         print(f"LLM: Profile '{args.profile}' with model '{args.model}'")
     else:
         print(f"LLM: {args.provider} with model '{args.model}'")
-    print("-" * 50)
+    print(_SEP_MINOR)
     
     # Execute workflow with status monitoring
     try:
-        print("\n" + "=" * 60)
+        print("\n" + _SEP)
         print("Conversion Status Monitor")
-        print("=" * 60)
+        print(_SEP)
         
-        # Start monitoring thread for status updates
-        import threading
+        # Render status updates only when the orchestrator reports a change;
+        # bursts of events are coalesced so only the latest value per type is printed
+        status_events = StatusEventBuffer()
+        stop_rendering = threading.Event()
         
-        def monitor_status():
-            while True:
-                status = get_execution_status()
-                if status["current_phase"]:
-                    print(f"\r[{status['progress_percentage']}%] {status['current_phase']}", end="", flush=True)
-                    if status["current_file"]:
-                        print(f" - {status['current_file']}", end="", flush=True)
-                    if status["safety_blocks"]:
-                        print(f" [⚠️  {len(status['safety_blocks'])} safety blocks]", end="", flush=True)
-                time.sleep(2)
+        def render_status():
+            status = get_execution_status()
+            view = {
+                "current_phase": status.current_phase,
+                "progress_percentage": status.progress_percentage,
+                "current_file": status.current_file,
+                "safety_blocks_total": status.safety_blocks_total
+            }
+            last_line = None
+            while not stop_rendering.is_set():
+                events = status_events.drain()
+                if not events:
+                    continue
+                if "phase" in events:
+                    view["current_phase"] = events["phase"]["current_phase"]
+                    view["progress_percentage"] = events["phase"]["progress_percentage"]
+                if "file" in events:
+                    view["current_file"] = events["file"]["current_file"]
+                if "safety_block" in events:
+                    view["safety_blocks_total"] = events["safety_block"]["safety_blocks_total"]
+                if not view["current_phase"]:
+                    continue
+                buf = [STATUS_LINE_TEMPLATE.format_map(view)]
+                if view["current_file"]:
+                    buf.append(STATUS_FILE_TEMPLATE.format_map(view))
+                if view["safety_blocks_total"]:
+                    buf.append(STATUS_SAFETY_TEMPLATE.format_map(view))
+                line = "".join(buf)
+                # Collapse repeated identical events into a single render;
+                # emit the whole line with one write + flush
+                if line != last_line:
+                    sys.stdout.write(line)
+                    sys.stdout.flush()
+                    last_line = line
         
-        monitor_thread = threading.Thread(target=monitor_status, daemon=True)
-        monitor_thread.start()
+        listener = register_status_listener(status_events.put)
+        render_thread = threading.Thread(target=render_status, daemon=True)
+        render_thread.start()
         
-        result = workflow.invoke(initial_state)
+        try:
+            if args.checkpoint_db:
+                print(f"Run id: {run_id} (pass --run-id {run_id} to resume)")
+                config = {"configurable": {"thread_id": run_id}}
+                if args.run_id and workflow.get_state(config).next:
+                    # Continue from the last completed step of the interrupted run
+                    print(f"Resuming run {run_id}")
+                    result = workflow.invoke(None, config)
+                else:
+                    result = workflow.invoke(initial_state, config)
+            else:
+                result = workflow.invoke(initial_state)
+        finally:
+            release_run_resources(run_id)
+            # Stop the renderer before printing the final status so lines don't interleave
+            unregister_status_listener(listener)
+            stop_rendering.set()
+            status_events.wake()
+            render_thread.join(timeout=3)
+            if not render_thread.is_alive():
+                status_events.close()
         
-        # Final status
+        # Final status (built up front and written in one go)
         final_status = get_execution_status()
-        print("\n" + "=" * 60)
-        print("Final Status")
-        print("=" * 60)
-        print(f"Phase: {final_status['current_phase'] or 'Completed'}")
-        print(f"Files processed: {final_status['files_processed']}/{final_status['files_total']}")
+        report = [
+            "\n" + _SEP + "\n",
+            "Final Status\n",
+            _SEP + "\n",
+            f"Phase: {final_status.current_phase or 'Completed'}\n",
+            f"Files processed: {final_status.files_processed}/{final_status.files_total}\n"
+        ]
         
-        if final_status["safety_blocks"]:
-            print(f"\n⚠️  Safety Blocks ({len(final_status['safety_blocks'])}):")
-            for block in final_status["safety_blocks"][:5]:  # Show first 5
-                print(f"  - {block['file']} ({block['category']})")
-                error_preview = block['error'][:100].replace('\n', ' ')
-                print(f"    {error_preview}...")
-            if len(final_status["safety_blocks"]) > 5:
-                print(f"  ... and {len(final_status['safety_blocks']) - 5} more")
+        if final_status.llm_cache_hits or final_status.llm_cache_misses:
+            report.append(f"LLM cache: {final_status.llm_cache_hits} hits, {final_status.llm_cache_misses} misses\n")
         
-        if final_status["errors"]:
-            print(f"\n❌ Errors ({len(final_status['errors'])}):")
-            for error in final_status["errors"][:5]:
-                print(f"  - {error[:100]}...")
+        if final_status.safety_blocks_total:
+            report.append(f"\n⚠️  Safety Blocks ({final_status.safety_blocks_total}):\n")
+            for block in final_status.recent_safety_blocks[-5:]:  # Show last 5
+                report.append(f"  - {block['file']} ({block['category']})\n")
+                report.append(f"    {block['preview']}...\n")
+            if final_status.safety_blocks_total > 5:
+                report.append(f"  ... and {final_status.safety_blocks_total - 5} more\n")
+        
+        if final_status.errors_total:
+            report.append(f"\n❌ Errors ({final_status.errors_total}):\n")
+            for error in final_status.recent_errors[-5:]:
+                report.append(f"  - {error['preview']}...\n")
         
         if result.get("errors"):
-            print("Conversion completed with errors:")
+            report.append("Conversion completed with errors:\n")
             for error in result["errors"]:
-                print(f"  - {error}")
+                report.append(f"  - {error}\n")
         
         if result.get("validation_result", {}).get("valid"):
-            print("\n✅ Conversion completed successfully!")
-            print(f"Output directory: {result['output_path']}")
+            report.append("\n✅ Conversion completed successfully!\n")
+            report.append(f"Output directory: {result['output_path']}\n")
         else:
-            print("\n❌ Conversion validation failed")
+            report.append("\n❌ Conversion validation failed\n")
             if result.get("validation_result", {}).get("errors"):
                 for error in result["validation_result"]["errors"]:
-                    print(f"  - {error}")
+                    report.append(f"  - {error}\n")
+        
+        sys.stdout.writelines(report)
+        sys.stdout.flush()
     
     except Exception as e:
         print(f"\n❌ Conversion failed: {str(e)}")
@@ -5,10 +5,23 @@ Run validation on a converted project
 
 import os
 import sys
-import json
 import argparse
 from src.validators.conversion_validator import ConversionValidator
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+# Report separators
+_SEP = "=" * 60
+_SEP_MINOR = "-" * 60
+
 def main():
     parser = argparse.ArgumentParser(
         description="Validate a converted Node.js project",
@@ -23,6 +36,9 @@ Examples:
   
   # Validate with metadata:
   python run_validation.py --metadata project-metadata.json
+  
+  # Stop at the first fatal error (e.g. in CI):
+  python run_validation.py --fail-fast
         """
     )
     parser.add_argument(
@@ -34,41 +50,58 @@ Examples:
         "--metadata",
         help="Path to project-metadata.json file (optional)"
     )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at the first fatal error and skip metadata validation if the project is invalid"
+    )
     
     args = parser.parse_args()
     
     project_path = os.path.abspath(args.project_path)
     
-    # Check if project path exists
-    if not os.path.exists(project_path):
+    # Check if project path exists (single stat call)
+    try:
+        os.stat(project_path)
+    except (OSError, ValueError):
+        # Same outcome as os.path.exists() returning False
         print(f"❌ Error: Project path does not exist: {project_path}")
         sys.exit(1)
     
-    print("=" * 60)
+    print(_SEP)
     print("Conversion Validation")
-    print("=" * 60)
+    print(_SEP)
     print(f"Project path: {project_path}")
-    print("-" * 60)
+    print(_SEP_MINOR)
     
     # Initialize validator
     validator = ConversionValidator()
     
     # Validate project structure
     print("\n📋 Validating project structure...")
-    validation_result = validator.validate_project(project_path)
+    validation_result = validator.validate_project(project_path, fail_fast=args.fail_fast)
     
-    # Validate metadata if provided
+    # Validate metadata if provided (skipped in fail-fast mode once the project is invalid)
     metadata_validation = None
-    if args.metadata:
+    if args.metadata and (validation_result.get("valid", False) or not args.fail_fast):
         metadata_path = os.path.abspath(args.metadata)
-        if not os.path.exists(metadata_path):
+        # Open directly instead of checking existence first (one syscall instead of two)
+        try:
+            f = open(metadata_path, 'rb')
+        except FileNotFoundError:
             print(f"⚠️  Warning: Metadata file not found: {metadata_path}")
+        except OSError as e:
+            # Exists but cannot be opened (permissions, a directory...)
+            print(f"⚠️  Warning: Failed to load metadata: {e}")
         else:
             print("\n📋 Validating metadata...")
             try:
-                with open(metadata_path, 'r') as f:
-                    metadata = json.load(f)
-                metadata_validation = validator.validate_metadata(metadata)
+                with f:
+                    if ijson is not None:
+                        # Validate top-level entries as they are parsed
+                        metadata_validation = validator.validate_metadata_stream(ijson.kvitems(f, ''))
+                    else:
+                        metadata_validation = validator.validate_metadata(_json.loads(f.read()))
             except Exception as e:
                 print(f"⚠️  Warning: Failed to load metadata: {e}")
     
@@ -84,9 +117,9 @@ Examples:
         is_valid = validation_result.get("valid", False)
     
     # Print results
-    print("\n" + "=" * 60)
+    print("\n" + _SEP)
     print("Validation Results")
-    print("=" * 60)
+    print(_SEP)
     
     # Print stats
     stats = validation_result.get("stats", {})
@@ -112,13 +145,13 @@ Examples:
             print(f"  ... and {len(errors) - 10} more")
     
     # Final status
-    print("\n" + "=" * 60)
+    print("\n" + _SEP)
     if is_valid:
         print("✅ Validation passed")
     else:
         print("❌ Validation failed")
         sys.exit(1)
-    print("=" * 60)
+    print(_SEP)
 
 if __name__ == "__main__":
     main()
@@ -1,27 +1,46 @@
 # src/agents/orchestrator.py
 
 import os
+import re
 import json
+import mmap
 import uuid
+import shutil
 import logging
-from langgraph.graph import StateGraph, END
-from typing import TypedDict, Optional, Any
-from gitingest import ingest
+import tempfile
+import functools
+import threading
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TypedDict, Optional, Any, Annotated, TYPE_CHECKING
 
-from ..analyzers.repository_analyzer import RepositoryAnalyzer
-from ..clients.llm_client_factory import create_llm_client_from_config
-from ..extractors.metadata_extractor import MetadataExtractor
-from ..mappers.dependency_mapper import DependencyMapper
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+if TYPE_CHECKING:
+    from ..clients.cached_llm_client import LLMCache
+
+# langgraph, gitingest, the LLM SDKs and the pipeline stages are imported inside the
+# functions that use them, so status helpers (check_status, the CLI's --help path)
+# don't pay for them
 logger = logging.getLogger(__name__)
 
-from ..converters.model_converter import ModelConverter
-from ..converters.repository_converter import RepositoryConverter
-from ..converters.service_converter import ServiceConverter
-from ..converters.controller_converter import ControllerConverter
-from ..migrators.config_migrator import ConfigMigrator
-from ..generators.project_generator import ProjectGenerator
-from ..validators.conversion_validator import ConversionValidator
+def merge_components(left: Optional[dict], right: Optional[dict]) -> dict:
+    """Reducer merging converted component groups written by parallel converter nodes"""
+    return {**(left or {}), **(right or {})}
+
+def merge_errors(left: Optional[list], right: Optional[list]) -> list:
+    """
+    Reducer concatenating error lists from (possibly parallel) nodes
+    
+    Nodes return only their new errors. Identical messages are kept, because
+    they may come from different steps or files.
+    """
+    return (left or []) + (right or [])
 
 class ConversionState(TypedDict, total=False):
     github_url: str
@@ -31,24 +50,33 @@ class ConversionState(TypedDict, total=False):
     llm_base_url: Optional[str]  # Custom base URL for GLM/OpenAI
     llm_profile_name: Optional[str]  # Profile name from config file
     llm_config_path: Optional[str]  # Path to config file
+    llm_cache_dir: Optional[str]  # Directory for persistent LLM response cache (in-memory only if not set)
+    llm_profile_preloaded: Optional[dict]  # Profile already loaded by the caller (skips re-reading the config file)
     # Legacy support for backward compatibility
     gemini_api_token: Optional[str]  # Deprecated, use llm_api_token with llm_provider="gemini"
     target_framework: str
     orm_choice: str
     model: str  # Model name (format depends on provider)
     repo_path: Optional[str]
+    clone_dir: Optional[str]  # Temporary clone directory, removed once config migration no longer needs it
     codebase_text_file: Optional[str]  # Path to consolidated codebase text file from gitingest
+    codebase_index_file: Optional[str]  # Path to codebase_index.json ({relative_path: [start, end]} byte offsets in codebase_text_file)
     file_map: Optional[dict]
     metadata: Optional[dict]
-    converted_components: dict
+    modules_by_type: Optional[dict]  # {module_type: [module, ...]} bucketed once after metadata extraction
+    converted_components: Annotated[dict, merge_components]  # Merged across parallel converter nodes
     output_path: Optional[str]
     validation_result: Optional[dict]
-    errors: list
+    errors: Annotated[list, merge_errors]
     java_dependencies: Optional[list]
     build_system: Optional[str]
     node_dependencies: Optional[dict]
     node_config: Optional[dict]
-    _analyzer: Optional[Any]  # For storing RepositoryAnalyzer instance
+    max_parallel_conversions: Optional[int]  # Components converted concurrently across all converter stages (default: 8)
+    run_id: Optional[str]  # Identifies the run (checkpoint thread_id and key for per-run resources)
+
+# Number of most recent safety blocks/errors kept for status display
+RECENT_STATUS_ENTRIES = 10
 
 # Global execution status tracker
 _execution_status = {
@@ -57,22 +85,273 @@ _execution_status = {
     "progress_percentage": 0,
     "files_processed": 0,
     "files_total": 0,
-    "safety_blocks": [],
-    "errors": []
+    "safety_blocks": deque(maxlen=RECENT_STATUS_ENTRIES),
+    "safety_blocks_total": 0,
+    "errors": deque(maxlen=RECENT_STATUS_ENTRIES),
+    "errors_total": 0,
+    "llm_cache_hits": 0,
+    "llm_cache_misses": 0
 }
 
-def get_execution_status():
-    """Get current execution status"""
-    return _execution_status.copy()
+# Guards _execution_status: converter nodes and their worker pools update it concurrently.
+# Listeners are notified outside the lock.
+_status_lock = threading.Lock()
+
+# Callbacks invoked whenever the execution status actually changes
+_status_listeners = []
+
+@dataclass(frozen=True, slots=True)
+class ExecutionStatus:
+    """Immutable snapshot of the execution status"""
+    current_phase: Optional[str]
+    current_file: Optional[str]
+    progress_percentage: int
+    files_processed: int
+    files_total: int
+    recent_safety_blocks: tuple  # Most recent RECENT_STATUS_ENTRIES blocks
+    safety_blocks_total: int
+    recent_errors: tuple  # Most recent RECENT_STATUS_ENTRIES errors
+    errors_total: int
+    llm_cache_hits: int
+    llm_cache_misses: int
+
+def get_execution_status() -> ExecutionStatus:
+    """Get a consistent snapshot of the current execution status"""
+    with _status_lock:
+        return ExecutionStatus(
+            current_phase=_execution_status["current_phase"],
+            current_file=_execution_status["current_file"],
+            progress_percentage=_execution_status["progress_percentage"],
+            files_processed=_execution_status["files_processed"],
+            files_total=_execution_status["files_total"],
+            recent_safety_blocks=tuple(_execution_status["safety_blocks"]),
+            safety_blocks_total=_execution_status["safety_blocks_total"],
+            recent_errors=tuple(_execution_status["errors"]),
+            errors_total=_execution_status["errors_total"],
+            llm_cache_hits=_execution_status["llm_cache_hits"],
+            llm_cache_misses=_execution_status["llm_cache_misses"]
+        )
+
+def register_status_listener(callback):
+    """
+    Register a callback invoked on every execution status change
+
+    Args:
+        callback: Callable receiving an event dict with a "type" key
+                  ("phase", "file", "progress", "safety_block" or "error") plus the changed fields
+
+    Returns:
+        The registered callback (so it can be unregistered later)
+    """
+    _status_listeners.append(callback)
+    return callback
+
+def unregister_status_listener(callback):
+    """Remove a previously registered status listener"""
+    if callback in _status_listeners:
+        _status_listeners.remove(callback)
+
+def _notify_status(event_type: str, **fields):
+    """Deliver a status event to all registered listeners"""
+    event = {"type": event_type, **fields}
+    for callback in list(_status_listeners):
+        try:
+            callback(event)
+        except Exception as e:
+            logger.debug(f"Status listener failed: {e}")
+
+def set_current_phase(phase: Optional[str], progress_percentage: Optional[int] = None):
+    """Update the current phase (and optionally progress), notifying listeners on change"""
+    with _status_lock:
+        if progress_percentage is None:
+            progress_percentage = _execution_status["progress_percentage"]
+        if (_execution_status["current_phase"] == phase
+                and _execution_status["progress_percentage"] == progress_percentage):
+            return
+        _execution_status["current_phase"] = phase
+        _execution_status["progress_percentage"] = progress_percentage
+    _notify_status("phase", current_phase=phase, progress_percentage=progress_percentage)
+
+def set_current_file(file_path: Optional[str]):
+    """Update the file currently being processed, notifying listeners on change"""
+    with _status_lock:
+        if _execution_status["current_file"] == file_path:
+            return
+        _execution_status["current_file"] = file_path
+    _notify_status("file", current_file=file_path)
+
+def set_files_total(total: int):
+    """Set the total number of files to process and reset the processed counters"""
+    with _status_lock:
+        _execution_status["files_total"] = total
+        _execution_status["files_processed"] = 0
+    _notify_status("progress", files_processed=0, files_total=total)
+
+def increment_files_processed(count: int = 1):
+    """Increment the processed-files counter, notifying listeners"""
+    if not count:
+        return
+    with _status_lock:
+        _execution_status["files_processed"] += count
+        files_processed = _execution_status["files_processed"]
+        files_total = _execution_status["files_total"]
+    _notify_status("progress", files_processed=files_processed, files_total=files_total)
+
+# Length of the single-line error previews stored for status display
+ERROR_PREVIEW_LENGTH = 100
+
+def _error_preview(error: str) -> str:
+    """Single-line, truncated form of an error message for status display"""
+    return error[:ERROR_PREVIEW_LENGTH].replace('\n', ' ')
+
+def append_safety_block(file_path: str, category: str, error: str):
+    """Record a file blocked by LLM safety filters"""
+    block = {
+        "file": file_path,
+        "category": category,
+        "error": error,
+        "preview": _error_preview(error)
+    }
+    with _status_lock:
+        _execution_status["safety_blocks"].append(block)
+        _execution_status["safety_blocks_total"] += 1
+        safety_blocks_total = _execution_status["safety_blocks_total"]
+    _notify_status("safety_block", block=block, safety_blocks_total=safety_blocks_total)
+
+def record_llm_cache_lookup(hit: bool):
+    """Count an LLM response cache hit or miss"""
+    with _status_lock:
+        _execution_status["llm_cache_hits" if hit else "llm_cache_misses"] += 1
+
+def append_error(error: str):
+    """Record a workflow error for status display"""
+    entry = {
+        "error": error,
+        "preview": _error_preview(error)
+    }
+    with _status_lock:
+        _execution_status["errors"].append(entry)
+        _execution_status["errors_total"] += 1
+        errors_total = _execution_status["errors_total"]
+    _notify_status("error", entry=entry, errors_total=errors_total)
+
+def _record_errors(*errors: str) -> list:
+    """Record node errors for status display and return them as an "errors" state update"""
+    for error in errors:
+        append_error(error)
+    return list(errors)
+
+# Non-serializable per-run objects (repository analyzer, LLM client), kept out of the
+# (checkpointable) state and keyed by run_id
+_run_resources = {}
+_run_resources_lock = threading.Lock()
 
-def create_conversion_workflow():
-    """Create LangGraph workflow"""
+def _get_run_resource(state: ConversionState, name: str) -> Optional[Any]:
+    """Get a per-run object stored by an earlier node"""
+    return _run_resources.get(state.get("run_id"), {}).get(name)
+
+def _set_run_resource(state: ConversionState, name: str, value: Any):
+    """Store a per-run object for later nodes of the same run"""
+    with _run_resources_lock:
+        _run_resources.setdefault(state.get("run_id"), {})[name] = value
+
+def _get_or_create_run_resource(state: ConversionState, name: str, factory) -> Any:
+    """Get a per-run object, creating it atomically if no node has stored it yet"""
+    with _run_resources_lock:
+        resources = _run_resources.setdefault(state.get("run_id"), {})
+        if resources.get(name) is None:
+            resources[name] = factory()
+        return resources[name]
+
+def register_cancel_event(run_id: str, event: threading.Event):
+    """
+    Attach a cancellation event to a run before it starts
+    
+    Once the event is set, metadata extraction and module conversions of the
+    run skip their remaining files instead of calling the LLM.
+    
+    Args:
+        run_id: run_id of the conversion state
+        event: Event set by the caller to cancel the run
+    """
+    with _run_resources_lock:
+        _run_resources.setdefault(run_id, {})["cancel_event"] = event
+
+def _run_cancel_event(state: ConversionState) -> Optional[threading.Event]:
+    """Cancellation event registered for the run, if any"""
+    return _get_run_resource(state, "cancel_event")
+
+def release_run_resources(run_id: Optional[str]):
+    """
+    Drop the per-run objects of a finished run
+    
+    Shuts down its conversion pool and closes the cached map and index of its
+    consolidated codebase file.
+    """
+    with _run_resources_lock:
+        resources = _run_resources.pop(run_id, None) or {}
+    executor = resources.get("conversion_executor")
+    if executor is not None:
+        executor.shutdown(wait=False)
+    codebase_text_file = resources.get("codebase_text_file")
+    if codebase_text_file:
+        _release_codebase_file(codebase_text_file)
+
+def _create_checkpointer(checkpoint_path: str):
+    """
+    Create a SQLite checkpointer so interrupted runs can resume
+    
+    Args:
+        checkpoint_path: Path to the SQLite database file
+        
+    Returns:
+        SqliteSaver instance
+        
+    Raises:
+        ValueError: If the SQLite checkpointer package is not installed
+    """
+    try:
+        from langgraph.checkpoint.sqlite import SqliteSaver
+    except ImportError:
+        raise ValueError(
+            "Checkpointing requires the langgraph-checkpoint-sqlite package "
+            "(pip install langgraph-checkpoint-sqlite)"
+        )
+    import sqlite3
+    
+    directory = os.path.dirname(os.path.abspath(checkpoint_path))
+    os.makedirs(directory, exist_ok=True)
+    # Parallel converter branches run in worker threads
+    conn = sqlite3.connect(checkpoint_path, check_same_thread=False)
+    return SqliteSaver(conn)
+
+def create_conversion_workflow(checkpoint_path: Optional[str] = None):
+    """
+    Create LangGraph workflow
+    
+    Args:
+        checkpoint_path: Optional SQLite file for checkpoints; when set, the workflow must be
+                         invoked with config={"configurable": {"thread_id": run_id}} and an
+                         interrupted run can be resumed by invoking it again with input None
+        
+    Returns:
+        Compiled workflow (shared by all callers using the same checkpoint file)
+    """
+    if checkpoint_path:
+        checkpoint_path = os.path.abspath(checkpoint_path)
+    return _compile_workflow(checkpoint_path)
+
+@functools.lru_cache(maxsize=4)
+def _compile_workflow(checkpoint_path: Optional[str]):
+    """Build and compile the workflow graph once per checkpoint file"""
+    from langgraph.graph import StateGraph, END
     
     workflow = StateGraph(ConversionState)
     
     # Define nodes
     workflow.add_node("clone_repo", clone_repository_node)
     workflow.add_node("ingest_codebase", ingest_codebase_node)
+    workflow.add_node("index_codebase", index_codebase_node)
     workflow.add_node("analyze_structure", analyze_structure_node)
     workflow.add_node("extract_metadata", extract_metadata_node)
     workflow.add_node("map_dependencies", map_dependencies_node)
@@ -87,32 +366,80 @@ def create_conversion_workflow():
     # Define edges
     workflow.set_entry_point("clone_repo")
     workflow.add_edge("clone_repo", "ingest_codebase")
-    workflow.add_edge("ingest_codebase", "analyze_structure")
+    workflow.add_edge("ingest_codebase", "index_codebase")
+    workflow.add_edge("index_codebase", "analyze_structure")
     workflow.add_edge("analyze_structure", "extract_metadata")
     workflow.add_edge("extract_metadata", "map_dependencies")
-    workflow.add_edge("map_dependencies", "convert_models")
-    workflow.add_edge("convert_models", "convert_repositories")
-    workflow.add_edge("convert_repositories", "convert_services")
-    workflow.add_edge("convert_services", "convert_controllers")
-    workflow.add_edge("convert_controllers", "generate_config")
+    # The four converters only read metadata, so they run as parallel branches
+    # and are joined before config generation
+    converter_nodes = ["convert_models", "convert_repositories", "convert_services", "convert_controllers"]
+    for node_name in converter_nodes:
+        workflow.add_edge("map_dependencies", node_name)
+    workflow.add_edge(converter_nodes, "generate_config")
     workflow.add_edge("generate_config", "generate_project")
     workflow.add_edge("generate_project", "validate")
     workflow.add_edge("validate", END)
     
-    return workflow.compile()
+    checkpointer = _create_checkpointer(checkpoint_path) if checkpoint_path else None
+    return workflow.compile(checkpointer=checkpointer)
 
 ## Helper functions
 
+# Shared LLM response caches, keyed by cache directory (None = in-memory only)
+_llm_caches = {}
+_llm_caches_lock = threading.Lock()
+
+def _get_llm_cache(cache_dir: Optional[str]) -> "LLMCache":
+    """
+    Return the shared LLM response cache for a directory
+    
+    LLM_CACHE_TTL (seconds) expires entries and LLM_CACHE_REDIS_URL adds a Redis
+    store shared across processes.
+    """
+    from ..clients.cached_llm_client import LLMCache
+    with _llm_caches_lock:
+        cache = _llm_caches.get(cache_dir)
+        if cache is None:
+            ttl = os.getenv("LLM_CACHE_TTL")
+            cache = _llm_caches[cache_dir] = LLMCache(
+                cache_dir,
+                ttl=float(ttl) if ttl else None,
+                redis_url=os.getenv("LLM_CACHE_REDIS_URL")
+            )
+        return cache
+
 def _create_llm_client_from_state(state: ConversionState):
     """
     Create LLM client from conversion state
     
+    Deterministic requests are served from a response cache shared across
+    runs in this process (and persisted to llm_cache_dir when set).
+    
+    Args:
+        state: Conversion state with LLM configuration
+        
+    Returns:
+        LLM client instance
+    """
+    from ..clients.cached_llm_client import CachingLLMClient
+    client = _create_provider_client_from_state(state)
+    return CachingLLMClient(
+        client,
+        _get_llm_cache(state.get("llm_cache_dir")),
+        on_lookup=record_llm_cache_lookup
+    )
+
+def _create_provider_client_from_state(state: ConversionState):
+    """
+    Create the underlying provider LLM client from conversion state
+    
     Args:
         state: Conversion state with LLM configuration
         
     Returns:
         LLM client instance
     """
+    from ..clients.llm_client_factory import create_llm_client, create_llm_client_from_config
     model = state.get("model", "")
     provider = state.get("llm_provider")
     api_token = state.get("llm_api_token")
@@ -120,6 +447,17 @@ def _create_llm_client_from_state(state: ConversionState):
     profile_name = state.get("llm_profile_name")
     config_path = state.get("llm_config_path")
     
+    # Reuse a profile already loaded by the caller instead of re-parsing the config file
+    profile = state.get("llm_profile_preloaded")
+    if profile_name and profile:
+        return create_llm_client(
+            provider=profile["provider"],
+            api_token=profile["api_key"],
+            model=model.strip() if model and model.strip() else profile["model"],
+            base_url=profile.get("base_url"),
+            config_path=config_path
+        )
+    
     # If using profile, model can be None (will use profile's model)
     if profile_name:
         # Profile takes precedence - model override is optional
@@ -154,7 +492,190 @@ def _create_llm_client_from_state(state: ConversionState):
         config_path=config_path
     )
 
-def _extract_code_from_consolidated_file(codebase_text_file: str, file_path: str, class_name: str = None) -> str:
+# Chunk size (and write buffer size) used when saving the consolidated codebase
+INGEST_WRITE_CHUNK = 1 << 20
+
+# gitingest file section header: a 48-char "=" rule, "FILE: <path>" ("File: /<path>" in
+# older gitingest releases), another rule
+_FILE_HEADER_RE = re.compile(rb'^={48}\r?\n(?:FILE|File): ([^\r\n]+)\r?\n={48}\r?\n', re.MULTILINE)
+
+def _normalize_codebase_path(file_path: str) -> str:
+    """Canonical form of a repository-relative path used as codebase index key"""
+    file_path = file_path.replace('\\', '/').strip()
+    while file_path.startswith('./'):
+        file_path = file_path[2:]
+    return file_path.lstrip('/')
+
+class _SharedMap:
+    """Read-only mmap shared by converter threads, closed once retired and unused"""
+    __slots__ = ("key", "mm", "readers", "retired")
+    
+    def __init__(self, key: tuple, mm: mmap.mmap):
+        self.key = key
+        self.mm = mm
+        self.readers = 0
+        self.retired = False
+
+# Open read-only maps of consolidated codebase files, keyed by path
+_codebase_maps = {}
+_codebase_maps_lock = threading.Lock()
+
+def _retire_codebase_map(shared: _SharedMap) -> Optional[mmap.mmap]:
+    """Mark a map as replaced or released (caller holds the lock); returns it if it can be closed now"""
+    shared.retired = True
+    return shared.mm if shared.readers == 0 else None
+
+@contextmanager
+def _codebase_map(codebase_text_file: str):
+    """
+    Borrow the shared read-only mmap of the consolidated codebase file
+    
+    The map is reused across converter calls and replaced if the file
+    changes on disk (size or mtime). A replaced or released map is closed
+    only once the last borrower is done with it.
+    
+    Args:
+        codebase_text_file: Path to consolidated codebase text file
+        
+    Yields:
+        mmap object, or None if the file is empty
+    """
+    st = os.stat(codebase_text_file)
+    key = (st.st_mtime_ns, st.st_size)
+    stale = None
+    with _codebase_maps_lock:
+        shared = _codebase_maps.get(codebase_text_file)
+        if shared is not None and shared.key != key:
+            del _codebase_maps[codebase_text_file]
+            stale = _retire_codebase_map(shared)
+            shared = None
+        if shared is None and st.st_size > 0:
+            with open(codebase_text_file, 'rb') as f:
+                shared = _SharedMap(key, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            _codebase_maps[codebase_text_file] = shared
+        if shared is not None:
+            shared.readers += 1
+    if stale is not None:
+        stale.close()
+    
+    if shared is None:
+        yield None
+        return
+    try:
+        yield shared.mm
+    finally:
+        with _codebase_maps_lock:
+            shared.readers -= 1
+            unused = shared.retired and shared.readers == 0
+        if unused:
+            shared.mm.close()
+
+def _release_codebase_file(codebase_text_file: str):
+    """
+    Drop everything cached for a consolidated codebase file
+    
+    Called before the file is rewritten and when its run finishes; closes the
+    shared mmap (once no converter is reading it) and forgets the loaded
+    codebase_index.json and decoded text.
+    """
+    index_path = _codebase_index_path(codebase_text_file)
+    unused = None
+    with _codebase_maps_lock:
+        shared = _codebase_maps.pop(codebase_text_file, None)
+        _codebase_index_files.pop(index_path, None)
+        _codebase_texts.pop(codebase_text_file, None)
+        if shared is not None:
+            unused = _retire_codebase_map(shared)
+    if unused is not None:
+        unused.close()
+
+def _build_codebase_index(codebase_text_file: str) -> dict:
+    """
+    Index file sections of a consolidated gitingest file in a single pass
+    
+    Args:
+        codebase_text_file: Path to consolidated codebase text file
+        
+    Returns:
+        Dictionary mapping relative file path to [start, end] byte offsets of its content
+    """
+    index = {}
+    with _codebase_map(codebase_text_file) as mm:
+        if mm is None:
+            return index
+        headers = list(_FILE_HEADER_RE.finditer(mm))
+        for i, match in enumerate(headers):
+            start = match.end()
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(mm)
+            # Trim the blank line(s) gitingest puts between sections
+            while end > start and mm[end - 1] in b'\r\n':
+                end -= 1
+            path = _normalize_codebase_path(match.group(1).decode('utf-8', 'replace'))
+            index[path] = [start, end]
+    return index
+
+# Loaded codebase_index.json files, keyed by path: (mtime_ns, index); guarded by _codebase_maps_lock
+_codebase_index_files = {}
+
+def _codebase_index_path(codebase_text_file: str) -> str:
+    """Path of the codebase_index.json written next to a consolidated codebase file"""
+    return os.path.join(os.path.dirname(codebase_text_file), "codebase_index.json")
+
+def _load_codebase_index(index_path: Optional[str]) -> Optional[dict]:
+    """Load a codebase_index.json (cached until it changes), if it exists"""
+    if not index_path:
+        return None
+    try:
+        mtime_ns = os.stat(index_path).st_mtime_ns
+    except OSError:
+        return None
+    with _codebase_maps_lock:
+        cached = _codebase_index_files.get(index_path)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = None
+    with _codebase_maps_lock:
+        _codebase_index_files[index_path] = (mtime_ns, index)
+    return index
+
+# Start of a gitingest file section ("=" rule followed by a FILE: line) or a top-level "=== ... ===" header
+_SECTION_RE = re.compile(r'^(?:={48}\r?\n(?=(?:FILE|File): )|=== [A-Z ]+ ===\r?$)', re.MULTILINE)
+
+# Maximum characters scanned before/after a marker when locating its section
+SECTION_SCAN_WINDOW = 50000
+
+# First Java token of a file's content within a section, searched in one pass
+_JAVA_START_RE = re.compile(r'package |import |(?:public )?class |interface ')
+
+# The Java start is only trimmed to if it lies within this many characters of the section start
+JAVA_START_MAX_OFFSET = 500
+
+# Decoded consolidated codebase files, keyed by path: (mtime_ns, text); guarded by
+# _codebase_maps_lock and dropped with the run's resources (see _release_codebase_file)
+_codebase_texts = {}
+
+def _load_codebase_text(codebase_text_file: str, mtime_ns: int) -> str:
+    """Read and decode a consolidated codebase file once per version"""
+    with _codebase_maps_lock:
+        cached = _codebase_texts.get(codebase_text_file)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+    with open(codebase_text_file, 'rb') as f:
+        text = f.read().decode('utf-8')
+    with _codebase_maps_lock:
+        _codebase_texts[codebase_text_file] = (mtime_ns, text)
+    return text
+
+def _extract_code_from_consolidated_file(
+    codebase_text_file: str,
+    file_path: str,
+    class_name: str = None,
+    codebase_index: Optional[dict] = None
+) -> str:
     """
     Extract Java code for a specific file from the consolidated codebase text file
     
@@ -162,6 +683,8 @@ def _extract_code_from_consolidated_file(codebase_text_file: str, file_path: str
         codebase_text_file: Path to consolidated codebase text file
         file_path: Relative file path to locate in consolidated file
         class_name: Optional class name to help locate the code
+        codebase_index: Optional {path: [start, end]} index of the file (loaded from
+                        codebase_index.json next to the file if not given)
         
     Returns:
         Extracted Java code string, or empty string if not found
@@ -169,9 +692,22 @@ def _extract_code_from_consolidated_file(codebase_text_file: str, file_path: str
     if not codebase_text_file or not os.path.exists(codebase_text_file):
         return ""
     
+    # Fast path: slice the file's section straight out of the shared mmap
+    if file_path:
+        if codebase_index is None:
+            codebase_index = _load_codebase_index(_codebase_index_path(codebase_text_file))
+        offsets = codebase_index.get(_normalize_codebase_path(file_path)) if codebase_index else None
+        if offsets:
+            try:
+                with _codebase_map(codebase_text_file) as mm:
+                    if mm is not None:
+                        return mm[offsets[0]:offsets[1]].decode('utf-8', 'replace')
+            except (OSError, ValueError) as e:
+                logger.debug(f"Index lookup failed for {file_path}, scanning consolidated file: {e}")
+    
     try:
-        with open(codebase_text_file, 'r', encoding='utf-8') as f:
-            codebase_content = f.read()
+        # Decoded content is shared across converter calls until the file changes
+        codebase_content = _load_codebase_text(codebase_text_file, os.stat(codebase_text_file).st_mtime_ns)
         
         # Look for file path marker (gitingest may include file paths)
         file_marker = file_path.replace('\\', '/')
@@ -187,46 +723,23 @@ def _extract_code_from_consolidated_file(codebase_text_file: str, file_path: str
                 marker_index = codebase_content.find(class_marker)
         
         if marker_index >= 0:
-            # Extract code section (try to find boundaries)
-            # Look backwards for previous file marker or section separator
+            # Section boundaries: the enclosing gitingest file header before the
+            # marker and the next one after it (or a top-level "=== ... ===" header)
             start = marker_index
-            for i in range(max(0, marker_index - 5000), marker_index):
-                if codebase_content[i:i+10] == "=== CODEBASE" or codebase_content[i:i+20] == "=== FULL CODEBASE":
-                    start = i
-                    break
-                # Check for file path markers
-                if i > 0 and codebase_content[i-1] == '\n' and codebase_content[i:i+1].isupper():
-                    # Might be a new file section
-                    potential_start = codebase_content.rfind('\n\n', max(0, i-100), i)
-                    if potential_start > 0:
-                        start = potential_start + 2
-                        break
+            window_start = max(0, marker_index - SECTION_SCAN_WINDOW)
+            for match in _SECTION_RE.finditer(codebase_content, window_start, marker_index):
+                start = match.start()
             
-            # Look forward for next file marker or reasonable end
-            end = min(len(codebase_content), marker_index + 50000)
-            next_file_marker = codebase_content.find('\n\n', marker_index + 100, end)
-            if next_file_marker > marker_index:
-                # Check if this looks like a new file (has path-like content)
-                section = codebase_content[marker_index:next_file_marker+100]
-                if any(x in section for x in ['.java', 'package ', 'import ', 'class ']):
-                    end = next_file_marker + 100
-            else:
-                # Try to find class end (simple heuristic)
-                closing_braces = codebase_content.count('}', marker_index, end) - codebase_content.count('{', marker_index, end)
-                if closing_braces > 0:
-                    last_brace = codebase_content.rfind('}', marker_index, end)
-                    if last_brace > marker_index:
-                        end = last_brace + 1
+            end = min(len(codebase_content), marker_index + SECTION_SCAN_WINDOW)
+            next_section = _SECTION_RE.search(codebase_content, marker_index + 1, end)
+            if next_section:
+                end = next_section.start()
             
             extracted = codebase_content[start:end]
             # Try to clean up - find actual Java code start
-            java_start = -1
-            for marker in ['package ', 'import ', 'class ', 'public class ', 'interface ']:
-                idx = extracted.find(marker)
-                if idx >= 0 and (java_start < 0 or idx < java_start):
-                    java_start = idx
-            if java_start > 0 and java_start < 500:
-                extracted = extracted[java_start:]
+            java_start = _JAVA_START_RE.search(extracted, 0, JAVA_START_MAX_OFFSET + len('public class '))
+            if java_start and 0 < java_start.start() < JAVA_START_MAX_OFFSET:
+                extracted = extracted[java_start.start():]
             
             return extracted
         
@@ -240,33 +753,33 @@ def _extract_code_from_consolidated_file(codebase_text_file: str, file_path: str
 
 def clone_repository_node(state: ConversionState) -> ConversionState:
     """Clone GitHub repository"""
+    from ..analyzers.repository_analyzer import RepositoryAnalyzer
     try:
         analyzer = RepositoryAnalyzer(state["github_url"])
         repo_path = analyzer.clone_repository()
         
-        # Store analyzer in state for later use
+        # Keep analyzer for the structure analysis step
+        _set_run_resource(state, "analyzer", analyzer)
         return {
-            **state,
             "repo_path": repo_path,
-            "_analyzer": analyzer  # Store for cleanup
+            "clone_dir": analyzer.temp_dir
         }
     except Exception as e:
         logger.error(f"Failed to clone repository: {e}")
         return {
-            **state,
-            "errors": state.get("errors", []) + [f"Clone failed: {str(e)}"]
+            "errors": _record_errors(f"Clone failed: {str(e)}")
         }
 
 def ingest_codebase_node(state: ConversionState) -> ConversionState:
     """Convert cloned repository into single consolidated text file using gitingest"""
+    from gitingest import ingest
     try:
         repo_path = state.get("repo_path")
         if not repo_path:
             raise ValueError("Repository not cloned. repo_path not found in state.")
         
         # Update execution status
-        _execution_status["current_phase"] = "Ingesting codebase with gitingest"
-        _execution_status["progress_percentage"] = 10
+        set_current_phase("Ingesting codebase with gitingest", 10)
         
         logger.info(f"Ingesting codebase from {repo_path} using gitingest...")
         
@@ -281,74 +794,149 @@ def ingest_codebase_node(state: ConversionState) -> ConversionState:
         
         # Save consolidated codebase to text file
         codebase_file_path = os.path.join(output_dir, "codebase.txt")
-        with open(codebase_file_path, 'w', encoding='utf-8') as f:
+        _release_codebase_file(codebase_file_path)
+        # Its map and index are released with the run's other resources
+        _set_run_resource(state, "codebase_text_file", codebase_file_path)
+        # An index left from a previous ingestion would point at stale offsets
+        try:
+            os.remove(_codebase_index_path(codebase_file_path))
+        except FileNotFoundError:
+            pass
+        content_length = len(content)
+        with open(codebase_file_path, 'w', encoding='utf-8', buffering=INGEST_WRITE_CHUNK) as f:
             # Write summary, tree structure, and full content
             f.write("=== CODEBASE SUMMARY ===\n")
             f.write(f"{summary}\n\n")
             f.write("=== DIRECTORY TREE ===\n")
             f.write(f"{tree}\n\n")
             f.write("=== FULL CODEBASE CONTENT ===\n")
-            f.write(content)
+            # Encode in bounded chunks so a second full-size (encoded) copy is never built
+            for offset in range(0, content_length, INGEST_WRITE_CHUNK):
+                f.write(content[offset:offset + INGEST_WRITE_CHUNK])
+        # Drop the in-memory copy; later stages read the file (via mmap) instead
+        del content, summary, tree
         
         logger.info(f"Codebase ingested and saved to {codebase_file_path}")
-        logger.info(f"Consolidated file size: {len(content)} characters")
+        logger.info(f"Consolidated file size: {content_length} characters")
         
         return {
-            **state,
             "codebase_text_file": codebase_file_path,
             "output_path": output_dir
         }
     except Exception as e:
         logger.error(f"Failed to ingest codebase: {e}")
         return {
-            **state,
-            "errors": state.get("errors", []) + [f"Codebase ingestion failed: {str(e)}"]
+            "errors": _record_errors(f"Codebase ingestion failed: {str(e)}")
         }
 
+def index_codebase_node(state: ConversionState) -> ConversionState:
+    """Index the file sections of the consolidated codebase file once for all later lookups"""
+    codebase_text_file = state.get("codebase_text_file")
+    if not codebase_text_file or not os.path.exists(codebase_text_file):
+        # Nothing ingested; converters fall back to reading individual files
+        return {}
+    
+    try:
+        # Single pass over the (memory-mapped) file; converters then slice sections directly
+        codebase_index = _build_codebase_index(codebase_text_file)
+        index_path = _codebase_index_path(codebase_text_file)
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump(codebase_index, f)
+        logger.info(f"Indexed {len(codebase_index)} files in consolidated codebase")
+        
+        return {
+            "codebase_index_file": index_path
+        }
+    except Exception as e:
+        # Not fatal: lookups fall back to scanning the consolidated file
+        logger.warning(f"Failed to index consolidated codebase: {e}")
+        return {}
+
 def analyze_structure_node(state: ConversionState) -> ConversionState:
     """Discover and categorize files"""
+    from ..analyzers.repository_analyzer import RepositoryAnalyzer
     try:
-        # Reuse analyzer from state if available
-        analyzer = state.get("_analyzer")
+        # Reuse analyzer from the clone step if available
+        analyzer = _get_run_resource(state, "analyzer")
+        result = {}
         if not analyzer or analyzer.repo_path != state["repo_path"]:
             analyzer = RepositoryAnalyzer(state["github_url"])
             analyzer.repo_path = state["repo_path"]
             if not analyzer.repo_path:
                 # If repo_path not set, clone again
-                analyzer.clone_repository()
+                result["repo_path"] = analyzer.clone_repository()
+                result["clone_dir"] = analyzer.temp_dir
         
         file_map = analyzer.discover_files()
         build_system = analyzer.detect_build_system()
         dependencies = analyzer.parse_dependencies()
         
+        # Nothing downstream needs the analyzer; the clone itself is removed after config migration
+        _set_run_resource(state, "analyzer", None)
+        
         return {
-            **state,
+            **result,
             "file_map": file_map,
             "build_system": build_system,
-            "java_dependencies": dependencies,
-            "_analyzer": analyzer
+            "java_dependencies": dependencies
         }
     except Exception as e:
         logger.error(f"Failed to analyze structure: {e}")
         return {
-            **state,
-            "errors": state.get("errors", []) + [f"Structure analysis failed: {str(e)}"]
+            "errors": _record_errors(f"Structure analysis failed: {str(e)}")
         }
 
+def _write_metadata_file(metadata_path: str, metadata: dict):
+    """
+    Write project metadata as indented JSON
+    
+    Uses orjson when available (C-level serialization straight to bytes),
+    otherwise the stdlib encoder.
+    
+    Args:
+        metadata_path: Output file path
+        metadata: Metadata dict
+    """
+    if orjson is not None:
+        try:
+            data = orjson.dumps(metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            data = None
+        if data is not None:
+            with open(metadata_path, "wb") as f:
+                f.write(data)
+            return
+    
+    with open(metadata_path, "w") as f:
+        json.dump(metadata, f, indent=2)
+
+def _bucket_modules(modules: list) -> dict:
+    """Group metadata modules by their "type" in a single pass"""
+    buckets = {}
+    for module in modules:
+        buckets.setdefault(module.get("type"), []).append(module)
+    return buckets
+
+def _modules_of_type(state: ConversionState, module_type: str) -> list:
+    """Modules of one type, from the buckets built by extract_metadata_node when available"""
+    buckets = state.get("modules_by_type")
+    if buckets is None:
+        buckets = _bucket_modules(state["metadata"]["modules"])
+    return buckets.get(module_type, [])
+
 def extract_metadata_node(state: ConversionState) -> ConversionState:
     """Extract comprehensive project metadata"""
+    from ..extractors.metadata_extractor import MetadataExtractor
     try:
         if not state.get("file_map"):
             raise ValueError("file_map not found in state")
         
         # Update execution status
-        _execution_status["current_phase"] = "Extracting Metadata"
-        _execution_status["progress_percentage"] = 30
+        set_current_phase("Extracting Metadata", 30)
         
         # Count total files
         total_files = sum(len(files) for files in state["file_map"].values())
-        _execution_status["files_total"] = total_files
-        _execution_status["files_processed"] = 0
+        set_files_total(total_files)
         
         model = state.get("model", "")
         if not model or not model.strip():
@@ -356,32 +944,10 @@ def extract_metadata_node(state: ConversionState) -> ConversionState:
                 "Model parameter is required. Please specify --model when running conversion."
             )
         
-        # Get LLM configuration from state (support both new and legacy format)
-        provider = state.get("llm_provider")
-        api_token = state.get("llm_api_token")
-        base_url = state.get("llm_base_url")
-        profile_name = state.get("llm_profile_name")
-        config_path = state.get("llm_config_path")
-        
-        # Legacy support: convert gemini_api_token if present
-        if not api_token and state.get("gemini_api_token"):
-            provider = provider or "gemini"
-            api_token = state["gemini_api_token"]
-        
-        # Default to gemini if no provider specified (backward compatibility)
-        if not provider:
-            provider = "gemini"
-        
-        extractor = MetadataExtractor(
-            provider=provider,
-            api_token=api_token,
-            model=model,
-            base_url=base_url,
-            profile_name=profile_name,
-            config_path=config_path,
-            # Legacy support
-            gemini_api_token=state.get("gemini_api_token") if not api_token else None
-        )
+        # Build the LLM client once; later nodes of this run reuse it
+        llm_client = _get_run_resource(state, "llm_client") or _create_llm_client_from_state(state)
+        _set_run_resource(state, "llm_client", llm_client)
+        extractor = MetadataExtractor(llm_client=llm_client, cancel_event=_run_cancel_event(state))
         
         # Use consolidated codebase file if available, otherwise fallback to individual files
         codebase_text_file = state.get("codebase_text_file")
@@ -401,14 +967,13 @@ def extract_metadata_node(state: ConversionState) -> ConversionState:
         os.makedirs(output_dir, exist_ok=True)
         
         metadata_path = os.path.join(output_dir, "project-metadata.json")
-        with open(metadata_path, "w") as f:
-            json.dump(metadata, f, indent=2)
+        _write_metadata_file(metadata_path, metadata)
         
         logger.info(f"Metadata extracted and saved to {metadata_path}")
         
         return {
-            **state,
             "metadata": metadata,
+            "modules_by_type": _bucket_modules(metadata.get("modules", [])),
             "output_path": output_dir
         }
     except Exception as e:
@@ -422,20 +987,20 @@ def extract_metadata_node(state: ConversionState) -> ConversionState:
             try:
                 os.makedirs(output_dir, exist_ok=True)
                 metadata_path = os.path.join(output_dir, "project-metadata.json")
-                with open(metadata_path, "w") as f:
-                    json.dump(empty_metadata, f, indent=2)
+                _write_metadata_file(metadata_path, empty_metadata)
                 logger.info(f"Saved empty metadata file to {metadata_path}")
             except Exception as save_error:
                 logger.warning(f"Failed to save empty metadata file: {save_error}")
         
         return {
-            **state,
             "metadata": empty_metadata,
-            "errors": state.get("errors", []) + [f"Metadata extraction failed: {str(e)}"]
+            "modules_by_type": {},
+            "errors": _record_errors(f"Metadata extraction failed: {str(e)}")
         }
 
 def map_dependencies_node(state: ConversionState) -> ConversionState:
     """Map Java dependencies to Node.js"""
+    from ..mappers.dependency_mapper import DependencyMapper
     try:
         mapper = DependencyMapper()
         java_deps = state.get("java_dependencies", [])
@@ -444,31 +1009,211 @@ def map_dependencies_node(state: ConversionState) -> ConversionState:
         logger.info(f"Mapped {len(node_deps)} Node.js dependencies")
         
         return {
-            **state,
             "node_dependencies": node_deps
         }
     except Exception as e:
         logger.error(f"Failed to map dependencies: {e}")
         return {
-            **state,
-            "errors": state.get("errors", []) + [f"Dependency mapping failed: {str(e)}"],
+            "errors": _record_errors(f"Dependency mapping failed: {str(e)}"),
             "node_dependencies": {}
         }
 
+# Default number of components converted concurrently within a conversion stage
+DEFAULT_MAX_PARALLEL_CONVERSIONS = 8
+
+# Number of entities sent to the LLM in a single model conversion request
+ENTITY_BATCH_SIZE = 8
+
+# Worker threads used to prefetch individual source files that are missing from the codebase index
+SOURCE_PREFETCH_WORKERS = 16
+
+def _read_source_file(full_path: str) -> str:
+    """Read a source file, returning an empty string if it does not exist"""
+    # Open directly (no exists() pre-check) and decode in one step, skipping
+    # text-mode newline translation
+    try:
+        with open(full_path, 'rb') as f:
+            return f.read().decode('utf-8', 'replace')
+    except (FileNotFoundError, NotADirectoryError):
+        return ""
+
+def _prefetch_source_files(state: ConversionState, modules: list) -> dict:
+    """
+    Read the individual source files of modules not covered by the codebase index
+    
+    Reads run in a thread pool so disk latency overlaps instead of being
+    paid once per module inside the conversion loop.
+    
+    Args:
+        state: Conversion state (repo_path / codebase_index_file)
+        modules: Module metadata with filePath
+        
+    Returns:
+        Dictionary mapping filePath to source code
+    """
+    repo_path = state.get("repo_path")
+    if not repo_path:
+        return {}
+    
+    codebase_index = _load_codebase_index(state.get("codebase_index_file")) or {}
+    paths = {
+        m.get("filePath") for m in modules
+        if m.get("filePath") and _normalize_codebase_path(m.get("filePath")) not in codebase_index
+    }
+    if not paths:
+        return {}
+    
+    def read(file_path):
+        try:
+            return file_path, _read_source_file(os.path.join(repo_path, file_path))
+        except Exception as e:
+            # Left out of the result so the conversion re-reads it and reports the error
+            logger.debug(f"Could not prefetch {file_path}: {e}")
+            return file_path, None
+    
+    with ThreadPoolExecutor(max_workers=min(SOURCE_PREFETCH_WORKERS, len(paths))) as executor:
+        return {path: code for path, code in executor.map(read, paths) if code is not None}
+
+def _load_java_code(state: ConversionState, module: dict, source_files: Optional[dict] = None) -> str:
+    """
+    Get the Java source for a module
+    
+    Args:
+        state: Conversion state (codebase_text_file / repo_path)
+        module: Module metadata with filePath and name
+        source_files: Optional {filePath: code} of prefetched individual files
+        
+    Returns:
+        Java source code, or an empty string if it cannot be found
+    """
+    java_code = ""
+    file_path = module.get("filePath")
+    class_name = module.get("name", "")
+    
+    # Try consolidated file first
+    codebase_text_file = state.get("codebase_text_file")
+    if codebase_text_file:
+        # A resumed run skips ingestion, so the file is registered for release here too
+        if _get_run_resource(state, "codebase_text_file") is None:
+            _set_run_resource(state, "codebase_text_file", codebase_text_file)
+        java_code = _extract_code_from_consolidated_file(
+            codebase_text_file, file_path, class_name, _load_codebase_index(state.get("codebase_index_file"))
+        )
+    
+    # Fallback to reading individual file if not found in consolidated file
+    if not java_code and file_path:
+        if source_files and file_path in source_files:
+            java_code = source_files[file_path]
+        else:
+            repo_path = state.get("repo_path")
+            if repo_path:
+                java_code = _read_source_file(os.path.join(repo_path, file_path))
+    
+    return java_code
+
+# Converted code at least this long (characters) is kept in a file rather than in the
+# (checkpointed) state until the project is generated
+COMPONENT_SPILL_MIN_SIZE = int(os.getenv("COMPONENT_SPILL_MIN_SIZE", str(16 * 1024)))
+
+def _component_spill_dir(run_id: Optional[str]) -> str:
+    """Directory holding the spilled component code of a run"""
+    return os.path.join(tempfile.gettempdir(), f"conversion-components-{run_id}")
+
+def _spill_component_code(state: ConversionState, component: Any) -> Any:
+    """
+    Move large converted code out of a component into a file
+    
+    Args:
+        state: Conversion state (run_id)
+        component: Converted component, or a list of them for a batch
+        
+    Returns:
+        The component, with "code_file" (path of the code) in place of "code"
+        when the code was spilled
+    """
+    if isinstance(component, list):
+        return [_spill_component_code(state, c) for c in component]
+    code = component.get("code") if isinstance(component, dict) else None
+    if not isinstance(code, str) or len(code) < COMPONENT_SPILL_MIN_SIZE:
+        return component
+    
+    spill_dir = _component_spill_dir(state.get("run_id"))
+    os.makedirs(spill_dir, exist_ok=True)
+    code_file = os.path.join(spill_dir, f"{uuid.uuid4().hex}.js")
+    with open(code_file, 'w', encoding='utf-8') as f:
+        f.write(code)
+    
+    spilled = {k: v for k, v in component.items() if k != "code"}
+    spilled["code_file"] = code_file
+    return spilled
+
+def _convert_modules(state: ConversionState, modules: list, convert, create_stub, kind: str) -> list:
+    """
+    Convert modules concurrently, falling back to a stub for any that fail
+    
+    LLM calls are network-bound, so a bounded thread pool overlaps their
+    latency; results keep the order of the input modules. The pool is shared
+    by the (parallel) converter stages of a run, so max_parallel_conversions
+    caps the LLM requests in flight for the whole run. Large converted code is
+    spilled to files as each module finishes (see _spill_component_code).
+    
+    Args:
+        state: Conversion state (max_parallel_conversions)
+        modules: Module metadata to convert
+        convert: Callable converting a single module
+        create_stub: Callable creating a stub for a module that failed to convert
+        kind: Component kind used in log messages
+        
+    Returns:
+        List of converted components
+    """
+    cancel_event = _run_cancel_event(state)
+    
+    def convert_one(module):
+        if cancel_event is not None and cancel_event.is_set():
+            # Run cancelled: no LLM call for the modules not started yet
+            return create_stub(module)
+        try:
+            return _spill_component_code(state, convert(module))
+        except Exception as e:
+            if isinstance(module, dict):
+                name = module.get('name', 'unknown')
+            else:
+                # A batch of modules
+                name = ", ".join(m.get('name', 'unknown') for m in module)
+            logger.warning(f"Failed to convert {kind} {name}: {e}")
+            return create_stub(module)
+    
+    max_workers = state.get("max_parallel_conversions") or DEFAULT_MAX_PARALLEL_CONVERSIONS
+    if max_workers <= 1 or len(modules) <= 1:
+        return [convert_one(module) for module in modules]
+    
+    executor = _get_or_create_run_resource(
+        state,
+        "conversion_executor",
+        lambda: ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="convert")
+    )
+    return list(executor.map(convert_one, modules))
+
 def convert_models_node(state: ConversionState) -> ConversionState:
     """Convert JPA entities to ORM models"""
+    from ..converters.model_converter import ModelConverter
     try:
         # Check for metadata - skip gracefully if missing instead of failing
         metadata = state.get("metadata")
         if not metadata or not metadata.get("modules"):
             logger.warning("Metadata not found or has no modules, skipping model conversion")
             return {
-                **state,
-                "errors": state.get("errors", []) + [f"Model conversion skipped: Metadata not found"],
-                "converted_components": {
-                    **state.get("converted_components", {}),
-                    "models": []
-                }
+                "errors": _record_errors(f"Model conversion skipped: Metadata not found"),
+                "converted_components": {"models": []}
+            }
+        
+        entities = _modules_of_type(state, "Entity")
+        if not entities:
+            # Nothing to convert: skip client/converter setup entirely
+            logger.info("No entities to convert")
+            return {
+                "converted_components": {"models": []}
             }
         
         model = state.get("model", "")
@@ -477,78 +1222,62 @@ def convert_models_node(state: ConversionState) -> ConversionState:
                 "Model parameter is required. Please specify --model when running conversion."
             )
         
-        # Create LLM client from state
-        llm_client = _create_llm_client_from_state(state)
+        # Reuse the LLM client created during metadata extraction
+        llm_client = _get_run_resource(state, "llm_client") or _create_llm_client_from_state(state)
         
         converter = ModelConverter(
             orm_choice="sequelize",
             llm_client=llm_client
         )
         
-        converted_models = []
-        entities = [m for m in state["metadata"]["modules"] if m.get("type") == "Entity"]
-        
         logger.info(f"Converting {len(entities)} entities to models...")
         
-        for entity in entities:
-            try:
-                # Get Java code from consolidated file or individual file
-                java_code = ""
-                file_path = entity.get("filePath")
-                class_name = entity.get("name", "")
-                
-                # Try consolidated file first
-                codebase_text_file = state.get("codebase_text_file")
-                if codebase_text_file:
-                    java_code = _extract_code_from_consolidated_file(codebase_text_file, file_path, class_name)
-                
-                # Fallback to reading individual file if not found in consolidated file
-                if not java_code and file_path and state.get("repo_path"):
-                    full_path = os.path.join(state["repo_path"], file_path)
-                    if os.path.exists(full_path):
-                        with open(full_path, 'r', encoding='utf-8') as f:
-                            java_code = f.read()
-                
-                converted = converter.convert_entity(entity, java_code)
-                converted_models.append(converted)
-            except Exception as e:
-                logger.warning(f"Failed to convert entity {entity.get('name', 'unknown')}: {e}")
-                converted_models.append(converter._create_stub_model(entity))
+        # Convert entities in batches (one LLM request per batch), batches in parallel
+        source_files = _prefetch_source_files(state, entities)
+        batches = [entities[i:i + ENTITY_BATCH_SIZE] for i in range(0, len(entities), ENTITY_BATCH_SIZE)]
+        converted_batches = _convert_modules(
+            state,
+            batches,
+            lambda batch: converter.convert_entities_batch(
+                batch, [_load_java_code(state, entity, source_files) for entity in batch]
+            ),
+            lambda batch: [converter._create_stub_model(entity) for entity in batch],
+            "entity batch"
+        )
+        converted_models = [model for batch in converted_batches for model in batch]
         
         logger.info(f"Converted {len(converted_models)} models")
         
+        # Return only this branch's output; parallel branches are merged by the state reducers
         return {
-            **state,
-            "converted_components": {
-                **state.get("converted_components", {}),
-                "models": converted_models
-            }
+            "converted_components": {"models": converted_models}
         }
     except Exception as e:
         logger.error(f"Failed to convert models: {e}")
         return {
-            **state,
-            "errors": state.get("errors", []) + [f"Model conversion failed: {str(e)}"],
-            "converted_components": {
-                **state.get("converted_components", {}),
-                "models": []
-            }
+            "errors": _record_errors(f"Model conversion failed: {str(e)}"),
+            "converted_components": {"models": []}
         }
 
 def convert_repositories_node(state: ConversionState) -> ConversionState:
     """Convert repositories/DAOs"""
+    from ..converters.repository_converter import RepositoryConverter
     try:
         # Check for metadata - skip gracefully if missing instead of failing
         metadata = state.get("metadata")
         if not metadata or not metadata.get("modules"):
             logger.warning("Metadata not found or has no modules, skipping repository conversion")
             return {
-                **state,
-                "errors": state.get("errors", []) + [f"Repository conversion skipped: Metadata not found"],
-                "converted_components": {
-                    **state.get("converted_components", {}),
-                    "repositories": []
-                }
+                "errors": _record_errors(f"Repository conversion skipped: Metadata not found"),
+                "converted_components": {"repositories": []}
+            }
+        
+        repositories = _modules_of_type(state, "Repository")
+        if not repositories:
+            # Nothing to convert: skip client/converter setup entirely
+            logger.info("No repositories to convert")
+            return {
+                "converted_components": {"repositories": []}
             }
         
         model = state.get("model", "")
@@ -557,88 +1286,69 @@ def convert_repositories_node(state: ConversionState) -> ConversionState:
                 "Model parameter is required. Please specify --model when running conversion."
             )
         
-        # Create LLM client from state
-        llm_client = _create_llm_client_from_state(state)
+        # Reuse the LLM client created during metadata extraction
+        llm_client = _get_run_resource(state, "llm_client") or _create_llm_client_from_state(state)
         
         converter = RepositoryConverter(
             orm_choice="sequelize",
             llm_client=llm_client
         )
         
-        converted_repos = []
-        repositories = [m for m in state["metadata"]["modules"] if m.get("type") == "Repository"]
-        
         logger.info(f"Converting {len(repositories)} repositories...")
         
-        for repo in repositories:
-            try:
-                # Find corresponding entity
-                repo_name = repo.get("name", "")
-                entity_name = repo_name.replace("Repository", "")
-                entity = None
-                
-                for m in state["metadata"]["modules"]:
-                    if m.get("name") == entity_name and m.get("type") == "Entity":
-                        entity = m
-                        break
-                
-                # Get Java code from consolidated file or individual file
-                java_code = ""
-                file_path = repo.get("filePath")
-                class_name = repo.get("name", "")
-                
-                # Try consolidated file first
-                codebase_text_file = state.get("codebase_text_file")
-                if codebase_text_file:
-                    java_code = _extract_code_from_consolidated_file(codebase_text_file, file_path, class_name)
-                
-                # Fallback to reading individual file if not found in consolidated file
-                if not java_code and file_path and state.get("repo_path"):
-                    full_path = os.path.join(state["repo_path"], file_path)
-                    if os.path.exists(full_path):
-                        with open(full_path, 'r', encoding='utf-8') as f:
-                            java_code = f.read()
-                
-                converted = converter.convert_repository(repo, entity)
-                converted_repos.append(converted)
-            except Exception as e:
-                logger.warning(f"Failed to convert repository {repo.get('name', 'unknown')}: {e}")
-                converted_repos.append(converter._create_stub_repository(repo))
+        # Index modules by (name, type) once instead of scanning all modules per repository
+        # (first match wins, as with the previous linear scan)
+        by_name_type = {}
+        for m in state["metadata"]["modules"]:
+            by_name_type.setdefault((m.get("name"), m.get("type")), m)
+        
+        # Pass the source through so the converter doesn't re-open filePath itself
+        # (which is relative to the repository root, not the working directory)
+        source_files = _prefetch_source_files(state, repositories)
+        converted_repos = _convert_modules(
+            state,
+            repositories,
+            lambda repo: converter.convert_repository(
+                repo,
+                by_name_type.get((repo.get("name", "").replace("Repository", ""), "Entity")),
+                _load_java_code(state, repo, source_files)
+            ),
+            converter._create_stub_repository,
+            "repository"
+        )
         
         logger.info(f"Converted {len(converted_repos)} repositories")
         
+        # Return only this branch's output; parallel branches are merged by the state reducers
         return {
-            **state,
-            "converted_components": {
-                **state.get("converted_components", {}),
-                "repositories": converted_repos
-            }
+            "converted_components": {"repositories": converted_repos}
         }
     except Exception as e:
         logger.error(f"Failed to convert repositories: {e}")
         return {
-            **state,
-            "errors": state.get("errors", []) + [f"Repository conversion failed: {str(e)}"],
-            "converted_components": {
-                **state.get("converted_components", {}),
-                "repositories": []
-            }
+            "errors": _record_errors(f"Repository conversion failed: {str(e)}"),
+            "converted_components": {"repositories": []}
         }
 
 def convert_services_node(state: ConversionState) -> ConversionState:
     """Convert service layer"""
+    from ..converters.service_converter import ServiceConverter
     try:
         # Check for metadata - skip gracefully if missing instead of failing
         metadata = state.get("metadata")
         if not metadata or not metadata.get("modules"):
             logger.warning("Metadata not found or has no modules, skipping service conversion")
             return {
-                **state,
-                "errors": state.get("errors", []) + [f"Service conversion skipped: Metadata not found"],
-                "converted_components": {
-                    **state.get("converted_components", {}),
-                    "services": []
-                }
+                "errors": _record_errors(f"Service conversion skipped: Metadata not found"),
+                "converted_components": {"services": []}
+            }
+        
+        services = _modules_of_type(state, "Service")
+        if not services:
+            # Nothing to convert: skip client/converter setup entirely
+            logger.info("No services to convert")
+            return {
+                "converted_components": {"services": []}
             }
         
         model = state.get("model", "")
@@ -647,77 +1357,56 @@ def convert_services_node(state: ConversionState) -> ConversionState:
                 "Model parameter is required. Please specify --model when running conversion."
             )
         
-        # Create LLM client from state
-        llm_client = _create_llm_client_from_state(state)
+        # Reuse the LLM client created during metadata extraction
+        llm_client = _get_run_resource(state, "llm_client") or _create_llm_client_from_state(state)
         
         converter = ServiceConverter(
             llm_client=llm_client
         )
         
-        converted_services = []
-        services = [m for m in state["metadata"]["modules"] if m.get("type") == "Service"]
-        
         logger.info(f"Converting {len(services)} services...")
         
-        for service in services:
-            try:
-                # Get Java code from consolidated file or individual file
-                java_code = ""
-                file_path = service.get("filePath")
-                class_name = service.get("name", "")
-                
-                # Try consolidated file first
-                codebase_text_file = state.get("codebase_text_file")
-                if codebase_text_file:
-                    java_code = _extract_code_from_consolidated_file(codebase_text_file, file_path, class_name)
-                
-                # Fallback to reading individual file if not found in consolidated file
-                if not java_code and file_path and state.get("repo_path"):
-                    full_path = os.path.join(state["repo_path"], file_path)
-                    if os.path.exists(full_path):
-                        with open(full_path, 'r', encoding='utf-8') as f:
-                            java_code = f.read()
-                
-                converted = converter.convert_service(service, java_code)
-                converted_services.append(converted)
-            except Exception as e:
-                logger.warning(f"Failed to convert service {service.get('name', 'unknown')}: {e}")
-                converted_services.append(converter._create_stub_service(service))
+        source_files = _prefetch_source_files(state, services)
+        converted_services = _convert_modules(
+            state,
+            services,
+            lambda service: converter.convert_service(service, _load_java_code(state, service, source_files)),
+            converter._create_stub_service,
+            "service"
+        )
         
         logger.info(f"Converted {len(converted_services)} services")
         
+        # Return only this branch's output; parallel branches are merged by the state reducers
         return {
-            **state,
-            "converted_components": {
-                **state.get("converted_components", {}),
-                "services": converted_services
-            }
+            "converted_components": {"services": converted_services}
         }
     except Exception as e:
         logger.error(f"Failed to convert services: {e}")
         return {
-            **state,
-            "errors": state.get("errors", []) + [f"Service conversion failed: {str(e)}"],
-            "converted_components": {
-                **state.get("converted_components", {}),
-                "services": []
-            }
+            "errors": _record_errors(f"Service conversion failed: {str(e)}"),
+            "converted_components": {"services": []}
         }
 
 def convert_controllers_node(state: ConversionState) -> ConversionState:
     """Convert controllers to routes"""
+    from ..converters.controller_converter import ControllerConverter
     try:
         # Check for metadata - skip gracefully if missing instead of failing
         metadata = state.get("metadata")
         if not metadata or not metadata.get("modules"):
             logger.warning("Metadata not found or has no modules, skipping controller conversion")
             return {
-                **state,
-                "errors": state.get("errors", []) + [f"Controller conversion skipped: Metadata not found"],
-                "converted_components": {
-                    **state.get("converted_components", {}),
-                    "controllers": []
-                }
+                "errors": _record_errors(f"Controller conversion skipped: Metadata not found"),
+                "converted_components": {"controllers": []}
+            }
+        
+        controllers = _modules_of_type(state, "Controller")
+        if not controllers:
+            # Nothing to convert: skip client/converter setup entirely
+            logger.info("No controllers to convert")
+            return {
+                "converted_components": {"controllers": []}
             }
         
         model = state.get("model", "")
@@ -726,66 +1415,66 @@ def convert_controllers_node(state: ConversionState) -> ConversionState:
                 "Model parameter is required. Please specify --model when running conversion."
             )
         
-        # Create LLM client from state
-        llm_client = _create_llm_client_from_state(state)
+        # Reuse the LLM client created during metadata extraction
+        llm_client = _get_run_resource(state, "llm_client") or _create_llm_client_from_state(state)
         
         converter = ControllerConverter(
             target_framework=state.get("target_framework", "express"),
             llm_client=llm_client
         )
         
-        converted_controllers = []
-        controllers = [m for m in state["metadata"]["modules"] if m.get("type") == "Controller"]
-        
         logger.info(f"Converting {len(controllers)} controllers...")
         
-        for controller in controllers:
-            try:
-                # Get Java code from consolidated file or individual file
-                java_code = ""
-                file_path = controller.get("filePath")
-                class_name = controller.get("name", "")
-                
-                # Try consolidated file first
-                codebase_text_file = state.get("codebase_text_file")
-                if codebase_text_file:
-                    java_code = _extract_code_from_consolidated_file(codebase_text_file, file_path, class_name)
-                
-                # Fallback to reading individual file if not found in consolidated file
-                if not java_code and file_path and state.get("repo_path"):
-                    full_path = os.path.join(state["repo_path"], file_path)
-                    if os.path.exists(full_path):
-                        with open(full_path, 'r', encoding='utf-8') as f:
-                            java_code = f.read()
-                
-                converted = converter.convert_controller(controller, java_code)
-                converted_controllers.append(converted)
-            except Exception as e:
-                logger.warning(f"Failed to convert controller {controller.get('name', 'unknown')}: {e}")
-                converted_controllers.append(converter._create_stub_controller(controller))
+        source_files = _prefetch_source_files(state, controllers)
+        converted_controllers = _convert_modules(
+            state,
+            controllers,
+            lambda controller: converter.convert_controller(controller, _load_java_code(state, controller, source_files)),
+            converter._create_stub_controller,
+            "controller"
+        )
         
         logger.info(f"Converted {len(converted_controllers)} controllers")
         
+        # Return only this branch's output; parallel branches are merged by the state reducers
         return {
-            **state,
-            "converted_components": {
-                **state.get("converted_components", {}),
-                "controllers": converted_controllers
-            }
+            "converted_components": {"controllers": converted_controllers}
         }
     except Exception as e:
         logger.error(f"Failed to convert controllers: {e}")
         return {
-            **state,
-            "errors": state.get("errors", []) + [f"Controller conversion failed: {str(e)}"],
-            "converted_components": {
-                **state.get("converted_components", {}),
-                "controllers": []
-            }
+            "errors": _record_errors(f"Controller conversion failed: {str(e)}"),
+            "converted_components": {"controllers": []}
         }
 
+def _remove_clone(state: ConversionState) -> dict:
+    """
+    Delete the temporary clone once no later node reads from it
+    
+    Source code is served from the consolidated codebase file from here on.
+    Only directories created by the clone step (clone_dir) are removed.
+    
+    Returns:
+        State update clearing repo_path/clone_dir, or an empty dict if there was no clone
+    """
+    clone_dir = state.get("clone_dir")
+    if not clone_dir:
+        return {}
+    
+    from ..analyzers.repository_analyzer import remove_directory
+    try:
+        remove_directory(clone_dir)
+        logger.info(f"Removed temporary clone: {clone_dir}")
+    except OSError as e:
+        logger.warning(f"Failed to remove temporary clone {clone_dir}: {e}")
+    return {
+        "repo_path": None,
+        "clone_dir": None
+    }
+
 def generate_config_node(state: ConversionState) -> ConversionState:
     """Generate configuration files"""
+    from ..migrators.config_migrator import ConfigMigrator
     try:
         migrator = ConfigMigrator()
         repo_path = state.get("repo_path")
@@ -802,19 +1491,20 @@ def generate_config_node(state: ConversionState) -> ConversionState:
         logger.info("Generated configuration")
         
         return {
-            **state,
+            **_remove_clone(state),
             "node_config": config
         }
     except Exception as e:
         logger.error(f"Failed to generate config: {e}")
         return {
-            **state,
-            "errors": state.get("errors", []) + [f"Config generation failed: {str(e)}"],
+            **_remove_clone(state),
+            "errors": _record_errors(f"Config generation failed: {str(e)}"),
             "node_config": {}
         }
 
 def generate_project_node(state: ConversionState) -> ConversionState:
     """Generate complete Node.js project"""
+    from ..generators.project_generator import ProjectGenerator
     try:
         generator = ProjectGenerator()
         
@@ -838,20 +1528,22 @@ def generate_project_node(state: ConversionState) -> ConversionState:
         
         logger.info(f"Generated project at {final_path}")
         
+        # Spilled component code has been written into the project
+        shutil.rmtree(_component_spill_dir(state.get("run_id")), ignore_errors=True)
+        
         return {
-            **state,
             "output_path": final_path
         }
     except Exception as e:
         logger.error(f"Failed to generate project: {e}")
         return {
-            **state,
-            "errors": state.get("errors", []) + [f"Project generation failed: {str(e)}"],
-            "output_path": state.get("output_path", "/tmp/conversion-output")
+            "errors": _record_errors(f"Project generation failed: {str(e)}"),
+            "output_path": state.get("output_path") or "/tmp/conversion-output"
         }
 
 def validate_node(state: ConversionState) -> ConversionState:
     """Validate generated project"""
+    from ..validators.conversion_validator import ConversionValidator
     try:
         validator = ConversionValidator()
         output_path = state.get("output_path")
@@ -880,16 +1572,14 @@ def validate_node(state: ConversionState) -> ConversionState:
         logger.info(f"Validation completed: {'Valid' if final_result['valid'] else 'Invalid'}")
         
         return {
-            **state,
             "validation_result": final_result
         }
     except Exception as e:
         logger.error(f"Failed to validate project: {e}")
         return {
-            **state,
             "validation_result": {
                 "valid": False,
-                "errors": [f"Validation failed: {str(e)}"],
+                "errors": _record_errors(f"Validation failed: {str(e)}"),
                 "warnings": [],
                 "stats": {}
             }
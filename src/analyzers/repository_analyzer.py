@@ -2,15 +2,193 @@
 
 import os
 import re
+import shutil
+import hashlib
 import tempfile
 import logging
+import threading
 from typing import Dict, List, Optional
-from pathlib import Path
 import subprocess
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import xml.etree.ElementTree as ET
 
+try:
+    import fcntl
+except ImportError:  # Windows: clone cache disabled
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
+# Metadata patterns, compiled once for all scanned files. Java files are scanned as raw
+# bytes (the patterns are ASCII); only captured names are decoded
+# (package is matched only at line starts found with str.find; modifiers before
+# class/interface never change the captured name, so they are not matched)
+_PACKAGE_RE = re.compile(rb'package\s+([\w.]+);')
+_CLASS_RE = re.compile(rb'class\s+(\w+)')
+_INTERFACE_RE = re.compile(rb'interface\s+(\w+)')
+# Gradle dependency declarations: implementation 'group:artifact:version' (Groovy DSL)
+# or implementation("group:artifact:version") (Kotlin DSL)
+_GRADLE_DEPENDENCY_RE = re.compile(
+    r"(?:implementation|compile|api|runtimeOnly|testImplementation)(?:\s+|\s*\(\s*)['\"]([^:'\"]+):([^:'\"]+):([^'\"]+)['\"]"
+)
+
+# Worker threads reading and categorizing Java files (overlapping the reads is what
+# pays off on large repositories)
+DISCOVERY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Maximum file scans queued ahead of the walker
+DISCOVERY_WINDOW = DISCOVERY_WORKERS * 4
+
+# Characters read from the start of each Java file for categorization and metadata
+CATEGORIZATION_SAMPLE_SIZE = 10000
+
+# Characters read first from files already categorized by their directory (only the
+# package and type name are needed; the full sample is read if they are not found)
+PATH_CATEGORIZED_SAMPLE_SIZE = 2048
+
+# Conventional Spring package names and the category of the files inside them
+PATH_CATEGORIES = {
+    'controller': 'controllers',
+    'controllers': 'controllers',
+    'service': 'services',
+    'services': 'services',
+    'repository': 'repositories',
+    'repositories': 'repositories',
+    'entity': 'entities',
+    'entities': 'entities',
+    'config': 'configs',
+    'configuration': 'configs'
+}
+
+# Directories never descended into while looking for Java sources
+SKIPPED_DIRECTORIES = frozenset({'.git', 'node_modules'})
+
+# Build output directories, skipped only next to a build file (a module root) so that
+# packages such as com/acme/build/ are still scanned
+BUILD_OUTPUT_DIRECTORIES = frozenset({'target', 'build'})
+BUILD_FILES = frozenset({'pom.xml', 'build.gradle', 'build.gradle.kts'})
+
+# Files materialized by the sparse checkout: Java sources, build files, Spring config and
+# READMEs (for the project overview); blobs of everything else are never downloaded
+SPARSE_CHECKOUT_PATTERNS = (
+    '*.java',
+    'pom.xml',
+    'build.gradle*',
+    'settings.gradle*',
+    'build.xml',
+    'application*.properties',
+    'application*.yml',
+    'application*.yaml',
+    'README*'
+)
+
+# Timeout for each git command of a clone, in seconds
+GIT_CLONE_TIMEOUT = 300
+
+# Optional directory of cached clones keyed by repository URL and commit. Re-running a
+# conversion of an unchanged repository hard-links the cached checkout instead of cloning
+CLONE_CACHE_DIR = os.getenv("CLONE_CACHE_DIR")
+
+# Scan results (category, package, class name) of Java files, keyed by repository-relative
+# path and git blob id (a hash of the content), shared by the analyzers of this process.
+# Fresh clones of an unchanged repository have the same blob ids, so re-analysis skips
+# reading and categorizing the files; least recently used entries are evicted
+SCAN_CACHE_MAX_ENTRIES = int(os.getenv("SCAN_CACHE_MAX_ENTRIES", "100000"))
+_scan_cache = OrderedDict()
+_scan_cache_lock = threading.Lock()
+
+
+def remove_directory(path: str):
+    """
+    Delete a directory tree (e.g. a clone)
+    
+    On POSIX systems this uses rm -rf, which removes large checkouts much faster
+    than shutil.rmtree's per-entry Python recursion; shutil.rmtree is the fallback.
+    
+    Args:
+        path: Directory to delete
+        
+    Raises:
+        OSError: If the directory could not be removed
+    """
+    if os.name == 'posix':
+        try:
+            subprocess.run(['rm', '-rf', '--', path], check=False, capture_output=True, timeout=60)
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"rm -rf {path} failed: {e}")
+    if os.path.exists(path):
+        shutil.rmtree(path)
+
+
+def _link_tree(src: str, dest: str) -> bool:
+    """
+    Copy a directory tree as hard links (cp -al), which is near-instant
+    
+    Args:
+        src: Existing directory
+        dest: Destination path (must not exist)
+        
+    Returns:
+        True if the tree was linked
+    """
+    try:
+        result = subprocess.run(['cp', '-al', '--', src, dest], capture_output=True, timeout=GIT_CLONE_TIMEOUT)
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"cp -al {src} failed: {e}")
+        return False
+    return result.returncode == 0
+
+
+def _walk_java_files(root: str):
+    """
+    Yield paths of non-test Java files under root
+    
+    Prunes VCS directories, build output of module roots and any directory whose
+    name contains "test" instead of walking them and filtering afterwards.
+    
+    Args:
+        root: Directory to walk
+        
+    Yields:
+        Java file paths (str)
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        subdirectories = []
+        module_root = False
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name.lower()
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIPPED_DIRECTORIES and 'test' not in name:
+                            subdirectories.append(entry)
+                    elif entry.name in BUILD_FILES:
+                        module_root = True
+                    elif name.endswith('.java') and 'test' not in name:
+                        yield entry.path
+        except OSError as e:
+            logger.warning(f"Cannot scan {directory}: {e}")
+        stack.extend(
+            entry.path for entry in subdirectories
+            if not (module_root and entry.name in BUILD_OUTPUT_DIRECTORIES)
+        )
+
+
+def _fuse_category_patterns(rules) -> re.Pattern:
+    """
+    Compile (category, patterns) rules into one bytes regex scanned in a single pass
+    
+    Each category becomes a named group inside a zero-width lookahead, so every
+    position reports the highest-priority category matching there and no match
+    consumes text another category could start in.
+    """
+    return re.compile('|'.join(
+        f"(?=(?P<{category}>{'|'.join(patterns)}))" for category, patterns in rules
+    ).encode('ascii'))
+
 
 class RepositoryAnalyzer:
     """Analyzes GitHub repositories: cloning, file discovery, categorization"""
@@ -50,6 +228,15 @@ class RepositoryAnalyzer:
         r'class\s+\w+Config'
     ]
     
+    # Categories in order of specificity (earlier wins when several match)
+    CATEGORY_ORDER = ('repositories', 'entities', 'controllers', 'services', 'configs')
+    
+    # All categorization patterns fused into one regex
+    CATEGORY_RE = _fuse_category_patterns(zip(CATEGORY_ORDER, (
+        REPOSITORY_PATTERNS, ENTITY_PATTERNS, CONTROLLER_PATTERNS, SERVICE_PATTERNS, CONFIG_PATTERNS
+    )))
+    CATEGORY_RANK = {category: rank for rank, category in enumerate(CATEGORY_ORDER)}
+    
     def __init__(self, github_url: str):
         """
         Initialize repository analyzer
@@ -60,6 +247,7 @@ class RepositoryAnalyzer:
         self.github_url = github_url
         self.repo_path = None
         self.temp_dir = None
+        self._memo = {}  # {name: (repo_path, result)} of the analysis steps below
         
         # Extract owner and repo name
         match = re.match(r'https?://github\.com/([^/]+)/([^/]+)', github_url)
@@ -74,7 +262,7 @@ class RepositoryAnalyzer:
         Clone GitHub repository to temporary directory
         
         Args:
-            branch: Optional branch name (default: main/master)
+            branch: Optional branch name (default: the remote's default branch)
             
         Returns:
             Path to cloned repository
@@ -83,47 +271,37 @@ class RepositoryAnalyzer:
         self.temp_dir = tempfile.mkdtemp(prefix=f"conversion-{self.repo_name}-")
         
         try:
-            # Determine branch
-            if not branch:
-                # Try to detect default branch
-                try:
-                    result = subprocess.run(
-                        ['git', 'ls-remote', '--heads', self.github_url],
-                        capture_output=True,
-                        text=True,
-                        timeout=10
-                    )
-                    if result.returncode == 0 and result.stdout:
-                        # Check for main or master
-                        if 'refs/heads/main' in result.stdout:
-                            branch = 'main'
-                        elif 'refs/heads/master' in result.stdout:
-                            branch = 'master'
-                        else:
-                            # Use first branch found
-                            first_branch = result.stdout.split('\n')[0].split('/')[-1]
-                            branch = first_branch
-                except Exception as e:
-                    logger.warning(f"Could not detect branch: {e}, using 'main'")
-                    branch = 'main'
+            cache_entry = self._clone_cache_entry(branch)
+            if cache_entry and os.path.isdir(cache_entry):
+                repo_dir = os.path.join(self.temp_dir, self.repo_name)
+                if _link_tree(cache_entry, repo_dir):
+                    self.repo_path = repo_dir
+                    logger.info(f"Using cached clone of {self.github_url} at {self.repo_path}")
+                    return self.repo_path
+                remove_directory(repo_dir)
             
             # Clone repository
-            logger.info(f"Cloning {self.github_url} (branch: {branch}) to {self.temp_dir}")
-            
-            clone_cmd = ['git', 'clone', '--depth', '1']
-            if branch:
-                clone_cmd.extend(['--branch', branch])
-            clone_cmd.extend([self.github_url, self.temp_dir])
+            # Without --branch, git checks out the remote HEAD (its default branch), so no
+            # separate ls-remote round-trip is needed to find it
+            logger.info(f"Cloning {self.github_url} (branch: {branch or 'default'}) to {self.temp_dir}")
             
-            result = subprocess.run(
-                clone_cmd,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
+            branch_args = ['--branch', branch] if branch else []
+            try:
+                # Partial clone + sparse checkout: only the files the analysis reads are fetched
+                self._run_git(['clone', '--depth', '1', '--filter=blob:none', '--no-checkout',
+                               *branch_args, self.github_url, self.temp_dir])
+                self._run_git(['-C', self.temp_dir, 'sparse-checkout', 'set', '--no-cone',
+                               *SPARSE_CHECKOUT_PATTERNS])
+                self._run_git(['-C', self.temp_dir, 'checkout'])
+            except RuntimeError as e:
+                # Older git or a server without partial clone support: full shallow clone
+                logger.warning(f"Sparse clone failed ({e}), falling back to a full clone")
+                remove_directory(self.temp_dir)
+                os.makedirs(self.temp_dir, exist_ok=True)
+                self._run_git(['clone', '--depth', '1', *branch_args, self.github_url, self.temp_dir])
             
-            if result.returncode != 0:
-                raise RuntimeError(f"Git clone failed: {result.stderr}")
+            if cache_entry:
+                self._store_in_clone_cache(cache_entry)
             
             # Find the actual repo directory (might have subdirectory)
             repo_dir = os.path.join(self.temp_dir, self.repo_name)
@@ -140,6 +318,80 @@ class RepositoryAnalyzer:
             self.cleanup()
             raise RuntimeError(f"Failed to clone repository: {e}")
     
+    def _clone_cache_entry(self, branch: Optional[str]) -> Optional[str]:
+        """
+        Locate the clone cache entry for the commit the remote currently points at
+        
+        Args:
+            branch: Branch name, or None for the remote's default branch
+            
+        Returns:
+            Cache entry path (which may not exist yet), or None if caching is disabled
+            or the commit could not be resolved
+        """
+        if not CLONE_CACHE_DIR or fcntl is None:
+            return None
+        ref = f"refs/heads/{branch}" if branch else "HEAD"
+        try:
+            result = subprocess.run(
+                ['git', 'ls-remote', self.github_url, ref],
+                capture_output=True,
+                text=True,
+                timeout=GIT_CLONE_TIMEOUT
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"git ls-remote failed: {e}")
+            return None
+        if result.returncode != 0 or not result.stdout.strip():
+            return None
+        
+        sha = result.stdout.split()[0]
+        url_key = hashlib.sha256(self.github_url.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(CLONE_CACHE_DIR, f"{url_key}-{sha}")
+    
+    def _store_in_clone_cache(self, cache_entry: str):
+        """
+        Add the fresh clone in temp_dir to the clone cache
+        
+        Writers serialize on a per-entry lock file and publish the entry with an atomic
+        rename, so readers never see a partial entry and need no lock.
+        
+        Args:
+            cache_entry: Cache entry path from _clone_cache_entry()
+        """
+        try:
+            os.makedirs(CLONE_CACHE_DIR, exist_ok=True)
+            with open(f"{cache_entry}.lock", 'w') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                if os.path.isdir(cache_entry):
+                    return
+                tmp_entry = f"{cache_entry}.tmp-{os.getpid()}"
+                if _link_tree(self.temp_dir, tmp_entry):
+                    os.rename(tmp_entry, cache_entry)
+                else:
+                    remove_directory(tmp_entry)
+        except OSError as e:
+            logger.warning(f"Failed to cache clone of {self.github_url}: {e}")
+    
+    def _run_git(self, args: List[str]):
+        """
+        Run a git command
+        
+        Args:
+            args: Arguments after "git"
+            
+        Raises:
+            RuntimeError: If the command fails
+        """
+        result = subprocess.run(
+            ['git', *args],
+            capture_output=True,
+            text=True,
+            timeout=GIT_CLONE_TIMEOUT
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Git {args[0] if args[0] != '-C' else args[2]} failed: {result.stderr}")
+    
     def discover_files(self) -> Dict[str, List[Dict]]:
         """
         Recursively discover and categorize Java files
@@ -158,6 +410,10 @@ class RepositoryAnalyzer:
         if not self.repo_path:
             raise ValueError("Repository not cloned. Call clone_repository() first.")
         
+        return self._memoized('file_map', self._discover_files)
+    
+    def _discover_files(self) -> Dict[str, List[Dict]]:
+        """Walk the repository and categorize its Java files"""
         file_map = {
             'controllers': [],
             'services': [],
@@ -167,44 +423,149 @@ class RepositoryAnalyzer:
             'other': []
         }
         
-        # Find all Java files
-        java_files = list(Path(self.repo_path).rglob('*.java'))
-        
-        logger.info(f"Found {len(java_files)} Java files")
-        
-        for java_file in java_files:
-            # Skip test files for now (can add option later)
-            if 'test' in str(java_file).lower():
-                continue
-            
-            try:
-                with open(java_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    # Read only first 10KB for categorization and metadata extraction
-                    # Full content is now in consolidated codebase file
-                    content_sample = f.read(10000)
-                
-                # Categorize file and extract metadata
-                file_info = {
-                    'path': str(java_file),
-                    'relative_path': str(java_file.relative_to(self.repo_path)),
-                    'package': self._extract_package(content_sample),
-                    'class_name': self._extract_class_name(content_sample)
-                    # Note: 'content' field removed - use consolidated codebase file instead
-                }
-                
-                category = self._categorize_file(content_sample)
+        def collect(future):
+            result = future.result()
+            if result:
+                category, file_info = result
                 file_map[category].append(file_info)
-                
-            except Exception as e:
-                logger.warning(f"Error reading {java_file}: {e}")
-                continue
         
+        # Stream files from the walker (skipping test files for now, can add option later)
+        # into the pool while it is still walking; at most DISCOVERY_WINDOW scans are
+        # pending at once and results are collected here in file order
+        blob_ids = self._git_blob_ids()
+        java_file_count = 0
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=DISCOVERY_WORKERS) as executor:
+            for java_file in _walk_java_files(self.repo_path):
+                java_file_count += 1
+                pending.append(executor.submit(self._scan_java_file, java_file, blob_ids))
+                if len(pending) >= DISCOVERY_WINDOW:
+                    collect(pending.popleft())
+            while pending:
+                collect(pending.popleft())
+        
+        logger.info(f"Found {java_file_count} Java files")
         logger.info(f"Categorized files: {sum(len(v) for v in file_map.values())} total")
         for category, files in file_map.items():
             logger.info(f"  {category}: {len(files)}")
         
         return file_map
     
+    def _git_blob_ids(self) -> Dict[str, str]:
+        """
+        Git blob ids of the checked-out files, from a single git ls-files call
+        
+        Files modified in the working tree are left out, since their blob id no
+        longer describes their content.
+        
+        Returns:
+            Dictionary of repository-relative path (with / separators) to blob id;
+            empty if repo_path is not a git checkout
+        """
+        try:
+            staged = subprocess.run(
+                ['git', '-C', self.repo_path, 'ls-files', '-s', '-z'],
+                capture_output=True,
+                timeout=GIT_CLONE_TIMEOUT
+            )
+            # Clones linked from the clone cache have new ctimes, which must not make
+            # git re-hash every file to decide whether it was modified
+            modified = subprocess.run(
+                ['git', '-c', 'core.trustctime=false', '-C', self.repo_path, 'ls-files', '-m', '-z'],
+                capture_output=True,
+                timeout=GIT_CLONE_TIMEOUT
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"git ls-files failed: {e}")
+            return {}
+        if staged.returncode != 0 or modified.returncode != 0:
+            return {}
+        
+        modified_paths = set(modified.stdout.split(b'\0'))
+        blob_ids = {}
+        # Entries are "<mode> <blob id> <stage>\t<path>"
+        for entry in staged.stdout.split(b'\0'):
+            info, _, path = entry.partition(b'\t')
+            if path and path not in modified_paths:
+                blob_ids[os.fsdecode(path)] = info.split(b' ')[1].decode('ascii')
+        return blob_ids
+    
+    def _scan_java_file(self, java_file: str, blob_ids: Optional[Dict[str, str]] = None) -> Optional[tuple]:
+        """
+        Read the start of a Java file and categorize it
+        
+        Args:
+            java_file: Path of the Java file
+            blob_ids: Git blob ids from _git_blob_ids(); files with a known blob id
+                are looked up in (and added to) the scan cache
+            
+        Returns:
+            (category, file_info) tuple, or None if the file could not be read
+        """
+        try:
+            relative_path = os.path.relpath(java_file, self.repo_path)
+            blob_id = blob_ids.get(relative_path.replace(os.sep, '/')) if blob_ids else None
+            cache_key = (relative_path, blob_id)
+            if blob_id:
+                with _scan_cache_lock:
+                    scanned = _scan_cache.get(cache_key)
+                    if scanned is not None:
+                        _scan_cache.move_to_end(cache_key)
+                if scanned is not None:
+                    return scanned[0], self._file_info(java_file, relative_path, scanned)
+            
+            scanned = None
+            path_category = self._categorize_by_path(relative_path)
+            # Unbuffered binary reads: one read() syscall per sample, no decoding
+            with open(java_file, 'rb', buffering=0) as f:
+                # Read only the start for categorization and metadata extraction
+                # Full content is now in consolidated codebase file
+                if path_category:
+                    content_sample = f.read(PATH_CATEGORIZED_SAMPLE_SIZE)
+                    # Only complete lines, so a declaration cut by the read is not half-matched
+                    head = content_sample
+                    if len(content_sample) == PATH_CATEGORIZED_SAMPLE_SIZE:
+                        head = content_sample[:content_sample.rfind(b'\n') + 1]
+                    package = self._extract_package(head)
+                    class_name = self._extract_class_name(head)
+                    if package != 'unknown' and class_name != 'unknown':
+                        scanned = (path_category, package, class_name)
+                    else:
+                        content_sample += f.read(CATEGORIZATION_SAMPLE_SIZE - len(content_sample))
+                else:
+                    content_sample = f.read(CATEGORIZATION_SAMPLE_SIZE)
+            
+            if scanned is None:
+                scanned = (
+                    path_category or self._categorize_file(content_sample),
+                    self._extract_package(content_sample),
+                    self._extract_class_name(content_sample)
+                )
+            
+            if blob_id:
+                with _scan_cache_lock:
+                    _scan_cache[cache_key] = scanned
+                    if len(_scan_cache) > SCAN_CACHE_MAX_ENTRIES:
+                        _scan_cache.popitem(last=False)
+            
+            return scanned[0], self._file_info(java_file, relative_path, scanned)
+            
+        except Exception as e:
+            logger.warning(f"Error reading {java_file}: {e}")
+            return None
+    
+    @staticmethod
+    def _file_info(java_file: str, relative_path: str, scanned: tuple) -> Dict:
+        """File entry of the file map from a (category, package, class name) scan result"""
+        _, package, class_name = scanned
+        return {
+            'path': java_file,
+            'relative_path': relative_path,
+            'package': package,
+            'class_name': class_name
+            # Note: 'content' field removed - use consolidated codebase file instead
+        }
+    
     def detect_build_system(self) -> str:
         """
         Detect build system (Maven, Gradle, or Ant)
@@ -215,26 +576,24 @@ class RepositoryAnalyzer:
         if not self.repo_path:
             raise ValueError("Repository not cloned. Call clone_repository() first.")
         
-        # Check for Maven
-        pom_path = os.path.join(self.repo_path, 'pom.xml')
-        if os.path.exists(pom_path):
-            return 'maven'
-        
-        # Check for Gradle
-        gradle_paths = [
-            os.path.join(self.repo_path, 'build.gradle'),
-            os.path.join(self.repo_path, 'build.gradle.kts'),
-            os.path.join(self.repo_path, 'settings.gradle')
-        ]
-        if any(os.path.exists(p) for p in gradle_paths):
-            return 'gradle'
+        return self._memoized('build_system', self._detect_build_system)
+    
+    def _detect_build_system(self) -> str:
+        """Detect the build system from the repository root's file names"""
+        # One directory read instead of a stat() per candidate build file
+        with os.scandir(self.repo_path) as entries:
+            names = {entry.name for entry in entries if entry.is_file()}
         
-        # Check for Ant
-        build_xml = os.path.join(self.repo_path, 'build.xml')
-        if os.path.exists(build_xml):
-            return 'ant'
+        if 'pom.xml' in names:
+            build_system = 'maven'
+        elif names & {'build.gradle', 'build.gradle.kts', 'settings.gradle'}:
+            build_system = 'gradle'
+        elif 'build.xml' in names:
+            build_system = 'ant'
+        else:
+            build_system = 'unknown'
         
-        return 'unknown'
+        return build_system
     
     def parse_dependencies(self) -> List[Dict[str, str]]:
         """
@@ -246,6 +605,10 @@ class RepositoryAnalyzer:
         if not self.repo_path:
             raise ValueError("Repository not cloned. Call clone_repository() first.")
         
+        return self._memoized('dependencies', self._parse_dependencies)
+    
+    def _parse_dependencies(self) -> List[Dict[str, str]]:
+        """Parse dependencies with the parser for the detected build system"""
         build_system = self.detect_build_system()
         
         if build_system == 'maven':
@@ -264,17 +627,19 @@ class RepositoryAnalyzer:
             return []
         
         try:
-            tree = ET.parse(pom_path)
-            root = tree.getroot()
-            
             # Handle namespace
-            ns = {'maven': 'http://maven.apache.org/POM/4.0.0'}
+            ns = '{http://maven.apache.org/POM/4.0.0}'
             
+            # Stream the pom: each dependency is read when its element closes and then
+            # cleared, instead of building the whole tree and searching it afterwards
             dependencies = []
-            for dep in root.findall('.//maven:dependency', ns):
-                group = dep.find('maven:groupId', ns)
-                artifact = dep.find('maven:artifactId', ns)
-                version = dep.find('maven:version', ns)
+            for _, dep in ET.iterparse(pom_path, events=('end',)):
+                if dep.tag != f'{ns}dependency':
+                    continue
+                
+                group = dep.find(f'{ns}groupId')
+                artifact = dep.find(f'{ns}artifactId')
+                version = dep.find(f'{ns}version')
                 
                 if group is not None and artifact is not None:
                     dependencies.append({
@@ -282,6 +647,7 @@ class RepositoryAnalyzer:
                         'artifact': artifact.text,
                         'version': version.text if version is not None else 'unknown'
                     })
+                dep.clear()
             
             logger.info(f"Parsed {len(dependencies)} Maven dependencies")
             return dependencies
@@ -291,76 +657,86 @@ class RepositoryAnalyzer:
             return []
     
     def _parse_gradle_dependencies(self) -> List[Dict[str, str]]:
-        """Parse Gradle build.gradle dependencies (basic regex-based)"""
-        gradle_path = os.path.join(self.repo_path, 'build.gradle')
+        """Parse Gradle build.gradle / build.gradle.kts dependencies (basic regex-based)"""
+        dependencies = []
+        for build_file in ('build.gradle', 'build.gradle.kts'):
+            gradle_path = os.path.join(self.repo_path, build_file)
+            try:
+                with open(gradle_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    content = f.read()
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logger.error(f"Error parsing {build_file}: {e}")
+                continue
+            
+            dependencies.extend(
+                {'group': group, 'artifact': artifact, 'version': version}
+                for group, artifact, version in _GRADLE_DEPENDENCY_RE.findall(content)
+            )
         
-        if not os.path.exists(gradle_path):
-            return []
+        logger.info(f"Parsed {len(dependencies)} Gradle dependencies")
+        return dependencies
+    
+    def _categorize_by_path(self, relative_path: str) -> Optional[str]:
+        """
+        Categorize a Java file by its directory, without reading it
         
-        try:
-            with open(gradle_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            dependencies = []
-            # Pattern: implementation 'group:artifact:version'
-            pattern = r"(?:implementation|compile|api)\s+['\"]([^:]+):([^:]+):([^'\"]+)['\"]"
-            
-            for match in re.finditer(pattern, content):
-                dependencies.append({
-                    'group': match.group(1),
-                    'artifact': match.group(2),
-                    'version': match.group(3)
-                })
-            
-            logger.info(f"Parsed {len(dependencies)} Gradle dependencies")
-            return dependencies
+        Args:
+            relative_path: Path relative to the repository root
             
-        except Exception as e:
-            logger.error(f"Error parsing build.gradle: {e}")
-            return []
+        Returns:
+            Category of the innermost conventionally named directory, or None
+        """
+        for directory in reversed(os.path.dirname(relative_path).lower().split(os.sep)):
+            category = PATH_CATEGORIES.get(directory)
+            if category:
+                return category
+        return None
     
-    def _categorize_file(self, content: str) -> str:
+    def _categorize_file(self, content: bytes) -> str:
         """Categorize Java file based on patterns"""
-        # Check in order of specificity
-        for pattern in self.REPOSITORY_PATTERNS:
-            if re.search(pattern, content):
-                return 'repositories'
-        
-        for pattern in self.ENTITY_PATTERNS:
-            if re.search(pattern, content):
-                return 'entities'
-        
-        for pattern in self.CONTROLLER_PATTERNS:
-            if re.search(pattern, content):
-                return 'controllers'
+        # One pass over the content, keeping the most specific category seen
+        best_rank = None
+        for match in self.CATEGORY_RE.finditer(content):
+            rank = self.CATEGORY_RANK[match.lastgroup]
+            if best_rank is None or rank < best_rank:
+                best_rank = rank
+                if rank == 0:
+                    break
         
-        for pattern in self.SERVICE_PATTERNS:
-            if re.search(pattern, content):
-                return 'services'
-        
-        for pattern in self.CONFIG_PATTERNS:
-            if re.search(pattern, content):
-                return 'configs'
-        
-        return 'other'
+        return self.CATEGORY_ORDER[best_rank] if best_rank is not None else 'other'
     
-    def _extract_package(self, content: str) -> str:
+    def _extract_package(self, content: bytes) -> str:
         """Extract package declaration"""
-        match = re.search(r'^package\s+([\w.]+);', content, re.MULTILINE)
-        return match.group(1) if match else 'unknown'
+        # Equivalent to searching ^package\s+([\w.]+); in MULTILINE mode, but only
+        # lines starting with "package" are handed to the regex
+        index = 0
+        while True:
+            match = _PACKAGE_RE.match(content, index)
+            if match:
+                return match.group(1).decode('ascii')
+            newline = content.find(b'\npackage', index)
+            if newline < 0:
+                return 'unknown'
+            index = newline + 1
     
-    def _extract_class_name(self, content: str) -> str:
+    def _extract_class_name(self, content: bytes) -> str:
         """Extract class name"""
-        match = re.search(r'(?:public\s+)?(?:final\s+)?(?:abstract\s+)?class\s+(\w+)', content)
+        match = _CLASS_RE.search(content)
         if not match:
-            match = re.search(r'(?:public\s+)?interface\s+(\w+)', content)
-        return match.group(1) if match else 'unknown'
+            match = _INTERFACE_RE.search(content)
+        return match.group(1).decode('ascii') if match else 'unknown'
     
     def analyze_project_structure(self) -> Dict:
         """Analyze overall project structure"""
         if not self.repo_path:
             raise ValueError("Repository not cloned. Call clone_repository() first.")
         
+        return self._memoized('structure', self._analyze_project_structure)
+    
+    def _analyze_project_structure(self) -> Dict:
+        """Summarize files, build system and dependencies"""
         file_map = self.discover_files()
         build_system = self.detect_build_system()
         dependencies = self.parse_dependencies()
@@ -379,15 +755,36 @@ class RepositoryAnalyzer:
             'total_java_files': sum(len(v) for v in file_map.values())
         }
     
+    def _memoized(self, name: str, compute):
+        """
+        Return a cached analysis result, computing it once per repo_path
+        
+        Args:
+            name: Result name
+            compute: Callable producing the result
+        """
+        cached = self._memo.get(name)
+        if cached and cached[0] == self.repo_path:
+            return cached[1]
+        result = compute()
+        self._memo[name] = (self.repo_path, result)
+        return result
+    
+    def __getstate__(self):
+        """Pickle support: copies never own (and so never delete) the temporary clone"""
+        state = self.__dict__.copy()
+        state['temp_dir'] = None
+        return state
+    
     def cleanup(self):
         """Clean up temporary directory"""
         if self.temp_dir and os.path.exists(self.temp_dir):
-            import shutil
             try:
-                shutil.rmtree(self.temp_dir)
+                remove_directory(self.temp_dir)
                 logger.info(f"Cleaned up temporary directory: {self.temp_dir}")
             except Exception as e:
                 logger.warning(f"Failed to cleanup temp directory: {e}")
             self.temp_dir = None
             self.repo_path = None
+            self._memo.clear()
 
@@ -0,0 +1,260 @@
+# src/api/job_store.py
+
+"""Conversion job state and queue, in memory or shared through Redis"""
+
+import os
+import json
+import asyncio
+import logging
+from dataclasses import dataclass, fields as dataclass_fields, replace
+from typing import Optional, Dict, Any, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Redis key layout
+JOB_KEY_PREFIX = "job:"
+QUEUE_KEY = "conversions"
+JOB_TTL_SECONDS = 7 * 24 * 3600
+
+# Most recent errors kept per job; older ones are dropped so a failure loop cannot
+# grow job state (and every status response) without bound
+MAX_JOB_ERRORS = 100
+
+# Seconds a worker blocks waiting for the next queued job before re-checking for shutdown
+DEQUEUE_TIMEOUT = 5
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize a value to JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(value).encode('utf-8')
+
+
+def new_job(**fields) -> Dict[str, Any]:
+    """Initial state of a freshly queued job"""
+    job = {
+        "status": "queued",
+        "progress": 0,
+        "current_phase": None,
+        "metadata": None,
+        "output_path": None,
+        "validation_result": None,
+        "errors": []
+    }
+    job.update(fields)
+    return job
+
+
+@dataclass(frozen=True)
+class JobState:
+    """Immutable snapshot of a job's state"""
+    status: str
+    progress: int
+    current_phase: Optional[str]
+    metadata: Optional[Dict[str, Any]]
+    output_path: Optional[str]
+    validation_result: Optional[Dict[str, Any]]
+    errors: Tuple[str, ...]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        job = {f.name: getattr(self, f.name) for f in dataclass_fields(self)}
+        job["errors"] = list(self.errors)
+        return job
+
+
+class InMemoryJobStore:
+    """
+    Job state and queue local to one server process
+    
+    Used when no Redis is configured; jobs are lost on restart and are not
+    visible to other uvicorn workers. Each job is an immutable JobState that
+    writers replace as a whole, so readers always see a consistent snapshot
+    without locking.
+    """
+    
+    def __init__(self):
+        self._jobs: Dict[str, JobState] = {}
+        self._metadata_json: Dict[str, bytes] = {}
+        self._queue = asyncio.Queue()
+    
+    async def create(self, job_id: str, job: Dict[str, Any]):
+        """Store the initial state of a job"""
+        self._jobs[job_id] = JobState(**{**job, "errors": tuple(job["errors"])})
+    
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job state, or None if the job is unknown"""
+        job = self._jobs.get(job_id)
+        return job.to_dict() if job is not None else None
+    
+    async def update(self, job_id: str, fields: Dict[str, Any]):
+        """Set top-level fields of a job"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            self._jobs[job_id] = replace(job, **fields)
+            if "metadata" in fields:
+                # Serialized once here, so metadata polls return stored bytes
+                if fields["metadata"]:
+                    self._metadata_json[job_id] = dumps(fields["metadata"])
+                else:
+                    self._metadata_json.pop(job_id, None)
+    
+    async def get_metadata_json(self, job_id: str) -> Optional[bytes]:
+        """Return the job's metadata as JSON bytes, or None if unknown or not yet extracted"""
+        return self._metadata_json.get(job_id)
+    
+    async def append_error(self, job_id: str, error: str):
+        """Record an error for a job"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            self._jobs[job_id] = replace(job, errors=(job.errors + (error,))[-MAX_JOB_ERRORS:])
+    
+    async def enqueue(self, job_id: str, params: Dict[str, Any]):
+        """Queue a job for the conversion workers"""
+        await self._queue.put((job_id, params))
+    
+    async def dequeue(self):
+        """
+        Wait for the next queued job
+        
+        Returns:
+            (job_id, params) tuple, or None if nothing arrived within DEQUEUE_TIMEOUT
+        """
+        try:
+            return await asyncio.wait_for(self._queue.get(), DEQUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            return None
+    
+    async def queue_length(self) -> int:
+        """Number of jobs waiting for a worker"""
+        return self._queue.qsize()
+    
+    async def close(self):
+        pass
+
+
+class RedisJobStore:
+    """
+    Job state and queue shared through Redis
+    
+    Each job is a hash ``job:<id>`` holding JSON-encoded fields, with its errors
+    in the list ``job:<id>:errors``; queued jobs are pushed onto the list
+    ``conversions``, so every server process sees the same jobs and its length
+    can drive scaling.
+    """
+    
+    def __init__(self, url: str):
+        """
+        Initialize Redis store
+        
+        Args:
+            url: Redis connection URL (e.g. redis://localhost:6379/0)
+        """
+        import redis.asyncio as redis
+        self.redis = redis.Redis.from_url(url, decode_responses=True)
+        # Sets fields only on an existing job hash, so updates for unknown or expired
+        # jobs don't leave partial hashes without a TTL
+        self._update_existing = self.redis.register_script(
+            "if redis.call('EXISTS', KEYS[1]) == 1 then "
+            "return redis.call('HSET', KEYS[1], unpack(ARGV)) end "
+            "return 0"
+        )
+    
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"{JOB_KEY_PREFIX}{job_id}"
+    
+    async def create(self, job_id: str, job: Dict[str, Any]):
+        """Store the initial state of a job"""
+        fields = {k: v for k, v in job.items() if k != "errors"}
+        key = self._key(job_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={k: dumps(v) for k, v in fields.items()})
+            pipe.expire(key, JOB_TTL_SECONDS)
+            for error in job.get("errors", []):
+                pipe.rpush(f"{key}:errors", error)
+            await pipe.execute()
+    
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job state, or None if the job is unknown"""
+        key = self._key(job_id)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(key)
+            pipe.lrange(f"{key}:errors", 0, -1)
+            fields, errors = await pipe.execute()
+        if not fields:
+            return None
+        job = {k: json.loads(v) for k, v in fields.items()}
+        job["errors"] = errors
+        return job
+    
+    async def update(self, job_id: str, fields: Dict[str, Any]):
+        """Set top-level fields of a job; updates for unknown jobs are ignored"""
+        args = []
+        for k, v in fields.items():
+            args.extend((k, dumps(v)))
+        if args:
+            await self._update_existing(keys=[self._key(job_id)], args=args)
+    
+    async def get_metadata_json(self, job_id: str) -> Optional[bytes]:
+        """Return the job's metadata as JSON bytes, or None if unknown or not yet extracted"""
+        # Stored already serialized, so it is returned without a decode/encode round-trip
+        value = await self.redis.hget(self._key(job_id), "metadata")
+        if not value or value in ("null", "{}"):
+            return None
+        return value.encode('utf-8')
+    
+    async def append_error(self, job_id: str, error: str):
+        """Record an error for a job"""
+        key = f"{self._key(job_id)}:errors"
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.rpush(key, error)
+            pipe.ltrim(key, -MAX_JOB_ERRORS, -1)
+            pipe.expire(key, JOB_TTL_SECONDS)
+            await pipe.execute()
+    
+    async def enqueue(self, job_id: str, params: Dict[str, Any]):
+        """Queue a job for the conversion workers"""
+        await self.redis.rpush(QUEUE_KEY, json.dumps({"job_id": job_id, "params": params}))
+    
+    async def dequeue(self):
+        """
+        Wait for the next queued job
+        
+        Returns:
+            (job_id, params) tuple, or None if nothing arrived within DEQUEUE_TIMEOUT
+        """
+        item = await self.redis.blpop(QUEUE_KEY, timeout=DEQUEUE_TIMEOUT)
+        if item is None:
+            return None
+        payload = json.loads(item[1])
+        return payload["job_id"], payload["params"]
+    
+    async def queue_length(self) -> int:
+        """Number of jobs waiting for a worker"""
+        return await self.redis.llen(QUEUE_KEY)
+    
+    async def close(self):
+        await self.redis.aclose()
+
+
+def create_job_store():
+    """
+    Create the job store for this process
+    
+    Uses Redis when REDIS_URL is set (requires the ``redis`` package),
+    otherwise keeps jobs in memory.
+    """
+    url = os.getenv("REDIS_URL")
+    if url:
+        logger.info("Using Redis job store")
+        return RedisJobStore(url)
+    return InMemoryJobStore()
@@ -1,32 +1,149 @@
 # src/api/server.py
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
-from pydantic import BaseModel, HttpUrl
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse, Response, JSONResponse, ORJSONResponse
+from pydantic import BaseModel, HttpUrl, model_validator
 from typing import Optional
+from contextlib import asynccontextmanager
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import re
 import uuid
+import time
+import asyncio
+import functools
+import threading
+import contextvars
+import hashlib
 import logging
 import os
-import shutil
+import zipfile
 from pathlib import Path
-from ..agents.orchestrator import create_conversion_workflow, ConversionState
+import requests
+from ..agents.orchestrator import (
+    create_conversion_workflow, ConversionState, register_cancel_event, release_run_resources
+)
+from .job_store import create_job_store, new_job, orjson
 
-app = FastAPI(title="Java to Node.js Conversion Agent")
+logger = logging.getLogger(__name__)
 
-# Serve static HTML file
+# Job being converted by the current worker task; every log record gets it as
+# record.job_id (None outside conversions), including records emitted by the
+# pipeline on the conversion pool, for structured handlers and "%(job_id)s" formats
+_job_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("job_id", default=None)
+_default_record_factory = logging.getLogRecordFactory()
+
+def _record_factory(*args, **kwargs):
+    record = _default_record_factory(*args, **kwargs)
+    record.job_id = _job_id_var.get()
+    return record
+
+logging.setLogRecordFactory(_record_factory)
+
+# Conversion jobs run by queue workers inside each server process; with REDIS_URL
+# set the queue and job state are shared by all processes
+CONVERSION_WORKERS = max(1, int(os.getenv("CONVERSION_WORKERS", os.cpu_count() or 1)))
+
+# Conversions waiting beyond this are rejected with 503 instead of queueing indefinitely
+MAX_PENDING_JOBS = int(os.getenv("MAX_PENDING_JOBS", "100"))
+
+# Seconds running conversions may take to finish when the server shuts down
+SHUTDOWN_GRACE_SECONDS = float(os.getenv("SHUTDOWN_GRACE_SECONDS", "30"))
+
+# Seconds between checks of the job status for a cancellation while a node runs
+CANCEL_POLL_INTERVAL = float(os.getenv("CANCEL_POLL_INTERVAL", "2"))
+
+# Blocking workflow steps (LLM calls, git, disk) run on this pool, never on the event loop
+_conversion_executor = ThreadPoolExecutor(CONVERSION_WORKERS, thread_name_prefix="conversion")
+
+job_store = create_job_store()
+
+# Cancellation events of the conversions running in this process, by job id
+_cancel_events = {}
+
+# When served behind nginx, finished projects are zipped once by the worker and
+# downloads are handed to nginx with X-Accel-Redirect, e.g.
+#   location /_protected/ { internal; alias /var/converted/; }
+USE_X_ACCEL = os.getenv("USE_X_ACCEL", "0") == "1"
+X_ACCEL_PREFIX = os.getenv("X_ACCEL_PREFIX", "/_protected/")
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "/var/converted")
+
+async def _conversion_worker(worker_id: int, stop: asyncio.Event):
+    """Run queued conversion jobs one at a time until the server shuts down"""
+    while not stop.is_set():
+        job_id = None
+        try:
+            item = await job_store.dequeue()
+            if item is None:
+                continue
+            job_id, params = item
+            job = await job_store.get(job_id)
+            if job is None or job["status"] == "cancelled":
+                continue
+            token = _job_id_var.set(job_id)
+            try:
+                logger.info("Worker %d starting conversion %s", worker_id, job_id)
+                await run_conversion(job_id=job_id, **params)
+            finally:
+                _job_id_var.reset(token)
+        except asyncio.CancelledError:
+            # Shutdown grace period ran out with this job still running
+            if job_id:
+                logger.warning("Conversion %s interrupted by server shutdown", job_id)
+                await job_store.update(job_id, {"status": "failed"})
+                await job_store.append_error(job_id, "Server shut down before the conversion finished")
+            raise
+        except Exception as e:
+            logger.error("Conversion worker %d error: %s", worker_id, e)
+            await asyncio.sleep(1)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    stop = asyncio.Event()
+    app.state.conversion_workers = [
+        asyncio.create_task(_conversion_worker(i, stop))
+        for i in range(CONVERSION_WORKERS)
+    ]
+    try:
+        yield
+    finally:
+        # Stop taking new jobs and give running conversions a chance to finish
+        stop.set()
+        workers = app.state.conversion_workers
+        _, pending = await asyncio.wait(workers, timeout=SHUTDOWN_GRACE_SECONDS)
+        for worker in pending:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        _conversion_executor.shutdown(wait=False, cancel_futures=True)
+        await job_store.close()
+        _http.close()
+
+# Responses (e.g. frequently polled job status) are encoded with orjson when it is installed
+app = FastAPI(
+    title="Java to Node.js Conversion Agent",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse
+)
+
+# Serve static HTML file, read once at import (restart to pick up changes)
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
+try:
+    _INDEX_HTML = (BASE_DIR / "index.html").read_bytes()
+    _INDEX_ETAG = f'"{hashlib.sha256(_INDEX_HTML).hexdigest()[:32]}"'
+except FileNotFoundError:
+    _INDEX_HTML = None
+    _INDEX_ETAG = None
 
 @app.get("/")
-async def root():
+async def root(request: Request):
     """Serve the HTML interface"""
-    html_path = BASE_DIR / "index.html"
-    if html_path.exists():
-        return FileResponse(html_path)
+    if _INDEX_HTML is not None:
+        headers = {"ETag": _INDEX_ETAG, "Cache-Control": "public, max-age=300"}
+        if request.headers.get("if-none-match") == _INDEX_ETAG:
+            return Response(status_code=304, headers=headers)
+        return Response(content=_INDEX_HTML, media_type="text/html", headers=headers)
     return {"message": "Java to Node.js Conversion Agent API", "docs": "/docs"}
 
-# Store conversion jobs (in-memory for Phase 1, DB in Phase 2)
-conversion_jobs = {}
-
 class ConversionRequest(BaseModel):
     # LLM Provider Configuration (new multi-provider support)
     llm_provider: Optional[str] = "gemini"  # "gemini", "glm", "openrouter", "openai"
@@ -41,6 +158,16 @@ class ConversionRequest(BaseModel):
     target_framework: str = "express"  # or "nestjs"
     orm_choice: str = "sequelize"  # or "typeorm"
     model: str  # Model name (required, format depends on provider)
+    
+    @model_validator(mode="after")
+    def _normalize_llm_config(self):
+        """Fold the legacy gemini_api_token into llm_api_token and default the provider"""
+        if not self.llm_profile_name and self.gemini_api_token and not self.llm_api_token:
+            self.llm_provider = self.llm_provider or "gemini"
+            self.llm_api_token = self.gemini_api_token
+        if not self.llm_provider:
+            self.llm_provider = "gemini"
+        return self
 
 class ConversionResponse(BaseModel):
     job_id: str
@@ -48,10 +175,7 @@ class ConversionResponse(BaseModel):
     message: str
 
 @app.post("/api/convert", response_model=ConversionResponse)
-async def start_conversion(
-    request: ConversionRequest,
-    background_tasks: BackgroundTasks
-):
+async def start_conversion(request: ConversionRequest):
     """Start a new conversion job"""
     
     # Validate inputs
@@ -64,50 +188,35 @@ async def start_conversion(
     # Create job
     job_id = str(uuid.uuid4())
     
-    conversion_jobs[job_id] = {
-        "status": "queued",
-        "progress": 0,
-        "current_phase": None,
-        "metadata": None,
-        "output_path": None,
-        "errors": []
-    }
-    
     # Validate LLM configuration
     if request.llm_profile_name:
         # Using profile - API token not required
         if request.llm_api_token:
-            logger.warning(f"Job {job_id}: llm_api_token ignored when using profile")
+            logger.warning("Job %s: llm_api_token ignored when using profile", job_id)
     else:
-        # Using direct provider - need API token
-        if not request.llm_api_token and not request.gemini_api_token:
+        # Using direct provider - need API token (legacy gemini_api_token is already
+        # folded into llm_api_token by ConversionRequest)
+        if not request.llm_api_token:
             raise HTTPException(400, "llm_api_token is required when not using llm_profile_name")
-        
-        # Legacy support: convert gemini_api_token
-        if request.gemini_api_token and not request.llm_api_token:
-            request.llm_provider = request.llm_provider or "gemini"
-            request.llm_api_token = request.gemini_api_token
-    
-    # Default provider if not specified
-    if not request.llm_provider:
-        request.llm_provider = "gemini"
-    
-    # Start conversion in background
-    background_tasks.add_task(
-        run_conversion,
-        job_id=job_id,
-        github_url=str(request.github_url),
-        target_framework=request.target_framework,
-        orm_choice=request.orm_choice,
-        model=request.model,
-        llm_provider=request.llm_provider,
-        llm_api_token=request.llm_api_token,
-        llm_base_url=request.llm_base_url,
-        llm_profile_name=request.llm_profile_name,
-        llm_config_path=request.llm_config_path,
+    
+    # Queue conversion for the workers, pushing back when they are saturated
+    if await job_store.queue_length() >= MAX_PENDING_JOBS:
+        raise HTTPException(503, "Too many conversions queued, try again later")
+    
+    await job_store.create(job_id, new_job())
+    await job_store.enqueue(job_id, {
+        "github_url": str(request.github_url),
+        "target_framework": request.target_framework,
+        "orm_choice": request.orm_choice,
+        "model": request.model,
+        "llm_provider": request.llm_provider,
+        "llm_api_token": request.llm_api_token,
+        "llm_base_url": request.llm_base_url,
+        "llm_profile_name": request.llm_profile_name,
+        "llm_config_path": request.llm_config_path,
         # Legacy support
-        gemini_api_token=request.gemini_api_token if request.llm_provider == "gemini" else None
-    )
+        "gemini_api_token": request.gemini_api_token if request.llm_provider == "gemini" else None
+    })
     
     return ConversionResponse(
         job_id=job_id,
@@ -119,11 +228,10 @@ async def start_conversion(
 async def get_conversion_status(job_id: str):
     """Get status of conversion job"""
     
-    if job_id not in conversion_jobs:
+    job = await job_store.get(job_id)
+    if job is None:
         raise HTTPException(404, "Job not found")
     
-    job = conversion_jobs[job_id]
-    
     return {
         "job_id": job_id,
         "status": job["status"],
@@ -138,62 +246,197 @@ async def get_conversion_status(job_id: str):
 async def get_project_metadata(job_id: str):
     """Get extracted project metadata"""
     
-    if job_id not in conversion_jobs:
-        raise HTTPException(404, "Job not found")
-    
-    job = conversion_jobs[job_id]
-    
-    if not job["metadata"]:
-        raise HTTPException(400, "Metadata not yet extracted")
+    metadata_json = await job_store.get_metadata_json(job_id)
+    if metadata_json is not None:
+        return Response(content=metadata_json, media_type="application/json")
     
-    return job["metadata"]
+    if await job_store.get(job_id) is None:
+        raise HTTPException(404, "Job not found")
+    raise HTTPException(400, "Metadata not yet extracted")
 
 @app.get("/api/convert/{job_id}/download")
 async def download_converted_project(job_id: str):
     """Download converted project as ZIP"""
     
-    if job_id not in conversion_jobs:
+    job = await job_store.get(job_id)
+    if job is None:
         raise HTTPException(404, "Job not found")
     
-    job = conversion_jobs[job_id]
-    
     if job["status"] != "completed":
         raise HTTPException(400, "Conversion not completed")
     
-    # Create ZIP file
-    zip_path = _create_zip(job["output_path"])
+    filename = f"converted-project-{job_id}.zip"
+    
+    # Let nginx send the archive pre-built by the worker
+    if USE_X_ACCEL and os.path.isfile(_archive_path(job_id)):
+        return Response(
+            status_code=200,
+            headers={
+                "X-Accel-Redirect": f"{X_ACCEL_PREFIX}{job_id}.zip",
+                "Content-Type": "application/zip",
+                "Content-Disposition": f'attachment; filename="{filename}"'
+            }
+        )
+    
+    # Checked up front, since errors raised while streaming come after the 200 status
+    output_path = job.get("output_path")
+    if not output_path or not os.path.isdir(output_path):
+        raise HTTPException(410, "Converted project is no longer available")
     
-    return FileResponse(
-        zip_path,
+    # Archive is built while it is sent; StreamingResponse iterates the
+    # synchronous generator on the threadpool, off the event loop
+    return StreamingResponse(
+        _iter_zip(output_path),
         media_type="application/zip",
-        filename=f"converted-project-{job_id}.zip"
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
 
-def _create_zip(output_path: str) -> str:
-    """Create ZIP file from output directory"""
-    import tempfile
-    zip_file = tempfile.mktemp(suffix='.zip')
-    shutil.make_archive(zip_file.replace('.zip', ''), 'zip', output_path)
-    return zip_file
+ZIP_CHUNK_SIZE = 256 * 1024
+
+class _ZipChunkSink:
+    """Write-only, non-seekable file object collecting bytes written by ZipFile"""
+    
+    def __init__(self):
+        self.chunks = []
+    
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+def _iter_zip(output_path: str):
+    """
+    Yield a ZIP archive of the output directory chunk by chunk
+    
+    Nothing is written to disk and memory use is bounded by ZIP_CHUNK_SIZE,
+    since ZipFile writes to a non-seekable sink using data descriptors.
+    
+    Args:
+        output_path: Directory to archive
+    
+    Yields:
+        Bytes of the ZIP archive
+    """
+    sink = _ZipChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for dirpath, dirnames, filenames in os.walk(output_path):
+            dirnames.sort()
+            # Directory entries keep empty directories, as shutil.make_archive did
+            for dirname in dirnames:
+                dir_path = os.path.join(dirpath, dirname)
+                zf.writestr(zipfile.ZipInfo.from_file(dir_path, os.path.relpath(dir_path, output_path)), b"")
+            for filename in sorted(filenames):
+                file_path = os.path.join(dirpath, filename)
+                arcname = os.path.relpath(file_path, output_path)
+                zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+                with open(file_path, "rb") as src, zf.open(zinfo, "w") as dest:
+                    while True:
+                        block = src.read(ZIP_CHUNK_SIZE)
+                        if not block:
+                            break
+                        dest.write(block)
+                        if sink.chunks:
+                            yield sink.drain()
+                if sink.chunks:
+                    yield sink.drain()
+    # Central directory is written on close
+    yield sink.drain()
+
+def _archive_path(job_id: str) -> str:
+    """Location of the pre-built archive served through X-Accel-Redirect"""
+    return os.path.join(ARCHIVE_DIR, f"{job_id}.zip")
+
+def _write_archive(output_path: str, archive_path: str):
+    """Write the ZIP of an output directory to archive_path atomically"""
+    os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+    tmp_path = f"{archive_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        for chunk in _iter_zip(output_path):
+            f.write(chunk)
+    os.replace(tmp_path, archive_path)
 
 @app.delete("/api/convert/{job_id}")
 async def cancel_conversion(job_id: str):
     """Cancel a running conversion"""
     
-    if job_id not in conversion_jobs:
+    job = await job_store.get(job_id)
+    if job is None:
         raise HTTPException(404, "Job not found")
     
-    job = conversion_jobs[job_id]
-    
     if job["status"] in ["completed", "failed"]:
         raise HTTPException(400, "Cannot cancel completed/failed job")
     
-    # Set status to cancelled
-    job["status"] = "cancelled"
+    # Set status to cancelled; a run in another process sees it on its next status check
+    await job_store.update(job_id, {"status": "cancelled"})
+    cancel_event = _cancel_events.get(job_id)
+    if cancel_event is not None:
+        cancel_event.set()
     
     return {"message": "Conversion cancelled"}
 
-# Background conversion task
+# Job progress (percent) reported once each workflow node finishes
+PROGRESS_MAP = {
+    "clone_repo": 10,
+    "ingest_codebase": 15,
+    "index_codebase": 18,
+    "analyze_structure": 20,
+    "extract_metadata": 30,
+    "map_dependencies": 40,
+    "convert_models": 50,
+    "convert_repositories": 60,
+    "convert_services": 70,
+    "convert_controllers": 80,
+    "generate_config": 85,
+    "generate_project": 90,
+    "validate": 95
+}
+
+async def _in_conversion_pool(fn, *args):
+    """Run a blocking call on the conversion pool, in the caller's context (keeps the log job_id)"""
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        _conversion_executor, functools.partial(context.run, fn, *args)
+    )
+
+# Queued by _drive_workflow once the workflow stream is exhausted or stopped
+_STREAM_END = object()
+
+def _drive_workflow(events, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue, stop: threading.Event):
+    """
+    Iterate a workflow stream on the conversion pool, handing each event to the event loop
+    
+    The whole stream runs in this one call (one thread, one context), and the
+    generator is closed here once it ends or stop is set.
+    
+    Args:
+        events: Iterator returned by workflow.stream()
+        loop: Event loop of the awaiting conversion
+        queue: Receives each event, then _STREAM_END
+        stop: Set by the conversion to stop after the current node
+    """
+    try:
+        for event in events:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+            if stop.is_set():
+                break
+    finally:
+        events.close()
+        loop.call_soon_threadsafe(queue.put_nowait, _STREAM_END)
+
+async def _is_cancelled(job_id: str) -> bool:
+    """Whether the job was cancelled through the API"""
+    job = await job_store.get(job_id)
+    return bool(job and job["status"] == "cancelled")
+
+# Conversion task run by the queue workers
 async def run_conversion(
     job_id: str,
     github_url: str,
@@ -213,20 +456,23 @@ async def run_conversion(
     try:
         # Validate model is provided
         if not model or not model.strip():
-            conversion_jobs[job_id]["status"] = "failed"
-            conversion_jobs[job_id]["errors"].append(
+            await job_store.update(job_id, {"status": "failed"})
+            await job_store.append_error(
+                job_id,
                 "Model parameter is required. Please specify model in the conversion request."
             )
-            logging.error(f"Conversion {job_id} failed: Model parameter is required")
+            logger.error("Conversion %s failed: Model parameter is required", job_id)
             return
         
         # Update status
-        conversion_jobs[job_id]["status"] = "processing"
-        conversion_jobs[job_id]["current_phase"] = "Cloning repository"
-        conversion_jobs[job_id]["progress"] = 5
+        await job_store.update(job_id, {
+            "status": "processing",
+            "current_phase": "Cloning repository",
+            "progress": 5
+        })
         
         # Create workflow
-        workflow = create_conversion_workflow()
+        workflow = await _in_conversion_pool(create_conversion_workflow)
         
         # Initial state - support both new and legacy format
         state_data = {
@@ -235,13 +481,16 @@ async def run_conversion(
             "orm_choice": orm_choice,
             "model": model.strip(),
             "repo_path": None,
+            "clone_dir": None,
             "codebase_text_file": None,
             "file_map": None,
             "metadata": None,
+            "modules_by_type": None,
             "converted_components": {},
             "output_path": None,
             "validation_result": None,
-            "errors": []
+            "errors": [],
+            "run_id": job_id
         }
         
         # LLM configuration
@@ -260,88 +509,242 @@ async def run_conversion(
             state_data["llm_base_url"] = llm_base_url
             state_data["llm_profile_name"] = None
             state_data["llm_config_path"] = llm_config_path
-            # Legacy support for backward compatibility
-            if gemini_api_token and not llm_api_token:
-                state_data["llm_provider"] = "gemini"
-                state_data["llm_api_token"] = gemini_api_token
             state_data["gemini_api_token"] = gemini_api_token if state_data["llm_provider"] == "gemini" else None
         
         initial_state = ConversionState(**state_data)
         
-        # Execute workflow with progress tracking
-        result = None
-        for event in workflow.stream(initial_state):
-            node_name = list(event.keys())[0]
-            node_output = event[node_name]
-            
-            # Update progress
-            progress_map = {
-                "clone_repo": 10,
-                "analyze_structure": 20,
-                "extract_metadata": 30,
-                "map_dependencies": 40,
-                "convert_models": 50,
-                "convert_repositories": 60,
-                "convert_services": 70,
-                "convert_controllers": 80,
-                "generate_config": 85,
-                "generate_project": 90,
-                "validate": 95
-            }
-            
-            conversion_jobs[job_id]["progress"] = progress_map.get(node_name, 50)
-            conversion_jobs[job_id]["current_phase"] = node_name.replace("_", " ").title()
-            
-            # Store metadata when available
-            if "metadata" in node_output and node_output["metadata"]:
-                conversion_jobs[job_id]["metadata"] = node_output["metadata"]
-            
-            result = node_output
+        # Execute workflow with progress tracking; nodes emit only the keys they
+        # update, so the final values are accumulated across events. The stream runs
+        # on the conversion pool so the event loop keeps serving requests meanwhile
+        result = {}
+        cancelled = False
+        queue: asyncio.Queue = asyncio.Queue()
+        # Stops the stream after the running node; nodes skip their remaining LLM work once set
+        stop = threading.Event()
+        register_cancel_event(job_id, stop)
+        _cancel_events[job_id] = stop
+        driver = asyncio.ensure_future(_in_conversion_pool(
+            _drive_workflow, workflow.stream(initial_state), asyncio.get_running_loop(), queue, stop
+        ))
+        getter = None
+        try:
+            while True:
+                # While a long node runs, wake up every CANCEL_POLL_INTERVAL to check for a cancellation
+                if getter is None:
+                    getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({getter}, timeout=CANCEL_POLL_INTERVAL)
+                event = None
+                if done:
+                    event = getter.result()
+                    getter = None
+                if event is _STREAM_END:
+                    break
+                if event is not None:
+                    node_name = next(iter(event))
+                    node_output = event[node_name]
+                    if node_output:
+                        result.update(node_output)
+                if cancelled:
+                    continue
+                
+                # DELETE /api/convert/{job_id} marks the job cancelled
+                if stop.is_set() or await _is_cancelled(job_id):
+                    cancelled = True
+                    stop.set()
+                    continue
+                if event is None:
+                    continue
+                
+                # Update progress
+                update = {
+                    "progress": PROGRESS_MAP.get(node_name, 50),
+                    "current_phase": node_name.replace("_", " ").title()
+                }
+                
+                # Store metadata when available
+                if node_output and node_output.get("metadata"):
+                    update["metadata"] = node_output["metadata"]
+                
+                await job_store.update(job_id, update)
+            # Re-raises a workflow error
+            await driver
+        finally:
+            if getter is not None:
+                getter.cancel()
+            # Resources are released only once the stream has stopped using them
+            stop.set()
+            await asyncio.wait({driver})
+            _cancel_events.pop(job_id, None)
+            release_run_resources(job_id)
+        
+        # A cancellation after the last node still wins over "completed"
+        if cancelled or await _is_cancelled(job_id):
+            # The workflow removes its clone only when it runs to the end
+            if result.get("clone_dir"):
+                from ..analyzers.repository_analyzer import remove_directory
+                try:
+                    await _in_conversion_pool(remove_directory, result["clone_dir"])
+                except OSError as e:
+                    logger.warning("Conversion %s: failed to remove clone: %s", job_id, e)
+            logger.info("Conversion %s cancelled", job_id)
+            return
+        
+        # Pre-build the download for nginx; the download route falls back to
+        # streaming if this fails
+        if USE_X_ACCEL and result.get("output_path"):
+            try:
+                await _in_conversion_pool(_write_archive, result["output_path"], _archive_path(job_id))
+            except OSError as e:
+                logger.warning("Conversion %s: failed to pre-build archive: %s", job_id, e)
         
         # Mark as completed
-        conversion_jobs[job_id]["status"] = "completed"
-        conversion_jobs[job_id]["progress"] = 100
-        conversion_jobs[job_id]["output_path"] = result["output_path"]
-        conversion_jobs[job_id]["validation_result"] = result["validation_result"]
+        await job_store.update(job_id, {
+            "status": "completed",
+            "progress": 100,
+            "output_path": result.get("output_path"),
+            "validation_result": result.get("validation_result")
+        })
         
-        logging.info(f"Conversion {job_id} completed successfully")
+        logger.info("Conversion %s completed successfully", job_id)
         
     except Exception as e:
         # Mark as failed
-        conversion_jobs[job_id]["status"] = "failed"
-        conversion_jobs[job_id]["errors"].append(str(e))
+        await job_store.update(job_id, {"status": "failed"})
+        await job_store.append_error(job_id, str(e))
         
-        logging.error(f"Conversion {job_id} failed: {str(e)}")
+        logger.error("Conversion %s failed: %s", job_id, e)
 
 # Health check
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "version": "1.0.0"}
+    return {"status": "healthy", "version": "1.0.0", "queued_jobs": await job_store.queue_length()}
 
 class ModelListRequest(BaseModel):
     api_token: str
 
+# Model lists per API token (keyed by token hash), reused for MODELS_CACHE_TTL seconds;
+# least recently used tokens are dropped beyond MODELS_CACHE_MAX_ENTRIES
+MODELS_CACHE_TTL = 300
+MODELS_CACHE_MAX_ENTRIES = int(os.getenv("MODELS_CACHE_MAX_ENTRIES", "256"))
+_models_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_models_cache_locks: "OrderedDict[str, asyncio.Lock]" = OrderedDict()
+GEMINI_MODELS_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+MODELS_REQUEST_TIMEOUT = 30
+
+# Shared HTTP session so model listings reuse connections to the API
+_http = requests.Session()
+
+def _fetch_models_sync(api_token: str) -> list:
+    """List generateContent-capable Gemini models for an API token (blocking)"""
+    models = []
+    params = {"pageSize": 1000}
+    while True:
+        response = _http.get(
+            GEMINI_MODELS_URL,
+            params=params,
+            headers={"x-goog-api-key": api_token},
+            timeout=MODELS_REQUEST_TIMEOUT
+        )
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+        if response.status_code != 200:
+            error = data.get("error") or {}
+            raise RuntimeError(f"HTTP {response.status_code}: {error.get('message') or response.text}")
+        
+        for model in data.get("models", []):
+            # Filter for Gemini models only
+            if 'generateContent' in model.get("supportedGenerationMethods", []):
+                # Extract model name from full path (e.g., "models/gemini-2.5-flash" -> "gemini-2.5-flash")
+                full_name = model["name"]
+                model_name = full_name.split('/')[-1] if '/' in full_name else full_name
+                models.append({
+                    "name": model_name,
+                    "display_name": model.get("displayName") or model_name,
+                    "full_name": full_name
+                })
+        
+        if not data.get("nextPageToken"):
+            return models
+        params["pageToken"] = data["nextPageToken"]
+
+_VERSION_MAJOR_MINOR_RE = re.compile(r'(\d+)\.(\d+)')
+_VERSION_ANY_RE = re.compile(r'(\d+)')
+
+def _model_version(model_name: str) -> float:
+    """Extract version number from model name (e.g., 'gemini-2.5-pro' -> 2.5)"""
+    match = _VERSION_MAJOR_MINOR_RE.search(model_name)
+    if match:
+        return float(f"{match.group(1)}.{match.group(2)}")
+    match = _VERSION_ANY_RE.search(model_name)
+    if match:
+        return float(match.group(1))
+    return 0.0
+
+def _model_sort_key(model: dict):
+    """Order Pro models by version (highest first), then Flash by version, then others by name"""
+    name = model["name"].lower()
+    if "pro" in name and "flash" not in name:
+        return (0, -_model_version(name))  # Negative for descending order
+    elif "flash" in name:
+        return (1, -_model_version(name))  # Negative for descending order
+    else:
+        return (2, name)
+
+def _get_cached_models(key: str) -> Optional[list]:
+    """Cached model list for a token hash, or None if missing or expired"""
+    cached = _models_cache.get(key)
+    if cached is None:
+        return None
+    if time.monotonic() - cached[0] >= MODELS_CACHE_TTL:
+        del _models_cache[key]
+        return None
+    _models_cache.move_to_end(key)
+    return cached[1]
+
+def _cache_models(key: str, models: list):
+    """Cache a model list, dropping expired and least recently used entries"""
+    now = time.monotonic()
+    for expired in [k for k, (fetched, _) in _models_cache.items() if now - fetched >= MODELS_CACHE_TTL]:
+        del _models_cache[expired]
+    _models_cache[key] = (now, models)
+    _models_cache.move_to_end(key)
+    while len(_models_cache) > MODELS_CACHE_MAX_ENTRIES:
+        _models_cache.popitem(last=False)
+
+def _models_cache_lock(key: str) -> asyncio.Lock:
+    """Fetch lock of a token hash; evicting an idle token's lock only risks a duplicate fetch"""
+    lock = _models_cache_locks.get(key)
+    if lock is None:
+        lock = _models_cache_locks[key] = asyncio.Lock()
+        while len(_models_cache_locks) > MODELS_CACHE_MAX_ENTRIES:
+            _models_cache_locks.popitem(last=False)
+    else:
+        _models_cache_locks.move_to_end(key)
+    return lock
+
 @app.post("/api/models/list")
 async def list_gemini_models(request: ModelListRequest):
     """List available Gemini models for a given API token"""
+    key = hashlib.sha256(request.api_token.encode("utf-8")).hexdigest()
+    cached = _get_cached_models(key)
+    if cached is not None:
+        return {"models": cached}
+    
+    # Concurrent requests for the same token wait for a single fetch
+    async with _models_cache_lock(key):
+        cached = _get_cached_models(key)
+        if cached is not None:
+            return {"models": cached}
+        return await _list_gemini_models_uncached(request.api_token, key)
+
+async def _list_gemini_models_uncached(api_token: str, key: str):
+    """Fetch, sort and cache the model list for an API token"""
     try:
-        import google.generativeai as genai
-        genai.configure(api_key=request.api_token)
-        
-        # Fetch available models
-        models = []
+        # Fetch available models without blocking the event loop
         try:
-            for model in genai.list_models():
-                # Filter for Gemini models only
-                if 'generateContent' in model.supported_generation_methods:
-                    # Extract model name from full path (e.g., "models/gemini-2.5-flash" -> "gemini-2.5-flash")
-                    model_name = model.name.split('/')[-1] if '/' in model.name else model.name
-                    model_info = {
-                        "name": model_name,
-                        "display_name": model.display_name or model_name,
-                        "full_name": model.name
-                    }
-                    models.append(model_info)
+            models = await asyncio.to_thread(_fetch_models_sync, api_token)
         except Exception as e:
             # Distinguish between authentication errors and other issues
             error_msg = str(e).lower()
@@ -358,31 +761,9 @@ async def list_gemini_models(request: ModelListRequest):
             }
         
         # Sort by preference: highest version Pro models first, then Flash, then others
-        def extract_version(model_name):
-            """Extract version number from model name (e.g., 'gemini-2.5-pro' -> 2.5)"""
-            import re
-            match = re.search(r'(\d+)\.(\d+)', model_name)
-            if match:
-                return float(f"{match.group(1)}.{match.group(2)}")
-            match = re.search(r'(\d+)', model_name)
-            if match:
-                return float(match.group(1))
-            return 0.0
-        
-        def sort_key(m):
-            name = m["name"].lower()
-            version = extract_version(name)
-            
-            # Priority: Pro models by version (highest first), then Flash by version, then others
-            if "pro" in name and "flash" not in name:
-                return (0, -version)  # Negative for descending order
-            elif "flash" in name:
-                return (1, -version)  # Negative for descending order
-            else:
-                return (2, name)
-        
-        models.sort(key=sort_key)  # 'key' here is Python's sort parameter, not API key
+        models.sort(key=_model_sort_key)  # 'key' here is Python's sort parameter, not API key
         
+        _cache_models(key, models)
         return {"models": models}
     except HTTPException:
         raise
@@ -5,6 +5,7 @@ from .gemini_client import GeminiClient
 from .glm_client import GLMClient
 from .openrouter_client import OpenRouterClient
 from .openai_client import OpenAIClient
+from .cached_llm_client import LLMCache, CachingLLMClient
 from .llm_client_factory import create_llm_client, create_llm_client_from_profile, create_llm_client_from_config
 
 __all__ = [
@@ -13,6 +14,8 @@ __all__ = [
     "GLMClient",
     "OpenRouterClient",
     "OpenAIClient",
+    "LLMCache",
+    "CachingLLMClient",
     "create_llm_client",
     "create_llm_client_from_profile",
     "create_llm_client_from_config"
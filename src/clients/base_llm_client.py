@@ -1,12 +1,212 @@
 """Base LLM client interface for all provider implementations"""
 
+import re
+import json
+import time
+import random
+import logging
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any, Callable
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import List, Optional, Dict, Any, Callable, Iterator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+def json_loads(data):
+    """Parse JSON text or bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(value: Any) -> str:
+    """Serialize a value to JSON text, with orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(value)
+
+
+# Markdown code fences around JSON in model responses; an unterminated fence runs to the end
+_JSON_FENCE_RE = re.compile(r"```json(.*?)(?:```|\Z)", re.DOTALL)
+_CODE_FENCE_RE = re.compile(r"```(.*?)(?:```|\Z)", re.DOTALL)
+
+
+def extract_json(text: str) -> str:
+    """
+    Return the JSON part of a model response
+    
+    Takes the first ```json fence if there is one, else the first ``` fence,
+    else the whole text.
+    
+    Args:
+        text: Response text
+        
+    Returns:
+        Text to parse as JSON
+    """
+    if "```" not in text:
+        return text
+    match = _JSON_FENCE_RE.search(text) or _CODE_FENCE_RE.search(text)
+    return match.group(1).strip()
+
+
+# Connections kept alive per provider host by the shared HTTP session; covers the
+# concurrent requests of parallel conversions and chunk processing
+HTTP_POOL_MAXSIZE = 32
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def shared_http_session():
+    """
+    Return the process-wide requests.Session used by the HTTP-based provider clients
+    
+    Reusing one pooled session keeps TCP/TLS connections alive across all LLM calls
+    of all conversions instead of opening a new connection per request.
+    
+    Returns:
+        requests.Session with a connection pool of HTTP_POOL_MAXSIZE per host
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                # Retries are done by the clients (with backoff), not by urllib3
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _http_session = session
+    return _http_session
+
+
+# Connection limits of the shared HTTP/2 client; one connection multiplexes many
+# concurrent requests, so far fewer sockets are opened than with the HTTP/1.1 pool
+HTTP2_MAX_CONNECTIONS = 64
+HTTP2_MAX_KEEPALIVE = 32
+
+_http2_client = None
+_http2_unavailable = False
+
+
+def shared_http2_client():
+    """
+    Return the process-wide HTTP/2 httpx.Client, if HTTP/2 support is installed
+    
+    Concurrent requests to one host share a connection as multiplexed HTTP/2
+    streams. Requires the optional ``httpx[http2]`` package; callers fall back to
+    shared_http_session() when this returns None.
+    
+    Returns:
+        httpx.Client with http2=True, or None if httpx or h2 is not installed
+    """
+    global _http2_client, _http2_unavailable
+    if _http2_client is None and not _http2_unavailable:
+        with _http_session_lock:
+            if _http2_client is None and not _http2_unavailable:
+                try:
+                    import httpx
+                    _http2_client = httpx.Client(
+                        http2=True,
+                        timeout=120,
+                        limits=httpx.Limits(
+                            max_keepalive_connections=HTTP2_MAX_KEEPALIVE,
+                            max_connections=HTTP2_MAX_CONNECTIONS
+                        )
+                    )
+                except ImportError:
+                    # httpx missing, or installed without the h2 extra
+                    _http2_unavailable = True
+    return _http2_client
+
+
+# Upper bound on a server-requested Retry-After delay, in seconds
+MAX_RETRY_AFTER = 300
+
+
+def _retry_after_seconds(response) -> Optional[float]:
+    """Parse a response's Retry-After header (delta-seconds or HTTP date)"""
+    value = getattr(response, "headers", {}).get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+COMBINE_PROMPT = "Combine these partial analyses into a single comprehensive result:\n\n"
+COMBINE_SEPARATOR = "\n\n---\n\n"
+
+
+def _combine_prompt(texts: List[str]) -> str:
+    """Build a combine prompt in one allocation (the header is joined in with the texts)"""
+    parts = [COMBINE_PROMPT]
+    for i, text in enumerate(texts):
+        if i:
+            parts.append(COMBINE_SEPARATOR)
+        parts.append(text)
+    return "".join(parts)
 
 
 class BaseLLMClient(ABC):
     """Abstract base class for all LLM provider clients"""
     
+    # Chunks of one document sent to the provider concurrently by process_large_content
+    max_parallel_chunks = 4
+    
+    # Full-jitter exponential backoff between retries: uniform(0, min(cap, base * 2**attempt)),
+    # so concurrent callers hitting a rate limit don't retry in lockstep
+    retry_base = 1.0
+    retry_cap = 30.0
+    
+    def _retry_delay(self, attempt: int, response=None) -> float:
+        """
+        Seconds to wait before retrying a failed request
+        
+        Args:
+            attempt: Zero-based number of the attempt that failed
+            response: Optional HTTP response, whose Retry-After header is honoured
+            
+        Returns:
+            Delay in seconds
+        """
+        backoff = getattr(self, "retry_backoff", None)
+        if backoff:
+            # Explicitly configured fixed delays
+            delay = backoff[min(attempt, len(backoff) - 1)]
+        else:
+            delay = random.uniform(0, min(self.retry_cap, self.retry_base * (2 ** attempt)))
+        
+        retry_after = _retry_after_seconds(response)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, MAX_RETRY_AFTER))
+        return delay
+    
+    @property
+    def http_session(self):
+        """Shared pooled HTTP session (see shared_http_session)"""
+        return shared_http_session()
+    
     @abstractmethod
     def generate(
         self,
@@ -33,6 +233,88 @@ class BaseLLMClient(ABC):
         """
         pass
     
+    def generate_stream(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.0,
+        context: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Generate text, yielding it in pieces as the provider produces them
+        
+        Lets callers start parsing or writing output before the whole response
+        exists. Providers without streaming support yield the complete response
+        as a single piece.
+        
+        Args:
+            prompt: Input prompt
+            max_tokens: Maximum output tokens
+            temperature: Sampling temperature
+            context: Optional context string for logging
+            
+        Yields:
+            Consecutive pieces of the generated text
+        """
+        yield self.generate(prompt, max_tokens=max_tokens, temperature=temperature, context=context)
+    
+    def _stream_chat(self, url: str, headers: Dict[str, str], payload: Dict[str, Any]) -> Iterator[str]:
+        """
+        Stream an OpenAI-compatible chat completion (server-sent events)
+        
+        Rate limits, server errors and connection failures are retried with
+        backoff until the stream starts; errors after that are raised.
+        
+        Args:
+            url: Chat completions endpoint
+            headers: Request headers
+            payload: Request body (stream is switched on here)
+            
+        Yields:
+            Content deltas of the first choice
+        """
+        import requests
+        
+        payload = {**payload, "stream": True}
+        max_retries = getattr(self, "max_retries", 3)
+        rate_limiter = getattr(self, "rate_limiter", None)
+        for attempt in range(max_retries):
+            if rate_limiter:
+                prompt_tokens = sum(self.estimate_tokens(m["content"]) for m in payload["messages"])
+                rate_limiter.acquire(prompt_tokens + payload.get("max_tokens", 0))
+            try:
+                response = self.http_session.post(url, headers=headers, json=payload, stream=True, timeout=120)
+            except requests.exceptions.RequestException as e:
+                if attempt < max_retries - 1:
+                    wait_time = self._retry_delay(attempt)
+                    logger.warning(f"Stream request failed (attempt {attempt + 1}/{max_retries}): {e}. Retrying in {wait_time:.1f}s...")
+                    time.sleep(wait_time)
+                    continue
+                raise
+            if (response.status_code == 429 or response.status_code >= 500) and attempt < max_retries - 1:
+                wait_time = self._retry_delay(attempt, response)
+                response.close()
+                logger.warning(f"HTTP error {response.status_code} starting stream. Retrying in {wait_time:.1f}s...")
+                time.sleep(wait_time)
+                continue
+            break
+        
+        with response:
+            if response.status_code >= 400:
+                raise ValueError(f"Streaming request failed with HTTP {response.status_code}: {response.text[:200]}")
+            response.encoding = response.encoding or "utf-8"
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                choices = json_loads(data).get("choices") or []
+                if choices:
+                    content = (choices[0].get("delta") or {}).get("content")
+                    if content:
+                        yield content
+    
     @abstractmethod
     def generate_structured(
         self,
@@ -80,6 +362,10 @@ class BaseLLMClient(ABC):
         """
         Process large content by chunking and combining results
         
+        Consecutive chunks are packed into parts of up to the chunk token budget,
+        and parts are processed concurrently (up to max_parallel_chunks at a time);
+        results keep the chunk order.
+        
         Args:
             content: Large content to process
             system_prompt: System prompt for each chunk
@@ -90,11 +376,12 @@ class BaseLLMClient(ABC):
         Returns:
             Combined result
         """
-        # Default implementation - can be overridden by subclasses
         from ..utils.chunking import ChunkingStrategy
         
-        chunking = ChunkingStrategy()
-        chunks = chunking.chunk_file(content)
+        chunking = getattr(self, "chunking", None) or ChunkingStrategy()
+        # Small consecutive chunks (e.g. one per class) are sent as one part; they are
+        # packed as the chunker yields them, so only the packed parts are held
+        chunks = chunking.pack_chunks(chunking.iter_chunks(content))
         
         if not chunks:
             return None
@@ -107,22 +394,22 @@ class BaseLLMClient(ABC):
                 return process_chunk_fn(self, prompt)
             return self.generate(prompt, context=chunk_context)
         
-        # Process each chunk
-        results = []
-        import logging
-        logger = logging.getLogger(__name__)
+        # Prompts are built only when their chunk is sent, from a prefix shared by all chunks,
+        # so at most max_parallel_chunks copies of the system prompt exist at a time
+        prompt_prefix = f"{system_prompt}\n\nCode (part "
+        prompt_suffix = f" of {len(chunks)}):\n"
         
-        for i, chunk in enumerate(chunks):
+        def process_chunk(i: int):
+            chunk = chunks[i]
             logger.info(f"Processing chunk {i + 1}/{len(chunks)} ({chunk.estimated_tokens} tokens)")
-            chunk_prompt = f"{system_prompt}\n\nCode (part {i + 1} of {len(chunks)}):\n{chunk.content}"
+            chunk_prompt = "".join((prompt_prefix, str(i + 1), prompt_suffix, chunk.content))
             chunk_context = f"{context} (chunk {i + 1}/{len(chunks)})" if context else None
             
             if process_chunk_fn:
-                result = process_chunk_fn(self, chunk_prompt)
-            else:
-                result = self.generate(chunk_prompt, context=chunk_context)
-            
-            results.append(result)
+                return process_chunk_fn(self, chunk_prompt)
+            return self.generate(chunk_prompt, context=chunk_context)
+        
+        results = self._map_parallel(process_chunk, range(len(chunks)))
         
         # Combine results
         if combine_results_fn:
@@ -130,25 +417,32 @@ class BaseLLMClient(ABC):
         
         # Default: combine as summary
         if len(results) > 1:
-            combine_prompt = f"Combine these partial analyses into a single comprehensive result:\n\n" + \
-                           "\n\n---\n\n".join([str(r) for r in results])
-            return self.generate(combine_prompt, context=context)
+            return self.generate(_combine_prompt([str(r) for r in results]), context=context)
         
         return results[0] if results else None
     
-    def chunk_text(self, text: str, max_tokens: int = 8000) -> List[str]:
+    def _map_parallel(self, fn: Callable, items) -> List[Any]:
+        """Apply fn to items with up to max_parallel_chunks concurrent calls, preserving order"""
+        items = list(items)
+        workers = min(self.max_parallel_chunks, len(items))
+        if workers <= 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-chunk") as executor:
+            return list(executor.map(fn, items))
+    
+    def chunk_text(self, text: str, max_tokens: int = 8000) -> Iterator[str]:
         """
-        Split text into chunks
+        Split text into chunks, produced lazily
         
         Args:
             text: Text to chunk
             max_tokens: Maximum tokens per chunk
             
-        Returns:
-            List of text chunks
+        Yields:
+            Text chunks, in order
         """
         from ..utils.chunking import ChunkingStrategy
-        chunking = ChunkingStrategy()
-        chunks = chunking.chunk_file(text, max_tokens=max_tokens)
-        return [chunk.content for chunk in chunks]
+        chunking = getattr(self, "chunking", None) or ChunkingStrategy()
+        for chunk in chunking.iter_chunks(text, max_tokens=max_tokens):
+            yield chunk.content
 
@@ -0,0 +1,289 @@
+"""Deterministic response cache for LLM clients"""
+
+import os
+import json
+import hashlib
+import logging
+import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Callable, Iterator
+from .base_llm_client import BaseLLMClient
+
+logger = logging.getLogger(__name__)
+
+# In-memory entries kept per cache before least recently used ones are evicted
+DEFAULT_MAX_ENTRIES = 4096
+
+REDIS_KEY_PREFIX = "llmcache:"
+
+
+class LLMCache:
+    """
+    Content-addressed store for LLM responses
+    
+    Entries are kept in a bounded in-memory LRU and, if configured, also in a
+    directory (one JSON file per key, surviving across runs) and/or Redis
+    (shared by all processes, e.g. parallel CI jobs). Lookups go memory, then
+    disk, then Redis; entries older than ttl seconds are treated as misses.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: Optional[float] = None,
+        redis_url: Optional[str] = None
+    ):
+        """
+        Initialize cache
+        
+        Args:
+            cache_dir: Optional directory for persistent entries (in-memory only if not set)
+            max_entries: Maximum entries kept in memory (least recently used are evicted)
+            ttl: Optional entry lifetime in seconds (entries never expire if not set)
+            redis_url: Optional Redis URL of a shared cache (requires the redis package)
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory = OrderedDict()  # {key: (stored_at, value)}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = 0
+        self.misses = 0
+        
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        
+        self._redis = None
+        if redis_url:
+            import redis
+            self._redis = redis.Redis.from_url(redis_url)
+    
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current in-memory size"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._memory)}
+    
+    @staticmethod
+    def cache_key(model: str, kind: str, payload: Dict[str, Any]) -> Optional[str]:
+        """
+        Build a cache key for a request
+        
+        Args:
+            model: Model name
+            kind: Request kind ("generate" or "structured")
+            payload: Request parameters (prompt, temperature, ...)
+        
+        Returns:
+            SHA-256 hex digest, or None if the request is not deterministic (temperature > 0)
+        """
+        if (payload.get("temperature") or 0) > 0:
+            return None
+        data = json.dumps({"model": model, "kind": kind, **payload}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+    
+    @contextmanager
+    def key_lock(self, key: str):
+        """
+        Serialize work on one key, so identical in-flight requests are made only once
+        
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            try:
+                yield
+            finally:
+                with self._lock:
+                    if self._key_locks.get(key) is key_lock:
+                        del self._key_locks[key]
+    
+    def _path(self, key: str) -> str:
+        """Path of the on-disk entry for a key"""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+    
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+    
+    def _remember(self, key: str, stored_at: float, value: Any):
+        """Add an entry to the in-memory LRU (caller holds the lock)"""
+        self._memory[key] = (stored_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached response
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Cached value, or None on a miss
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[0]):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._memory[key]
+        
+        stored_at, value = 0.0, None
+        if self.cache_dir:
+            try:
+                with open(self._path(key), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                stored_at, value = data.get("stored_at", 0.0), data["value"]
+                if self._expired(stored_at):
+                    value = None
+            except (OSError, ValueError, KeyError):
+                value = None
+        
+        if value is None and self._redis is not None:
+            try:
+                raw = self._redis.get(f"{REDIS_KEY_PREFIX}{key}")
+                if raw is not None:
+                    data = json.loads(raw)
+                    stored_at, value = data.get("stored_at", 0.0), data["value"]
+            except Exception as e:  # Redis outages degrade to cache misses
+                logger.warning(f"LLM cache Redis lookup failed: {e}")
+                value = None
+        
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._remember(key, stored_at, value)
+        return value
+    
+    def set(self, key: str, value: Any):
+        """
+        Store a response
+        
+        Args:
+            key: Cache key
+            value: JSON-serializable response
+        """
+        stored_at = time.time()
+        with self._lock:
+            self._remember(key, stored_at, value)
+        
+        if self.cache_dir:
+            path = self._path(key)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({"value": value, "stored_at": stored_at}, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            except (OSError, TypeError) as e:
+                logger.warning(f"Failed to write LLM cache entry {key[:12]}: {e}")
+        
+        if self._redis is not None:
+            try:
+                data = json.dumps({"value": value, "stored_at": stored_at}, ensure_ascii=False)
+                ttl = max(1, int(self.ttl)) if self.ttl else None
+                self._redis.set(f"{REDIS_KEY_PREFIX}{key}", data, ex=ttl)
+            except Exception as e:
+                logger.warning(f"Failed to write LLM cache entry {key[:12]} to Redis: {e}")
+
+
+class CachingLLMClient(BaseLLMClient):
+    """LLM client wrapper serving repeated deterministic requests from an LLMCache"""
+    
+    def __init__(
+        self,
+        client: BaseLLMClient,
+        cache: LLMCache,
+        on_lookup: Optional[Callable[[bool], None]] = None
+    ):
+        """
+        Initialize caching client
+        
+        Args:
+            client: Underlying provider client
+            cache: Response cache
+            on_lookup: Optional callback invoked with True (hit) or False (miss) on every lookup
+        """
+        self.client = client
+        self.cache = cache
+        self.on_lookup = on_lookup
+        self.model_name = getattr(client, "model_name", "")
+    
+    def __getattr__(self, name):
+        # Expose provider-specific attributes/methods of the wrapped client
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+    
+    def _cached(self, kind: str, payload: Dict[str, Any], call: Callable[[], Any]) -> Any:
+        """Return the cached response for a request, calling the provider on a miss"""
+        key = LLMCache.cache_key(self.model_name, kind, payload)
+        if key is None:
+            return call()
+        
+        # Concurrent duplicates (e.g. identical components converted in parallel) wait
+        # for the first request and are then served from the cache
+        with self.cache.key_lock(key):
+            value = self.cache.get(key)
+            if self.on_lookup:
+                self.on_lookup(value is not None)
+            if value is not None:
+                logger.debug(f"LLM cache hit ({kind}) {key[:12]}")
+                return value
+            
+            value = call()
+            if value is not None:
+                self.cache.set(key, value)
+            return value
+    
+    def generate(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.0,
+        context: Optional[str] = None
+    ) -> str:
+        """Generate text response, served from cache when possible"""
+        return self._cached(
+            "generate",
+            {"prompt": prompt, "max_tokens": max_tokens, "temperature": temperature},
+            lambda: self.client.generate(prompt, max_tokens=max_tokens, temperature=temperature, context=context)
+        )
+    
+    def generate_stream(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.0,
+        context: Optional[str] = None
+    ) -> Iterator[str]:
+        """Stream text from the wrapped client (not cached: pieces are consumed as they arrive)"""
+        return self.client.generate_stream(prompt, max_tokens=max_tokens, temperature=temperature, context=context)
+    
+    def generate_structured(
+        self,
+        prompt: str,
+        schema: Optional[Dict[str, Any]] = None,
+        context: Optional[str] = None
+    ) -> Dict:
+        """Generate structured JSON response, served from cache when possible"""
+        return self._cached(
+            "structured",
+            {"prompt": prompt, "schema": schema},
+            lambda: self.client.generate_structured(prompt, schema=schema, context=context)
+        )
+    
+    def estimate_tokens(self, text: str) -> int:
+        """Estimate token count for text"""
+        return self.client.estimate_tokens(text)
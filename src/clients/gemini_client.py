@@ -1,25 +1,50 @@
 """Gemini API client for LLM operations"""
 
+import re
 import time
 import logging
-from typing import List, Optional, Dict, Any
-import google.generativeai as genai
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Iterator
 from ..utils.chunking import ChunkingStrategy, Chunk, Batch
-from .base_llm_client import BaseLLMClient
+from .base_llm_client import BaseLLMClient, json_loads, json_dumps, extract_json
+from .rate_limiter import shared_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+# Words/phrases that might trigger safety filters in code context (a heuristic - actual
+# triggers depend on Gemini's internal filters), as one alternation compiled once
+_TRIGGER_WORDS = [
+    ("hack", "attack", "exploit", "vulnerability", "inject", "bypass"),
+    ("kill", "destroy", "delete", "remove", "drop", "truncate"),
+    ("secret", "password", "token", "credential", "auth"),
+    ("user", "admin", "root", "privilege", "access", "permission"),
+    ("data", "info", "personal", "private", "sensitive"),
+    ("error", "exception", "fail", "crash", "bug", "issue"),
+    ("test", "check", "validate", "verify", "assert"),
+]
+_TRIGGER_RE = re.compile(
+    r'\b(' + "|".join(word for group in _TRIGGER_WORDS for word in group) + r')\w*\b',
+    re.IGNORECASE
+)
+
 
 class GeminiClient(BaseLLMClient):
     """Client for Google Gemini API with token management and retry logic"""
     
+    # Safety settings shared by all instances; built on first init, once the SDK is imported
+    _safety_settings = None
+    
     def __init__(
         self,
         api_token: str,
         model: str,
         max_retries: int = 3,
         retry_backoff: List[float] = None,
-        max_output_tokens: int = 8192
+        max_output_tokens: int = 8192,
+        max_workers: int = 8,
+        rpm_limit: Optional[int] = None,
+        tpm_limit: Optional[int] = None
     ):
         """
         Initialize Gemini client
@@ -28,8 +53,11 @@ class GeminiClient(BaseLLMClient):
             api_token: Google Gemini API token
             model: Model name (required, e.g., "gemini-2.5-flash")
             max_retries: Maximum retry attempts
-            retry_backoff: Backoff delays in seconds for retries
+            retry_backoff: Optional fixed backoff delays in seconds (default: full-jitter exponential)
             max_output_tokens: Maximum tokens in response
+            max_workers: Maximum concurrent API calls (generate_batch pool size)
+            rpm_limit: Optional requests-per-minute limit to stay under (shared per model)
+            tpm_limit: Optional tokens-per-minute limit to stay under (shared per model)
             
         Raises:
             ValueError: If model is empty or None
@@ -43,13 +71,35 @@ class GeminiClient(BaseLLMClient):
         self.api_token = api_token
         self.model_name = model.strip()
         self.max_retries = max_retries
-        self.retry_backoff = retry_backoff or [2, 5, 10]
+        self.retry_backoff = retry_backoff  # None: full-jitter exponential backoff
         self.max_output_tokens = max_output_tokens
         self.chunking = ChunkingStrategy()
+        self.max_workers = max(1, max_workers)
+        self._call_slots = threading.BoundedSemaphore(self.max_workers)
+        # Shared with every other client of this model, since the quota is per model
+        self.rate_limiter = shared_rate_limiter("gemini", self.model_name, rpm_limit, tpm_limit)
+        
+        # Imported here rather than at module level: the SDK (gRPC, protobuf) is slow to
+        # import, and importing the clients package must not pay for it unless Gemini is used
+        import google.generativeai as genai
         
         # Configure Gemini
         genai.configure(api_key=api_token)
         self.model = genai.GenerativeModel(self.model_name)
+        # Bound once; resolving it through the SDK model object on every call is pure overhead
+        self._generate_content = self.model.generate_content
+        self._generation_config_type = genai.types.GenerationConfig
+        
+        # Configure safety settings to be very permissive for code conversion
+        # Code analysis can trigger false positives, so we block only the most severe content
+        if GeminiClient._safety_settings is None:
+            harm, threshold = genai.types.HarmCategory, genai.types.HarmBlockThreshold
+            GeminiClient._safety_settings = [
+                {"category": harm.HARM_CATEGORY_HARASSMENT, "threshold": threshold.BLOCK_ONLY_HIGH},
+                {"category": harm.HARM_CATEGORY_HATE_SPEECH, "threshold": threshold.BLOCK_ONLY_HIGH},
+                {"category": harm.HARM_CATEGORY_SEXUALLY_EXPLICIT, "threshold": threshold.BLOCK_ONLY_HIGH},
+                {"category": harm.HARM_CATEGORY_DANGEROUS_CONTENT, "threshold": threshold.BLOCK_MEDIUM_AND_ABOVE},
+            ]
     
     def generate(self, prompt: str, max_tokens: int = None, temperature: float = 0.0, context: str = None) -> str:
         """
@@ -73,39 +123,23 @@ class GeminiClient(BaseLLMClient):
         if context:
             logger.info(f"Processing: {context}")
         
+        # Same for every attempt
+        generation_config = self._generation_config_type(
+            max_output_tokens=max_tokens,
+            temperature=temperature
+        )
+        
         for attempt in range(self.max_retries):
             try:
-                generation_config = genai.types.GenerationConfig(
-                    max_output_tokens=max_tokens,
-                    temperature=temperature
-                )
-                
-                # Configure safety settings to be very permissive for code conversion
-                # Code analysis can trigger false positives, so we block only the most severe content
-                safety_settings = [
-                    {
-                        "category": genai.types.HarmCategory.HARM_CATEGORY_HARASSMENT,
-                        "threshold": genai.types.HarmBlockThreshold.BLOCK_ONLY_HIGH,
-                    },
-                    {
-                        "category": genai.types.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-                        "threshold": genai.types.HarmBlockThreshold.BLOCK_ONLY_HIGH,
-                    },
-                    {
-                        "category": genai.types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
-                        "threshold": genai.types.HarmBlockThreshold.BLOCK_ONLY_HIGH,
-                    },
-                    {
-                        "category": genai.types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-                        "threshold": genai.types.HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                    },
-                ]
-                
-                response = self.model.generate_content(
-                    prompt,
-                    generation_config=generation_config,
-                    safety_settings=safety_settings
-                )
+                # Output is counted at its maximum, since it is unknown before the call
+                if self.rate_limiter:
+                    self.rate_limiter.acquire(self.estimate_tokens(prompt) + max_tokens)
+                with self._call_slots:
+                    response = self._generate_content(
+                        prompt,
+                        generation_config=generation_config,
+                        safety_settings=self._safety_settings
+                    )
                 
                 # Check for finish reasons that indicate blocked content
                 if response.candidates and len(response.candidates) > 0:
@@ -248,32 +282,79 @@ class GeminiClient(BaseLLMClient):
                 raise
             except Exception as e:
                 if attempt < self.max_retries - 1:
-                    wait_time = self.retry_backoff[min(attempt, len(self.retry_backoff) - 1)]
+                    wait_time = self._retry_delay(attempt)
                     logger.warning(
                         f"Gemini API call failed (attempt {attempt + 1}/{self.max_retries}): {str(e)}. "
-                        f"Retrying in {wait_time}s..."
+                        f"Retrying in {wait_time:.1f}s..."
                     )
                     time.sleep(wait_time)
                 else:
                     logger.error(f"Gemini API call failed after {self.max_retries} attempts: {str(e)}")
                     raise
     
+    def generate_stream(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.0,
+        context: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Generate text using Gemini API, yielding it as it arrives (see BaseLLMClient.generate_stream)
+        
+        Not retried: once output has been yielded, a retry would repeat it.
+        
+        Raises:
+            ValueError: If the stream stops without text (e.g. blocked by safety filters)
+        """
+        max_tokens = max_tokens or self.max_output_tokens
+        if context:
+            logger.info(f"Processing (streamed): {context}")
+        
+        generation_config = self._generation_config_type(
+            max_output_tokens=max_tokens,
+            temperature=temperature
+        )
+        if self.rate_limiter:
+            self.rate_limiter.acquire(self.estimate_tokens(prompt) + max_tokens)
+        with self._call_slots:
+            response = self._generate_content(
+                prompt,
+                generation_config=generation_config,
+                safety_settings=self._safety_settings,
+                stream=True
+            )
+            for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # No text parts: the candidate was blocked or stopped
+                    reason = chunk.candidates[0].finish_reason if chunk.candidates else "blocked prompt"
+                    raise ValueError(f"Gemini stream stopped without content (finish_reason: {reason})")
+                if text:
+                    yield text
+    
     def generate_batch(self, prompts: List[str]) -> List[str]:
         """
-        Generate responses for multiple prompts (sequential for now)
+        Generate responses for multiple prompts concurrently
+        
+        Up to max_workers prompts are in flight at once (subject to the rate limits).
         
         Args:
             prompts: List of prompts
             
         Returns:
-            List of generated texts
+            List of generated texts, in prompt order
         """
-        results = []
-        for i, prompt in enumerate(prompts):
+        def generate_one(i: int) -> str:
             logger.info(f"Processing batch prompt {i + 1}/{len(prompts)}")
-            result = self.generate(prompt)
-            results.append(result)
-        return results
+            return self.generate(prompts[i])
+        
+        workers = min(self.max_workers, len(prompts))
+        if workers <= 1:
+            return [generate_one(i) for i in range(len(prompts))]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gemini-batch") as executor:
+            return list(executor.map(generate_one, range(len(prompts))))
     
     def generate_structured(
         self,
@@ -296,21 +377,15 @@ class GeminiClient(BaseLLMClient):
         
         # Add schema instruction if provided
         if schema:
-            schema_prompt = f"{prompt}\n\nReturn response as valid JSON matching this schema: {json.dumps(schema)}"
+            schema_prompt = f"{prompt}\n\nReturn response as valid JSON matching this schema: {json_dumps(schema)}"
         else:
             schema_prompt = f"{prompt}\n\nReturn response as valid JSON."
         
         response_text = self.generate(schema_prompt, context=context)
         
-        # Try to extract JSON from response
+        # Try to extract JSON from response (inside markdown code blocks if present)
         try:
-            # Remove markdown code blocks if present
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-            
-            return json.loads(response_text)
+            return json_loads(extract_json(response_text))
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON from Gemini response: {e}")
             logger.error(f"Response text: {response_text[:500]}...")
@@ -339,104 +414,7 @@ class GeminiClient(BaseLLMClient):
         Returns:
             List of potentially triggering words found
         """
-        # Common words/phrases that might trigger safety filters in code context
-        # This is a heuristic - actual triggers depend on Gemini's internal filters
-        potential_triggers = []
-        
-        # Convert to lowercase for matching
-        prompt_lower = prompt.lower()
-        
-        # Patterns that might trigger safety filters (context-dependent)
-        trigger_patterns = [
-            r'\b(hack|attack|exploit|vulnerability|inject|bypass)\w*\b',
-            r'\b(kill|destroy|delete|remove|drop|truncate)\w*\b',
-            r'\b(secret|password|token|credential|auth)\w*\b',
-            r'\b(user|admin|root|privilege|access|permission)\w*\b',
-            r'\b(data|info|personal|private|sensitive)\w*\b',
-            r'\b(error|exception|fail|crash|bug|issue)\w*\b',
-            r'\b(test|check|validate|verify|assert)\w*\b',
-        ]
-        
-        import re
-        for pattern in trigger_patterns:
-            matches = re.findall(pattern, prompt_lower, re.IGNORECASE)
-            for match in matches:
-                if match not in potential_triggers:
-                    potential_triggers.append(match)
-        
-        # Return unique triggers, limited to most relevant
-        return list(set(potential_triggers))[:20]
-    
-    def chunk_text(self, text: str, max_tokens: int = 8000) -> List[str]:
-        """
-        Split text into chunks
-        
-        Args:
-            text: Text to chunk
-            max_tokens: Maximum tokens per chunk
-            
-        Returns:
-            List of text chunks
-        """
-        chunks = self.chunking.chunk_file(text, max_tokens=max_tokens)
-        return [chunk.content for chunk in chunks]
-    
-    def process_large_content(
-        self,
-        content: str,
-        system_prompt: str,
-        process_chunk_fn: callable = None,
-        combine_results_fn: callable = None,
-        context: str = None
-    ) -> Any:
-        """
-        Process large content by chunking and combining results
-        
-        Args:
-            content: Large content to process
-            system_prompt: System prompt for each chunk
-            process_chunk_fn: Optional function to process each chunk
-            combine_results_fn: Optional function to combine chunk results
-            
-        Returns:
-            Combined result
-        """
-        chunks = self.chunking.chunk_file(content)
-        
-        if not chunks:
-            return None
-        
-        # If single chunk, process directly
-        if len(chunks) == 1:
-            prompt = f"{system_prompt}\n\nCode:\n{chunks[0].content}"
-            chunk_context = f"{context} (single chunk)" if context else None
-            if process_chunk_fn:
-                return process_chunk_fn(self, prompt)
-            return self.generate(prompt, context=chunk_context)
-        
-        # Process each chunk
-        results = []
-        for i, chunk in enumerate(chunks):
-            logger.info(f"Processing chunk {i + 1}/{len(chunks)} ({chunk.estimated_tokens} tokens)")
-            chunk_prompt = f"{system_prompt}\n\nCode (part {i + 1} of {len(chunks)}):\n{chunk.content}"
-            chunk_context = f"{context} (chunk {i + 1}/{len(chunks)})" if context else None
-            
-            if process_chunk_fn:
-                result = process_chunk_fn(self, chunk_prompt)
-            else:
-                result = self.generate(chunk_prompt, context=chunk_context)
-            
-            results.append(result)
-        
-        # Combine results
-        if combine_results_fn:
-            return combine_results_fn(results)
-        
-        # Default: combine as summary
-        if len(results) > 1:
-            combine_prompt = f"Combine these partial analyses into a single comprehensive result:\n\n" + \
-                           "\n\n---\n\n".join(results)
-            return self.generate(combine_prompt)
-        
-        return results[0] if results else None
-
+        # One case-insensitive scan of the original prompt for all trigger words;
+        # matched stems are lowercased and deduplicated in order of appearance
+        matches = _TRIGGER_RE.findall(prompt)
+        return list(dict.fromkeys(match.lower() for match in matches))[:20]
@@ -4,12 +4,26 @@ import time
 import json
 import logging
 import requests
-from typing import List, Optional, Dict, Any
-from .base_llm_client import BaseLLMClient
+from typing import List, Optional, Dict, Any, Iterator
+from .base_llm_client import BaseLLMClient, shared_http2_client, json_loads, json_dumps, extract_json
+from .rate_limiter import shared_rate_limiter
 from ..utils.chunking import ChunkingStrategy
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
 logger = logging.getLogger(__name__)
 
+# Errors of either transport: httpx (HTTP/2, when installed) or requests
+if httpx is not None:
+    _HTTP_STATUS_ERRORS = (requests.exceptions.HTTPError, httpx.HTTPStatusError)
+    _TRANSPORT_ERRORS = (requests.exceptions.RequestException, httpx.HTTPError)
+else:
+    _HTTP_STATUS_ERRORS = (requests.exceptions.HTTPError,)
+    _TRANSPORT_ERRORS = (requests.exceptions.RequestException,)
+
 
 class GLMClient(BaseLLMClient):
     """Client for GLM API with custom URL support"""
@@ -21,7 +35,10 @@ class GLMClient(BaseLLMClient):
         base_url: Optional[str] = None,
         max_retries: int = 3,
         retry_backoff: List[float] = None,
-        max_output_tokens: int = 8192
+        max_output_tokens: int = 8192,
+        http2: bool = True,
+        rpm_limit: Optional[int] = None,
+        tpm_limit: Optional[int] = None
     ):
         """
         Initialize GLM client
@@ -31,8 +48,11 @@ class GLMClient(BaseLLMClient):
             model: Model name (e.g., "glm-4-6")
             base_url: Base URL for GLM API endpoint (optional)
             max_retries: Maximum retry attempts
-            retry_backoff: Backoff delays in seconds for retries
+            retry_backoff: Optional fixed backoff delays in seconds (default: full-jitter exponential)
             max_output_tokens: Maximum tokens in response
+            http2: Multiplex concurrent requests over HTTP/2 when httpx[http2] is installed
+            rpm_limit: Optional requests-per-minute limit to stay under (shared per model)
+            tpm_limit: Optional tokens-per-minute limit to stay under (shared per model)
         """
         if not model or not model.strip():
             raise ValueError("Model parameter is required for GLM client")
@@ -40,9 +60,18 @@ class GLMClient(BaseLLMClient):
         self.api_token = api_token
         self.model_name = model.strip()
         self.max_retries = max_retries
-        self.retry_backoff = retry_backoff or [2, 5, 10]
+        self.retry_backoff = retry_backoff  # None: full-jitter exponential backoff
         self.max_output_tokens = max_output_tokens
         self.chunking = ChunkingStrategy()
+        self.rate_limiter = shared_rate_limiter("glm", self.model_name, rpm_limit, tpm_limit)
+        # HTTP/2 client when available, else the pooled HTTP/1.1 session; both are
+        # shared process-wide and have the same post()/response API
+        self._transport = (shared_http2_client() if http2 else None) or self.http_session
+        # Sent with every request; the connection pool itself is shared
+        self._headers = {
+            "Authorization": f"Bearer {self.api_token}",
+            "Content-Type": "application/json"
+        }
         
         # Set base URL - default GLM endpoint or custom
         if base_url:
@@ -97,11 +126,6 @@ class GLMClient(BaseLLMClient):
         if context:
             logger.info(f"Processing: {context}")
         
-        headers = {
-            "Authorization": f"Bearer {self.api_token}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "model": self.model_name,
             "messages": [{"role": "user", "content": prompt}],
@@ -111,15 +135,18 @@ class GLMClient(BaseLLMClient):
         
         for attempt in range(self.max_retries):
             try:
-                response = requests.post(
+                # Output is counted at its maximum, since it is unknown before the call
+                if self.rate_limiter:
+                    self.rate_limiter.acquire(self.estimate_tokens(prompt) + max_tokens)
+                response = self._transport.post(
                     self.api_endpoint,
-                    headers=headers,
+                    headers=self._headers,
                     json=payload,
                     timeout=120
                 )
                 
                 response.raise_for_status()
-                response_data = response.json()
+                response_data = json_loads(response.content)
                 
                 # Parse GLM response format (OpenAI-compatible)
                 if "choices" in response_data and len(response_data["choices"]) > 0:
@@ -134,7 +161,7 @@ class GLMClient(BaseLLMClient):
                 
                 raise ValueError(f"Unexpected response format: {response_data}")
                 
-            except requests.exceptions.HTTPError as e:
+            except _HTTP_STATUS_ERRORS as e:
                 # Try to get error details from response
                 error_details = ""
                 try:
@@ -146,9 +173,9 @@ class GLMClient(BaseLLMClient):
                 if response.status_code == 401:
                     raise ValueError(f"Invalid API token: {e}{error_details}")
                 elif response.status_code == 429:
-                    wait_time = self.retry_backoff[min(attempt, len(self.retry_backoff) - 1)]
+                    wait_time = self._retry_delay(attempt, response)
                     if attempt < self.max_retries - 1:
-                        logger.warning(f"Rate limited. Retrying in {wait_time}s...")
+                        logger.warning(f"Rate limited. Retrying in {wait_time:.1f}s...")
                         time.sleep(wait_time)
                         continue
                     raise ValueError(f"Rate limit exceeded: {e}{error_details}")
@@ -160,15 +187,15 @@ class GLMClient(BaseLLMClient):
                     raise ValueError(f"GLM API Bad Request (check endpoint URL, model name, or request format): {e}{error_details}")
                 else:
                     if attempt < self.max_retries - 1:
-                        wait_time = self.retry_backoff[min(attempt, len(self.retry_backoff) - 1)]
-                        logger.warning(f"HTTP error {response.status_code}: {e}{error_details}. Retrying in {wait_time}s...")
+                        wait_time = self._retry_delay(attempt, response)
+                        logger.warning(f"HTTP error {response.status_code}: {e}{error_details}. Retrying in {wait_time:.1f}s...")
                         time.sleep(wait_time)
                         continue
                     raise ValueError(f"GLM API error: {e}{error_details}")
-            except requests.exceptions.RequestException as e:
+            except _TRANSPORT_ERRORS as e:
                 if attempt < self.max_retries - 1:
-                    wait_time = self.retry_backoff[min(attempt, len(self.retry_backoff) - 1)]
-                    logger.warning(f"Request failed (attempt {attempt + 1}/{self.max_retries}): {e}. Retrying in {wait_time}s...")
+                    wait_time = self._retry_delay(attempt)
+                    logger.warning(f"Request failed (attempt {attempt + 1}/{self.max_retries}): {e}. Retrying in {wait_time:.1f}s...")
                     time.sleep(wait_time)
                 else:
                     logger.error(f"GLM API call failed after {self.max_retries} attempts: {e}")
@@ -179,6 +206,25 @@ class GLMClient(BaseLLMClient):
         
         raise ValueError("GLM API call failed after all retries")
     
+    def generate_stream(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.0,
+        context: Optional[str] = None
+    ) -> Iterator[str]:
+        """Generate text using GLM API, yielding it as it arrives (see BaseLLMClient.generate_stream)"""
+        if context:
+            logger.info(f"Processing (streamed): {context}")
+        
+        payload = {
+            "model": self.model_name,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": max_tokens or self.max_output_tokens
+        }
+        return self._stream_chat(self.api_endpoint, self._headers, payload)
+    
     def generate_structured(
         self,
         prompt: str,
@@ -198,21 +244,15 @@ class GLMClient(BaseLLMClient):
         """
         # Add schema instruction if provided
         if schema:
-            schema_prompt = f"{prompt}\n\nReturn response as valid JSON matching this schema: {json.dumps(schema)}"
+            schema_prompt = f"{prompt}\n\nReturn response as valid JSON matching this schema: {json_dumps(schema)}"
         else:
             schema_prompt = f"{prompt}\n\nReturn response as valid JSON."
         
         response_text = self.generate(schema_prompt, context=context)
         
-        # Try to extract JSON from response
+        # Try to extract JSON from response (inside markdown code blocks if present)
         try:
-            # Remove markdown code blocks if present
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-            
-            return json.loads(response_text)
+            return json_loads(extract_json(response_text))
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON from GLM response: {e}")
             logger.error(f"Response text: {response_text[:500]}...")
@@ -1,5 +1,6 @@
 """Factory for creating LLM client instances"""
 
+import os
 import logging
 from typing import Optional
 from .base_llm_client import BaseLLMClient
@@ -12,6 +13,18 @@ from ..config.llm_config_manager import LLMConfigManager
 logger = logging.getLogger(__name__)
 
 
+def _env_int(name: str) -> Optional[int]:
+    """Read a positive integer setting from the environment (None if unset or invalid)"""
+    value = os.getenv(name)
+    if not value:
+        return None
+    try:
+        return int(value) if int(value) > 0 else None
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}={value!r}")
+        return None
+
+
 def create_llm_client(
     provider: str,
     api_token: str,
@@ -38,10 +51,22 @@ def create_llm_client(
     provider = provider.lower().strip()
     
     if provider == "gemini":
-        return GeminiClient(api_token=api_token, model=model)
+        # Optional client-side pacing below the account's quota
+        return GeminiClient(
+            api_token=api_token,
+            model=model,
+            rpm_limit=_env_int("GEMINI_RPM_LIMIT"),
+            tpm_limit=_env_int("GEMINI_TPM_LIMIT")
+        )
     
     elif provider == "glm":
-        return GLMClient(api_token=api_token, model=model, base_url=base_url)
+        return GLMClient(
+            api_token=api_token,
+            model=model,
+            base_url=base_url,
+            rpm_limit=_env_int("GLM_RPM_LIMIT"),
+            tpm_limit=_env_int("GLM_TPM_LIMIT")
+        )
     
     elif provider == "openrouter":
         return OpenRouterClient(api_token=api_token, model=model)
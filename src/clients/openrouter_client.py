@@ -4,8 +4,8 @@ import time
 import json
 import logging
 import requests
-from typing import List, Optional, Dict, Any
-from .base_llm_client import BaseLLMClient
+from typing import List, Optional, Dict, Any, Iterator
+from .base_llm_client import BaseLLMClient, json_loads, json_dumps, extract_json
 from ..utils.chunking import ChunkingStrategy
 
 logger = logging.getLogger(__name__)
@@ -29,7 +29,7 @@ class OpenRouterClient(BaseLLMClient):
             api_token: OpenRouter API token
             model: Model name in format "provider/model-name" (e.g., "deepseek/deepseek-chat-v3.1:free")
             max_retries: Maximum retry attempts
-            retry_backoff: Backoff delays in seconds for retries
+            retry_backoff: Optional fixed backoff delays in seconds (default: full-jitter exponential)
             max_output_tokens: Maximum tokens in response
         """
         if not model or not model.strip():
@@ -38,10 +38,17 @@ class OpenRouterClient(BaseLLMClient):
         self.api_token = api_token
         self.model_name = model.strip()
         self.max_retries = max_retries
-        self.retry_backoff = retry_backoff or [2, 5, 10]
+        self.retry_backoff = retry_backoff  # None: full-jitter exponential backoff
         self.max_output_tokens = max_output_tokens
         self.chunking = ChunkingStrategy()
         self.api_endpoint = "https://openrouter.ai/api/v1/chat/completions"
+        # Sent with every request; the connection pool itself is shared (see BaseLLMClient.http_session)
+        self._headers = {
+            "Authorization": f"Bearer {self.api_token}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://github.com/coding-agent",  # Optional but recommended
+            "X-Title": "Coding Agent"  # Optional but recommended
+        }
     
     def generate(
         self,
@@ -67,13 +74,6 @@ class OpenRouterClient(BaseLLMClient):
         if context:
             logger.info(f"Processing: {context}")
         
-        headers = {
-            "Authorization": f"Bearer {self.api_token}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://github.com/coding-agent",  # Optional but recommended
-            "X-Title": "Coding Agent"  # Optional but recommended
-        }
-        
         payload = {
             "model": self.model_name,
             "messages": [{"role": "user", "content": prompt}],
@@ -83,15 +83,15 @@ class OpenRouterClient(BaseLLMClient):
         
         for attempt in range(self.max_retries):
             try:
-                response = requests.post(
+                response = self.http_session.post(
                     self.api_endpoint,
-                    headers=headers,
+                    headers=self._headers,
                     json=payload,
                     timeout=120
                 )
                 
                 response.raise_for_status()
-                response_data = response.json()
+                response_data = json_loads(response.content)
                 
                 # Parse OpenRouter response format (OpenAI-compatible)
                 if "choices" in response_data and len(response_data["choices"]) > 0:
@@ -106,23 +106,23 @@ class OpenRouterClient(BaseLLMClient):
                 if response.status_code == 401:
                     raise ValueError(f"Invalid API token: {e}")
                 elif response.status_code == 429:
-                    wait_time = self.retry_backoff[min(attempt, len(self.retry_backoff) - 1)]
+                    wait_time = self._retry_delay(attempt, response)
                     if attempt < self.max_retries - 1:
-                        logger.warning(f"Rate limited. Retrying in {wait_time}s...")
+                        logger.warning(f"Rate limited. Retrying in {wait_time:.1f}s...")
                         time.sleep(wait_time)
                         continue
                     raise ValueError(f"Rate limit exceeded: {e}")
                 else:
                     if attempt < self.max_retries - 1:
-                        wait_time = self.retry_backoff[min(attempt, len(self.retry_backoff) - 1)]
-                        logger.warning(f"HTTP error {response.status_code}: {e}. Retrying in {wait_time}s...")
+                        wait_time = self._retry_delay(attempt, response)
+                        logger.warning(f"HTTP error {response.status_code}: {e}. Retrying in {wait_time:.1f}s...")
                         time.sleep(wait_time)
                         continue
                     raise ValueError(f"OpenRouter API error: {e}")
             except requests.exceptions.RequestException as e:
                 if attempt < self.max_retries - 1:
-                    wait_time = self.retry_backoff[min(attempt, len(self.retry_backoff) - 1)]
-                    logger.warning(f"Request failed (attempt {attempt + 1}/{self.max_retries}): {e}. Retrying in {wait_time}s...")
+                    wait_time = self._retry_delay(attempt)
+                    logger.warning(f"Request failed (attempt {attempt + 1}/{self.max_retries}): {e}. Retrying in {wait_time:.1f}s...")
                     time.sleep(wait_time)
                 else:
                     logger.error(f"OpenRouter API call failed after {self.max_retries} attempts: {e}")
@@ -133,6 +133,25 @@ class OpenRouterClient(BaseLLMClient):
         
         raise ValueError("OpenRouter API call failed after all retries")
     
+    def generate_stream(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.0,
+        context: Optional[str] = None
+    ) -> Iterator[str]:
+        """Generate text using OpenRouter API, yielding it as it arrives (see BaseLLMClient.generate_stream)"""
+        if context:
+            logger.info(f"Processing (streamed): {context}")
+        
+        payload = {
+            "model": self.model_name,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": max_tokens or self.max_output_tokens
+        }
+        return self._stream_chat(self.api_endpoint, self._headers, payload)
+    
     def generate_structured(
         self,
         prompt: str,
@@ -152,21 +171,15 @@ class OpenRouterClient(BaseLLMClient):
         """
         # Add schema instruction if provided
         if schema:
-            schema_prompt = f"{prompt}\n\nReturn response as valid JSON matching this schema: {json.dumps(schema)}"
+            schema_prompt = f"{prompt}\n\nReturn response as valid JSON matching this schema: {json_dumps(schema)}"
         else:
             schema_prompt = f"{prompt}\n\nReturn response as valid JSON."
         
         response_text = self.generate(schema_prompt, context=context)
         
-        # Try to extract JSON from response
+        # Try to extract JSON from response (inside markdown code blocks if present)
         try:
-            # Remove markdown code blocks if present
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-            
-            return json.loads(response_text)
+            return json_loads(extract_json(response_text))
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON from OpenRouter response: {e}")
             logger.error(f"Response text: {response_text[:500]}...")
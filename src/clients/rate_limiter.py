@@ -0,0 +1,97 @@
+"""Client-side request/token rate limiting for LLM providers"""
+
+import time
+import threading
+from collections import deque
+from typing import Optional, Dict, Tuple
+
+
+class RateLimiter:
+    """
+    Rolling-window limiter for requests per minute and tokens per minute
+    
+    acquire() blocks until a request of the given size fits in both limits
+    over the last `window` seconds. Thread-safe, so one limiter can pace all
+    concurrent calls of a client.
+    """
+    
+    def __init__(self, rpm_limit: Optional[int] = None, tpm_limit: Optional[int] = None, window: float = 60.0):
+        """
+        Initialize rate limiter
+        
+        Args:
+            rpm_limit: Maximum requests per window (unlimited if not set)
+            tpm_limit: Maximum tokens (input + output) per window (unlimited if not set)
+            window: Window length in seconds
+        """
+        self.rpm_limit = rpm_limit
+        self.tpm_limit = tpm_limit
+        self.window = window
+        self._events = deque()  # (timestamp, tokens) of requests within the window
+        self._tokens = 0
+        self._lock = threading.Lock()
+    
+    def acquire(self, tokens: int = 0):
+        """
+        Wait until a request of `tokens` tokens may be sent, then record it
+        
+        A request larger than tpm_limit on its own is let through once the
+        window is empty, rather than blocking forever.
+        
+        Args:
+            tokens: Estimated tokens of the request (input + output)
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._events and now - self._events[0][0] >= self.window:
+                    self._tokens -= self._events.popleft()[1]
+                
+                fits_rpm = self.rpm_limit is None or len(self._events) < self.rpm_limit
+                fits_tpm = self.tpm_limit is None or not self._events or self._tokens + tokens <= self.tpm_limit
+                if fits_rpm and fits_tpm:
+                    self._events.append((now, tokens))
+                    self._tokens += tokens
+                    return
+                
+                # Earliest moment the oldest request leaves the window
+                wait = self._events[0][0] + self.window - now
+            time.sleep(max(wait, 0.01))
+
+
+_shared_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def shared_rate_limiter(
+    provider: str,
+    model: str,
+    rpm_limit: Optional[int] = None,
+    tpm_limit: Optional[int] = None
+) -> Optional[RateLimiter]:
+    """
+    Return the RateLimiter shared by all clients of one provider model
+    
+    Provider quotas apply per model and account, not per client object, so
+    every client instance of a model (one per conversion or agent) draws
+    from the same budget.
+    
+    Args:
+        provider: Provider name (e.g. "gemini")
+        model: Model name
+        rpm_limit: Maximum requests per minute (unlimited if not set)
+        tpm_limit: Maximum tokens per minute (unlimited if not set)
+        
+    Returns:
+        Shared limiter (its limits updated to the given ones), or None if neither limit is set
+    """
+    if not rpm_limit and not tpm_limit:
+        return None
+    key = (provider, model)
+    with _shared_limiters_lock:
+        limiter = _shared_limiters.get(key)
+        if limiter is None:
+            limiter = _shared_limiters[key] = RateLimiter(rpm_limit, tpm_limit)
+        else:
+            limiter.rpm_limit, limiter.tpm_limit = rpm_limit, tpm_limit
+        return limiter
@@ -8,6 +8,39 @@ from ..clients.llm_client_factory import create_llm_client_from_config
 
 logger = logging.getLogger(__name__)
 
+# Conversion requirements shared by single-entity and batched prompts
+SEQUELIZE_MODEL_REQUIREMENTS = """Requirements:
+1. Map JPA annotations to Sequelize equivalents:
+   - @Entity -> model definition
+   - @Table(name="...") -> tableName in options
+   - @Id -> primaryKey
+   - @GeneratedValue -> autoIncrement
+   - @Column(name="...", nullable=...) -> fieldName and allowNull
+   - @ManyToOne, @OneToMany, @ManyToMany -> associations
+   - @JoinColumn -> foreign key definition
+
+2. Convert Java types to Sequelize DataTypes:
+   - String -> DataTypes.STRING
+   - Integer -> DataTypes.INTEGER
+   - Long -> DataTypes.BIGINT
+   - Double/Float -> DataTypes.DOUBLE/FLOAT
+   - Boolean -> DataTypes.BOOLEAN
+   - Date/LocalDateTime -> DataTypes.DATE
+   - BigDecimal -> DataTypes.DECIMAL
+
+3. Generate complete Sequelize model with:
+   - Proper model definition
+   - All fields with correct types
+   - Primary key configuration
+   - Table name mapping
+   - Relationships (associations)
+   - Timestamps if @Entity has @MappedSuperclass or uses @CreatedDate/@LastModifiedDate
+
+4. Use Sequelize v6 syntax"""
+
+# Entities above this size are converted individually instead of in a batch
+BATCH_ENTITY_MAX_TOKENS = 2000
+
 
 class ModelConverter:
     """Converts JPA entities to Sequelize models"""
@@ -108,6 +141,102 @@ class ModelConverter:
             logger.error(f"Failed to convert entity {entity_metadata.get('name', 'unknown')}: {e}")
             return self._create_stub_model(entity_metadata)
     
+    def convert_entities_batch(self, entities: List[Dict], java_codes: List[str]) -> List[Dict[str, Any]]:
+        """
+        Convert several JPA entities with a single LLM request
+        
+        Small entities are sent together in one prompt that returns a JSON
+        object with one model per numbered entity; large entities, entities
+        missing from the response, or a failed batch fall back to convert_entity().
+        
+        Args:
+            entities: Entity metadata dicts
+            java_codes: Java source code for each entity (same order)
+            
+        Returns:
+            Converted models in the same order as entities
+        """
+        results = [None] * len(entities)
+        batch = []
+        for i, (entity, java_code) in enumerate(zip(entities, java_codes)):
+            if self.client and java_code and self.client.estimate_tokens(java_code) <= BATCH_ENTITY_MAX_TOKENS:
+                batch.append(i)
+        
+        # A batch of one gains nothing over the single-entity prompt
+        if len(batch) > 1:
+            try:
+                converted = self._convert_batch_with_llm(
+                    [entities[i] for i in batch], [java_codes[i] for i in batch]
+                )
+                for position, i in enumerate(batch):
+                    code = converted.get(position)
+                    if code:
+                        results[i] = {
+                            "name": entities[i].get("name", "Unknown"),
+                            "file_path": f"models/{entities[i].get('name', 'Unknown')}.js",
+                            "code": code,
+                            "table_name": self._extract_table_name(java_codes[i]),
+                            "type": "model"
+                        }
+            except Exception as e:
+                logger.warning(f"Batched model conversion failed, converting entities individually: {e}")
+        
+        for i, result in enumerate(results):
+            if result is None:
+                results[i] = self.convert_entity(entities[i], java_codes[i])
+        return results
+    
+    def _convert_batch_with_llm(self, entities: List[Dict], java_codes: List[str]) -> Dict[int, str]:
+        """
+        Convert a batch of entities in one request
+        
+        Models are matched to entities by the "index" the prompt numbers them
+        with; a model without a valid index is matched by name only when that
+        name is unique in the batch, so duplicated names fall back to
+        single-entity conversion.
+        
+        Returns:
+            Model code keyed by position in entities
+        """
+        sections = []
+        for i, (entity, java_code) in enumerate(zip(entities, java_codes), 1):
+            sections.append(f"""Entity {i}: {entity.get("name", "Unknown")}
+```java
+{java_code}
+```""")
+        entities_text = "\n\n".join(sections)
+        
+        prompt = f"""Convert each of the following {len(entities)} JPA entities to a separate Sequelize model.
+
+{entities_text}
+
+{SEQUELIZE_MODEL_REQUIREMENTS}
+
+Return a JSON object of the form {{"models": [{{"index": <entity number>, "name": "<entity name>", "code": "<complete model code>"}}]}} with exactly one entry per entity."""
+        
+        response = self.client.generate_structured(
+            prompt,
+            context=f"Model Conversion (Batch of {len(entities)})"
+        )
+        models = response.get("models", []) if isinstance(response, dict) else response
+        
+        names = [entity.get("name", "Unknown") for entity in entities]
+        unique_names = {name: position for position, name in enumerate(names) if names.count(name) == 1}
+        converted = {}
+        for model in models or []:
+            if not isinstance(model, dict) or not model.get("code"):
+                continue
+            index = model.get("index")
+            if isinstance(index, str) and index.strip().isdigit():
+                index = int(index)
+            if isinstance(index, int) and not isinstance(index, bool) and 1 <= index <= len(entities):
+                position = index - 1
+            else:
+                position = unique_names.get(model.get("name"))
+            if position is not None and position not in converted:
+                converted[position] = model["code"]
+        return converted
+    
     def _convert_with_llm(self, entity_metadata: Dict, java_code: str) -> Dict[str, Any]:
         """Convert using LLM for better accuracy with chunking support for large entities"""
         
@@ -127,34 +256,7 @@ Java Entity Code:
 {java_code[:8000] if not self.client else java_code}
 ```
 
-Requirements:
-1. Map JPA annotations to Sequelize equivalents:
-   - @Entity -> model definition
-   - @Table(name="...") -> tableName in options
-   - @Id -> primaryKey
-   - @GeneratedValue -> autoIncrement
-   - @Column(name="...", nullable=...) -> fieldName and allowNull
-   - @ManyToOne, @OneToMany, @ManyToMany -> associations
-   - @JoinColumn -> foreign key definition
-
-2. Convert Java types to Sequelize DataTypes:
-   - String -> DataTypes.STRING
-   - Integer -> DataTypes.INTEGER
-   - Long -> DataTypes.BIGINT
-   - Double/Float -> DataTypes.DOUBLE/FLOAT
-   - Boolean -> DataTypes.BOOLEAN
-   - Date/LocalDateTime -> DataTypes.DATE
-   - BigDecimal -> DataTypes.DECIMAL
-
-3. Generate complete Sequelize model with:
-   - Proper model definition
-   - All fields with correct types
-   - Primary key configuration
-   - Table name mapping
-   - Relationships (associations)
-   - Timestamps if @Entity has @MappedSuperclass or uses @CreatedDate/@LastModifiedDate
-
-4. Use Sequelize v6 syntax
+{SEQUELIZE_MODEL_REQUIREMENTS}
 
 Return only the complete model code, no explanations."""
 
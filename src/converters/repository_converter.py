@@ -70,13 +70,19 @@ class RepositoryConverter:
             # No LLM client available - will use regex/metadata-based conversion
             self.client = None
     
-    def convert_repository(self, repo_metadata: Dict, entity_metadata: Optional[Dict] = None) -> Dict[str, Any]:
+    def convert_repository(
+        self,
+        repo_metadata: Dict,
+        entity_metadata: Optional[Dict] = None,
+        java_code: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Convert JPA repository to Sequelize DAO
         
         Args:
             repo_metadata: Repository metadata with 'name', 'filePath', 'methods', etc.
             entity_metadata: Optional entity metadata for type information
+            java_code: Optional Java repository source (read from 'filePath' if not provided)
             
         Returns:
             Dictionary with:
@@ -90,14 +96,15 @@ class RepositoryConverter:
         try:
             # Read Java repository code from file path if not provided as parameter
             # This handles cases where only metadata is available but we need the actual code
-            java_code = ""
-            if repo_metadata.get("filePath"):
-                try:
-                    with open(repo_metadata["filePath"], 'r', encoding='utf-8') as f:
-                        java_code = f.read()
-                except Exception:
-                    # File read failed - will proceed with metadata-based conversion
-                    pass
+            if java_code is None:
+                java_code = ""
+                if repo_metadata.get("filePath"):
+                    try:
+                        with open(repo_metadata["filePath"], 'r', encoding='utf-8') as f:
+                            java_code = f.read()
+                    except Exception:
+                        # File read failed - will proceed with metadata-based conversion
+                        pass
             
             # Choose conversion strategy based on available resources:
             # - LLM conversion: Higher quality, preserves Spring Data query methods better
@@ -2,6 +2,7 @@
 
 import json
 import logging
+import threading
 from typing import Dict, List, Any, Optional
 from ..clients.llm_client_factory import create_llm_client_from_config
 from ..clients.base_llm_client import BaseLLMClient
@@ -22,7 +23,8 @@ class MetadataExtractor:
         profile_name: Optional[str] = None,
         config_path: Optional[str] = None,
         # Legacy support
-        gemini_api_token: Optional[str] = None
+        gemini_api_token: Optional[str] = None,
+        cancel_event: Optional[threading.Event] = None
     ):
         """
         Initialize metadata extractor
@@ -36,7 +38,10 @@ class MetadataExtractor:
             profile_name: Profile name from config file
             config_path: Path to config file
             gemini_api_token: Legacy parameter (deprecated, use provider="gemini" with api_token)
+            cancel_event: Once set, the remaining files are skipped (run cancelled)
         """
+        self.cancel_event = cancel_event
+        
         # If client provided, use it directly
         if llm_client:
             self.client = llm_client
@@ -111,14 +116,15 @@ class MetadataExtractor:
             logger.info(f"Processing {len(files)} {category} files...")
             
             for file_info in files:
+                if self._cancelled():
+                    break
                 file_path = file_info.get('relative_path', file_info.get('path', 'unknown'))
                 logger.info(f"Extracting metadata from: {file_path}")
                 
                 # Update execution status
                 try:
-                    from ..agents.orchestrator import _execution_status
-                    _execution_status["current_file"] = file_path
-                    _execution_status["files_processed"] = len(modules)
+                    from ..agents.orchestrator import set_current_file
+                    set_current_file(file_path)
                 except:
                     pass
                 
@@ -148,8 +154,8 @@ class MetadataExtractor:
                         
                         # Update execution status
                         try:
-                            from ..agents.orchestrator import _execution_status
-                            _execution_status["files_processed"] = len(modules)
+                            from ..agents.orchestrator import increment_files_processed
+                            increment_files_processed()
                         except:
                             pass
                 except ValueError as e:
@@ -159,12 +165,8 @@ class MetadataExtractor:
                         logger.error(f"⚠️  Safety filter blocked: {file_path}")
                         logger.error(f"   Error: {error_msg[:200]}...")
                         # Store safety block info
-                        from ..agents.orchestrator import _execution_status
-                        _execution_status["safety_blocks"].append({
-                            "file": file_path,
-                            "category": category,
-                            "error": error_msg
-                        })
+                        from ..agents.orchestrator import append_safety_block
+                        append_safety_block(file_path, category, error_msg)
                     logger.warning(f"Failed to extract metadata for {file_path}: {error_msg}")
                     quality_stats["failed"] += 1
                 except Exception as e:
@@ -250,6 +252,13 @@ class MetadataExtractor:
                 "modules": []
             }
     
+    def _cancelled(self) -> bool:
+        """Whether the run was cancelled, logging it once the extraction stops"""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            logger.info("Metadata extraction cancelled")
+            return True
+        return False
+    
     def _build_structure_summary(self, file_map: Dict[str, List[Dict]]) -> str:
         """Build summary of file structure for context"""
         summary = "Project structure:\n"
@@ -316,22 +325,22 @@ Return only the overview text, no additional formatting."""
         
         # Update execution status
         try:
-            from ..agents.orchestrator import _execution_status
-            _execution_status["files_total"] = len(all_files)
-            _execution_status["files_processed"] = 0
+            from ..agents.orchestrator import set_files_total
+            set_files_total(len(all_files))
         except:
             pass
         
         # Process files, using consolidated codebase content
         for idx, (file_info, category) in enumerate(all_files):
+            if self._cancelled():
+                break
             file_path = file_info.get('relative_path', file_info.get('path', 'unknown'))
             class_name = file_info.get('class_name', 'Unknown')
             
             # Update execution status
             try:
-                from ..agents.orchestrator import _execution_status
-                _execution_status["current_file"] = file_path
-                _execution_status["files_processed"] = idx
+                from ..agents.orchestrator import set_current_file
+                set_current_file(file_path)
             except:
                 pass
             
@@ -367,12 +376,8 @@ Return only the overview text, no additional formatting."""
                 error_msg = str(e)
                 if "safety filters" in error_msg.lower():
                     logger.error(f"⚠️  Safety filter blocked: {file_path}")
-                    from ..agents.orchestrator import _execution_status
-                    _execution_status["safety_blocks"].append({
-                        "file": file_path,
-                        "category": category,
-                        "error": error_msg
-                    })
+                    from ..agents.orchestrator import append_safety_block
+                    append_safety_block(file_path, category, error_msg)
                 logger.warning(f"Failed to extract metadata for {file_path}: {error_msg}")
                 # Create minimal metadata entry using enhanced fallback
                 fallback_metadata = self._extract_basic_metadata(file_info, category)
@@ -388,6 +393,13 @@ Return only the overview text, no additional formatting."""
                 quality_stats["total"] += 1
                 quality_stats["failed"] += 1
                 quality_stats["fallback_used"] += 1
+            
+            # Update execution status
+            try:
+                from ..agents.orchestrator import increment_files_processed
+                increment_files_processed()
+            except:
+                pass
         
         # Calculate quality statistics
         if quality_stats["scores"]:
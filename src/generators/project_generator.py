@@ -2,6 +2,7 @@
 
 import os
 import json
+import shutil
 import logging
 from typing import Dict, List, Any
 
@@ -183,7 +184,12 @@ class ProjectGenerator:
         return f"/api/{base}"
     
     def _write_components(self, output_path: str, components: Dict[str, List[Dict]]):
-        """Write all converted components to files"""
+        """
+        Write all converted components to files
+        
+        Components carry their code inline ("code") or, when it was large, in a
+        file written during conversion ("code_file"), which is copied into place.
+        """
         
         component_types = ["models", "repositories", "services", "controllers"]
         
@@ -192,6 +198,7 @@ class ProjectGenerator:
             for component in comp_list:
                 file_path = component.get("file_path", "")
                 code = component.get("code", "")
+                code_file = component.get("code_file")
                 
                 if file_path and code:
                     full_path = os.path.join(output_path, file_path)
@@ -201,6 +208,15 @@ class ProjectGenerator:
                         f.write(code)
                     
                     logger.debug(f"Wrote {file_path}")
+                elif file_path and code_file:
+                    if not os.path.exists(code_file):
+                        logger.warning(f"Converted code for {file_path} is missing ({code_file})")
+                        continue
+                    full_path = os.path.join(output_path, file_path)
+                    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                    shutil.copyfile(code_file, full_path)
+                    
+                    logger.debug(f"Wrote {file_path}")
     
     def _generate_readme(self, output_path: str, metadata: Dict):
         """Generate comprehensive README.md with all required sections"""
@@ -0,0 +1,18 @@
+# tests/test_base_llm_client.py
+
+import json
+from src.clients.base_llm_client import extract_json
+
+def test_extract_json_plain():
+    """Test a response without fences is returned unchanged"""
+    assert extract_json('{"a": 1}') == '{"a": 1}'
+
+def test_extract_json_fenced():
+    """Test the ```json fence is preferred over other fences"""
+    text = 'Here:\n```js\nconst a = 1;\n```\n```json\n{"a": 1}\n```\nDone.'
+    assert json.loads(extract_json(text)) == {"a": 1}
+
+def test_extract_json_generic_fence():
+    """Test a plain ``` fence is used when there is no ```json fence"""
+    text = 'Result:\n```\n[1, 2]\n```'
+    assert json.loads(extract_json(text)) == [1, 2]
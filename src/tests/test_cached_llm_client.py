@@ -0,0 +1,87 @@
+# tests/test_cached_llm_client.py
+
+from src.clients.base_llm_client import BaseLLMClient
+from src.clients.cached_llm_client import LLMCache, CachingLLMClient
+
+class FakeClient(BaseLLMClient):
+    """Provider client returning canned responses and counting calls"""
+    
+    def __init__(self):
+        self.model_name = "fake-model"
+        self.calls = 0
+    
+    def generate(self, prompt, max_tokens=None, temperature=0.0, context=None):
+        self.calls += 1
+        return f"response to {prompt}"
+    
+    def generate_stream(self, prompt, max_tokens=None, temperature=0.0, context=None):
+        self.calls += 1
+        yield "response "
+        yield f"to {prompt}"
+    
+    def generate_structured(self, prompt, schema=None, context=None):
+        self.calls += 1
+        return {"prompt": prompt}
+    
+    def estimate_tokens(self, text):
+        return len(text) // 4
+
+def test_generate_cached():
+    """Test repeated deterministic requests are served from the cache"""
+    client = FakeClient()
+    cached = CachingLLMClient(client, LLMCache())
+    
+    assert cached.generate("hello") == "response to hello"
+    assert cached.generate("hello") == "response to hello"
+    assert client.calls == 1
+
+def test_generate_not_cached_with_temperature():
+    """Test sampled requests always reach the provider"""
+    client = FakeClient()
+    cached = CachingLLMClient(client, LLMCache())
+    
+    cached.generate("hello", temperature=0.7)
+    cached.generate("hello", temperature=0.7)
+    assert client.calls == 2
+
+def test_generate_stream_delegates():
+    """Test streaming goes to the wrapped client's generate_stream, bypassing the cache"""
+    client = FakeClient()
+    cache = LLMCache()
+    cached = CachingLLMClient(client, cache)
+    
+    assert list(cached.generate_stream("hello")) == ["response ", "to hello"]
+    assert list(cached.generate_stream("hello")) == ["response ", "to hello"]
+    assert client.calls == 2
+    assert cache.stats["size"] == 0
+
+def test_cache_lru_eviction():
+    """Test least recently used entries are evicted beyond max_entries"""
+    cache = LLMCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert cache.stats == {"hits": 3, "misses": 1, "size": 2}
+
+def test_cache_ttl():
+    """Test expired entries are treated as misses"""
+    cache = LLMCache(ttl=-1)
+    cache.set("a", "1")
+    
+    assert cache.get("a") is None
+
+def test_cache_persists_to_disk(tmp_path):
+    """Test entries written to cache_dir are found by a new cache"""
+    LLMCache(cache_dir=str(tmp_path)).set("abcdef", {"models": []})
+    
+    assert LLMCache(cache_dir=str(tmp_path)).get("abcdef") == {"models": []}
+
+def test_cache_key_skips_sampled_requests():
+    """Test requests with temperature > 0 get no cache key"""
+    assert LLMCache.cache_key("m", "generate", {"prompt": "p", "temperature": 0.5}) is None
+    assert LLMCache.cache_key("m", "generate", {"prompt": "p"}) == LLMCache.cache_key("m", "generate", {"prompt": "p"})
@@ -0,0 +1,63 @@
+# tests/test_chunking.py
+
+from src.utils.chunking import Chunk, ChunkingStrategy
+from src.clients.base_llm_client import BaseLLMClient
+
+class FakeClient(BaseLLMClient):
+    """LLM client recording the prompts it receives"""
+    
+    def __init__(self):
+        self.prompts = []
+    
+    def generate(self, prompt, max_tokens=None, temperature=0.0, context=None):
+        self.prompts.append(prompt)
+        return "ok"
+    
+    def generate_structured(self, prompt, schema=None, context=None):
+        return {}
+    
+    def estimate_tokens(self, text):
+        return len(text) // 4
+
+def _chunk(content, line):
+    return Chunk(content=content, start_line=line, end_line=line, estimated_tokens=len(content) // 4)
+
+def test_pack_chunks():
+    """Test consecutive chunks are merged up to the token budget, keeping file order"""
+    chunking = ChunkingStrategy(max_chunk_tokens=10)
+    chunks = [_chunk("a" * 16, 1), _chunk("b" * 16, 2), _chunk("c" * 32, 3), _chunk("d" * 60, 4)]
+    
+    packed = chunking.pack_chunks(chunks)
+    
+    assert [c.content for c in packed] == ["a" * 16 + "\n" + "b" * 16, "c" * 32, "d" * 60]
+    assert [(c.start_line, c.end_line) for c in packed] == [(1, 2), (3, 3), (4, 4)]
+
+def test_process_large_content_packs_small_classes():
+    """Test small classes split apart by the chunker are sent in one request"""
+    client = FakeClient()
+    client.chunking = ChunkingStrategy(max_chunk_tokens=40)
+    classes = [f"public class C{i}\n{{\n    int f{i};\n}}" for i in range(8)]
+    content = "\n".join(classes)
+    
+    def combine(results):
+        return results
+    
+    assert len(client.chunking.chunk_file(content)) > 2
+    results = client.process_large_content(content, "Convert", combine_results_fn=combine)
+    
+    assert len(results) == len(client.prompts) < len(client.chunking.chunk_file(content))
+    assert all(f"class C{i}" in "".join(client.prompts) for i in range(8))
+
+def test_iter_chunks_lazy():
+    """Test chunks are produced on demand and match chunk_file"""
+    chunking = ChunkingStrategy(max_chunk_tokens=40)
+    content = "\n".join(f"public class C{i}\n{{\n    int f{i};\n}}" for i in range(8))
+    
+    chunks = chunking.iter_chunks(content)
+    first = next(chunks)
+    assert first.content.startswith("public class C0")
+    assert [first] + list(chunks) == chunking.chunk_file(content)
+    
+    texts = FakeClient().chunk_text(content, max_tokens=40)
+    assert not isinstance(texts, list)
+    assert list(texts) == [c.content for c in chunking.chunk_file(content)]
@@ -0,0 +1,42 @@
+# tests/test_conversion_validator.py
+
+from src.validators.conversion_validator import ConversionValidator
+
+MODULE = {"name": "UserService", "description": "Manages users", "methods": [{"name": "find"}]}
+
+def test_validate_metadata_stream():
+    """Test metadata given as (key, value) pairs validates like a dict"""
+    validator = ConversionValidator()
+    items = [("modules", [MODULE]), ("projectOverview", "Overview")]
+    
+    result = validator.validate_metadata_stream(iter(items))
+    
+    assert result["valid"]
+    assert result["warnings"] == []
+    assert validator.validate_metadata(dict(items)) == result
+
+def test_validate_metadata_stream_no_modules():
+    """Test empty modules are a fatal error"""
+    validator = ConversionValidator()
+    
+    result = validator.validate_metadata_stream(iter([("projectOverview", "Overview"), ("modules", [])]))
+    
+    assert not result["valid"]
+    assert result["errors"] == ["No modules found in metadata"]
+
+def test_validate_metadata_none():
+    """Test None metadata is reported instead of raising"""
+    result = ConversionValidator().validate_metadata(None)
+    
+    assert not result["valid"]
+
+def test_validate_project_fail_fast(tmp_path):
+    """Test fail-fast stops at the first fatal error"""
+    validator = ConversionValidator()
+    
+    result = validator.validate_project(str(tmp_path), fail_fast=True)
+    assert not result["valid"]
+    assert result["errors"] == ["package.json not found"]
+    
+    result = validator.validate_project(str(tmp_path))
+    assert "server.js not found" in result["errors"]
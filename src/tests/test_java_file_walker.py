@@ -0,0 +1,29 @@
+# tests/test_java_file_walker.py
+
+import os
+from src.analyzers.repository_analyzer import _walk_java_files
+
+def _touch(root, relative_path):
+    path = os.path.join(root, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "w").close()
+
+def test_walk_java_files(tmp_path):
+    """Test tests, VCS data and module build output are skipped, but build packages are not"""
+    root = str(tmp_path)
+    _touch(root, "pom.xml")
+    _touch(root, "src/main/java/com/acme/App.java")
+    _touch(root, "src/main/java/com/acme/build/Builder.java")
+    _touch(root, "src/main/java/com/acme/AppTest.java")
+    _touch(root, "src/test/java/com/acme/Helper.java")
+    _touch(root, "target/generated/Generated.java")
+    _touch(root, ".git/objects/Blob.java")
+    _touch(root, "node_modules/pkg/Lib.java")
+    _touch(root, "README.md")
+    
+    found = sorted(os.path.relpath(path, root) for path in _walk_java_files(root))
+    
+    assert found == [
+        os.path.join("src", "main", "java", "com", "acme", "App.java"),
+        os.path.join("src", "main", "java", "com", "acme", "build", "Builder.java")
+    ]
@@ -0,0 +1,39 @@
+# tests/test_job_store.py
+
+import asyncio
+import json
+from src.api.job_store import InMemoryJobStore, new_job
+
+def test_in_memory_job_store():
+    """Test job creation, updates, errors and cached metadata JSON"""
+    async def run():
+        store = InMemoryJobStore()
+        await store.create("job-1", new_job())
+        
+        await store.update("job-1", {"status": "processing", "metadata": {"modules": []}})
+        await store.append_error("job-1", "first")
+        await store.append_error("job-1", "first")
+        
+        job = await store.get("job-1")
+        assert job["status"] == "processing"
+        assert job["errors"] == ["first", "first"]
+        assert json.loads(await store.get_metadata_json("job-1")) == {"modules": []}
+        
+        assert await store.get("missing") is None
+        await store.update("missing", {"status": "failed"})
+        assert await store.get("missing") is None
+    
+    asyncio.run(run())
+
+def test_in_memory_job_queue():
+    """Test queued jobs are handed out in order"""
+    async def run():
+        store = InMemoryJobStore()
+        await store.enqueue("job-1", {"model": "a"})
+        await store.enqueue("job-2", {"model": "b"})
+        
+        assert await store.queue_length() == 2
+        assert await store.dequeue() == ("job-1", {"model": "a"})
+        assert await store.dequeue() == ("job-2", {"model": "b"})
+    
+    asyncio.run(run())
@@ -0,0 +1,50 @@
+# tests/test_model_converter.py
+
+from src.converters.model_converter import ModelConverter
+
+USER_JAVA = '@Entity\n@Table(name="users")\npublic class User { @Id private Long id; }'
+ORDER_JAVA = '@Entity\n@Table(name="orders")\npublic class Order { @Id private Long id; }'
+
+class FakeClient:
+    """LLM client returning a canned batch response and recording single conversions"""
+    
+    def __init__(self, models):
+        self.models = models
+        self.single_calls = 0
+    
+    def estimate_tokens(self, text):
+        return len(text) // 4
+    
+    def generate_structured(self, prompt, schema=None, context=None):
+        return {"models": self.models}
+    
+    def generate(self, prompt, max_tokens=None, temperature=0.0, context=None):
+        self.single_calls += 1
+        return "single"
+
+def test_batch_matches_by_index():
+    """Test batched models are matched to entities by index, not by the returned name"""
+    client = FakeClient([
+        {"index": 2, "name": "User", "code": "order model"},
+        {"index": 1, "name": "Order", "code": "user model"}
+    ])
+    converter = ModelConverter(llm_client=client)
+    
+    results = converter.convert_entities_batch([{"name": "User"}, {"name": "Order"}], [USER_JAVA, ORDER_JAVA])
+    
+    assert [r["code"] for r in results] == ["user model", "order model"]
+    assert [r["table_name"] for r in results] == ["users", "orders"]
+    assert client.single_calls == 0
+
+def test_batch_duplicate_names_fall_back():
+    """Test models without an index are not matched to entities sharing a name"""
+    client = FakeClient([
+        {"name": "User", "code": "first"},
+        {"name": "User", "code": "second"}
+    ])
+    converter = ModelConverter(llm_client=client)
+    
+    results = converter.convert_entities_batch([{"name": "User"}, {"name": "User"}], [USER_JAVA, ORDER_JAVA])
+    
+    assert len(results) == 2
+    assert client.single_calls == 2
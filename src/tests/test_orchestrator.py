@@ -0,0 +1,76 @@
+# tests/test_orchestrator.py
+
+import os
+import threading
+from src.agents.orchestrator import (
+    merge_components,
+    merge_errors,
+    set_files_total,
+    increment_files_processed,
+    get_execution_status,
+    _record_errors,
+    _spill_component_code,
+    _component_spill_dir,
+    COMPONENT_SPILL_MIN_SIZE
+)
+
+def test_merge_components():
+    """Test component groups from parallel converter nodes are merged"""
+    assert merge_components(None, None) == {}
+    assert merge_components({"models": [1]}, {"services": [2]}) == {"models": [1], "services": [2]}
+    assert merge_components({"models": [1]}, None) == {"models": [1]}
+
+def test_merge_errors_keeps_duplicates():
+    """Test error lists are concatenated in order, keeping identical messages"""
+    assert merge_errors(None, None) == []
+    assert merge_errors(["a"], None) == ["a"]
+    assert merge_errors(["a", "b"], ["a"]) == ["a", "b", "a"]
+
+def test_files_processed_across_threads():
+    """Test processed-file counts of finished worker threads are kept"""
+    set_files_total(150)
+    
+    def work():
+        for _ in range(3):
+            increment_files_processed()
+    
+    threads = [threading.Thread(target=work) for _ in range(50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    status = get_execution_status()
+    assert status.files_processed == 150
+    assert status.files_total == 150
+    
+    set_files_total(0)
+    assert get_execution_status().files_processed == 0
+
+def test_node_errors_recorded_for_status():
+    """Test node errors are returned as state and shown as single-line previews"""
+    errors_total = get_execution_status().errors_total
+    
+    assert _record_errors("Clone failed: line one\nline two") == ["Clone failed: line one\nline two"]
+    
+    status = get_execution_status()
+    assert status.errors_total == errors_total + 1
+    assert status.recent_errors[-1]["preview"] == "Clone failed: line one line two"
+
+def test_large_component_code_spilled(tmp_path):
+    """Test large converted code moves to a file that the project generator copies into place"""
+    from src.generators.project_generator import ProjectGenerator
+    state = {"run_id": "test-spill"}
+    code = "x" * COMPONENT_SPILL_MIN_SIZE
+    
+    small = {"name": "A", "file_path": "models/A.js", "code": "a"}
+    batch = _spill_component_code(state, [small, {"name": "B", "file_path": "models/B.js", "code": code}])
+    
+    assert batch[0] is small
+    assert "code" not in batch[1]
+    assert os.path.dirname(batch[1]["code_file"]) == _component_spill_dir("test-spill")
+    
+    ProjectGenerator()._write_components(str(tmp_path), {"models": batch})
+    with open(os.path.join(str(tmp_path), "models", "B.js")) as f:
+        assert f.read() == code
+    os.remove(batch[1]["code_file"])
@@ -0,0 +1,33 @@
+# tests/test_rate_limiter.py
+
+import time
+from src.clients.rate_limiter import RateLimiter, shared_rate_limiter
+
+def test_rpm_limit_waits_for_window():
+    """Test a request over the per-window request limit waits for the window to roll"""
+    limiter = RateLimiter(rpm_limit=2, window=0.2)
+    
+    start = time.monotonic()
+    limiter.acquire()
+    limiter.acquire()
+    assert time.monotonic() - start < 0.1
+    
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.19
+
+def test_oversized_request_not_blocked_forever():
+    """Test a request larger than the token limit passes once the window is empty"""
+    limiter = RateLimiter(tpm_limit=10, window=0.2)
+    
+    start = time.monotonic()
+    limiter.acquire(tokens=50)
+    assert time.monotonic() - start < 0.1
+
+def test_shared_rate_limiter():
+    """Test clients of one provider model share a limiter"""
+    assert shared_rate_limiter("test-provider", "model-a") is None
+    
+    limiter = shared_rate_limiter("test-provider", "model-a", rpm_limit=10)
+    assert shared_rate_limiter("test-provider", "model-a", rpm_limit=20) is limiter
+    assert limiter.rpm_limit == 20
+    assert shared_rate_limiter("test-provider", "model-b", rpm_limit=10) is not limiter
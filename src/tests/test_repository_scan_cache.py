@@ -0,0 +1,46 @@
+# tests/test_repository_scan_cache.py
+
+import os
+import subprocess
+from src.analyzers import repository_analyzer
+from src.analyzers.repository_analyzer import RepositoryAnalyzer
+
+def _git(root, *args):
+    subprocess.run(['git', '-C', root, *args], check=True, capture_output=True)
+
+def _write(root, relative_path, content):
+    path = os.path.join(root, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+def test_scan_cache_keyed_by_blob_id(tmp_path):
+    """Test unchanged files are served from the scan cache and modified files are rescanned"""
+    root = str(tmp_path)
+    _write(root, "src/main/java/com/acme/service/UserService.java", "package com.acme.service;\nclass UserService {}\n")
+    _write(root, "src/main/java/com/acme/Order.java", "package com.acme;\n@Entity\nclass Order {}\n")
+    _git(root, "init", "-q")
+    _git(root, "add", ".")
+    _git(root, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init")
+    
+    analyzer = RepositoryAnalyzer("https://github.com/acme/shop")
+    analyzer.repo_path = root
+    blob_ids = analyzer._git_blob_ids()
+    assert set(blob_ids) == {"src/main/java/com/acme/service/UserService.java", "src/main/java/com/acme/Order.java"}
+    
+    first = analyzer._discover_files()
+    assert [f["class_name"] for f in first["services"]] == ["UserService"]
+    
+    # A cache hit is returned without reading the file
+    service_path = os.path.join("src", "main", "java", "com", "acme", "service", "UserService.java")
+    key = (service_path, blob_ids["src/main/java/com/acme/service/UserService.java"])
+    assert repository_analyzer._scan_cache[key] == ("services", "com.acme.service", "UserService")
+    repository_analyzer._scan_cache[key] = ("services", "com.acme.service", "Cached")
+    assert [f["class_name"] for f in analyzer._discover_files()["services"]] == ["Cached"]
+    
+    # Modified files are not looked up
+    _write(root, service_path, "package com.acme.service;\nclass AccountService {}\n")
+    assert service_path.replace(os.sep, '/') not in analyzer._git_blob_ids()
+    assert [f["class_name"] for f in analyzer._discover_files()["services"]] == ["AccountService"]
+    
+    del repository_analyzer._scan_cache[key]
@@ -1,7 +1,7 @@
 """Token chunking and batching utilities for LLM operations"""
 
 import re
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Iterable, Iterator
 from dataclasses import dataclass
 
 
@@ -64,19 +64,52 @@ class ChunkingStrategy:
         Returns:
             List of Chunk objects
         """
+        return list(self.iter_chunks(file_content, max_tokens))
+    
+    def iter_chunks(self, file_content: str, max_tokens: int = None) -> Iterator[Chunk]:
+        """
+        Split a Java file into chunks by methods/classes, one chunk at a time
+        
+        Each chunk is built only when the consumer asks for it, so a consumer
+        that handles and drops chunks never holds all of them at once.
+        
+        Args:
+            file_content: Full file content
+            max_tokens: Override max chunk tokens
+            
+        Yields:
+            Chunk objects, in file order
+        """
         max_tokens = max_tokens or self.max_chunk_tokens
         
         # If file is small enough, return as single chunk
         if self.estimate_tokens(file_content) <= max_tokens:
-            return [Chunk(
+            yield Chunk(
                 content=file_content,
                 start_line=1,
                 end_line=file_content.count('\n') + 1,
                 estimated_tokens=self.estimate_tokens(file_content)
-            )]
+            )
+            return
         
+        # If still too large, split by methods more aggressively
+        for chunk in self._iter_boundary_chunks(file_content, max_tokens):
+            if chunk.estimated_tokens <= max_tokens:
+                yield chunk
+            else:
+                # Split by methods
+                method_chunks = self._split_by_methods(chunk.content, max_tokens)
+                for mc in method_chunks:
+                    yield Chunk(
+                        content=mc,
+                        start_line=chunk.start_line,
+                        end_line=chunk.end_line,
+                        estimated_tokens=self.estimate_tokens(mc)
+                    )
+    
+    def _iter_boundary_chunks(self, file_content: str, max_tokens: int) -> Iterator[Chunk]:
+        """Split a file at class boundaries, and at method boundaries once a chunk grows past max_tokens"""
         # Split by class boundaries first
-        chunks = []
         lines = file_content.split('\n')
         
         # Find class boundaries
@@ -103,12 +136,12 @@ class ChunkingStrategy:
                     if chunk_content.strip():
                         tokens = self.estimate_tokens(chunk_content)
                         if tokens > 0:
-                            chunks.append(Chunk(
+                            yield Chunk(
                                 content=chunk_content,
                                 start_line=current_start_line,
                                 end_line=i - 1,
                                 estimated_tokens=tokens
-                            ))
+                            )
                     current_chunk_lines = [line]
                     current_start_line = i
                     in_class = True
@@ -127,12 +160,12 @@ class ChunkingStrategy:
                     chunk_content = '\n'.join(current_chunk_lines[:method_boundary])
                     if chunk_content.strip():
                         tokens = self.estimate_tokens(chunk_content)
-                        chunks.append(Chunk(
+                        yield Chunk(
                             content=chunk_content,
                             start_line=current_start_line,
                             end_line=current_start_line + method_boundary - 1,
                             estimated_tokens=tokens
-                        ))
+                        )
                     current_chunk_lines = current_chunk_lines[method_boundary:]
                     current_start_line = current_start_line + method_boundary
         
@@ -141,30 +174,45 @@ class ChunkingStrategy:
             chunk_content = '\n'.join(current_chunk_lines)
             if chunk_content.strip():
                 tokens = self.estimate_tokens(chunk_content)
-                chunks.append(Chunk(
+                yield Chunk(
                     content=chunk_content,
                     start_line=current_start_line,
                     end_line=len(lines),
                     estimated_tokens=tokens
-                ))
+                )
+    
+    def pack_chunks(self, chunks: Iterable[Chunk], max_tokens: int = None) -> List[Chunk]:
+        """
+        Merge consecutive chunks that fit one chunk's token budget together
         
-        # If still too large, split by methods more aggressively
-        final_chunks = []
+        Class and method boundary splits can leave many small chunks; packing
+        them back into contiguous parts of up to max_tokens means one LLM
+        request per part instead of one per chunk.
+        
+        Args:
+            chunks: Consecutive chunks of one file (e.g. from iter_chunks)
+            max_tokens: Override max chunk tokens
+            
+        Returns:
+            List of Chunk objects, in file order
+        """
+        max_tokens = max_tokens or self.max_chunk_tokens
+        
+        packed = []
         for chunk in chunks:
-            if chunk.estimated_tokens <= max_tokens:
-                final_chunks.append(chunk)
+            if packed and packed[-1].estimated_tokens + chunk.estimated_tokens <= max_tokens:
+                previous = packed[-1]
+                content = previous.content + '\n' + chunk.content
+                packed[-1] = Chunk(
+                    content=content,
+                    start_line=previous.start_line,
+                    end_line=chunk.end_line,
+                    estimated_tokens=self.estimate_tokens(content)
+                )
             else:
-                # Split by methods
-                method_chunks = self._split_by_methods(chunk.content, max_tokens)
-                for mc in method_chunks:
-                    final_chunks.append(Chunk(
-                        content=mc,
-                        start_line=chunk.start_line,
-                        end_line=chunk.end_line,
-                        estimated_tokens=self.estimate_tokens(mc)
-                    ))
+                packed.append(chunk)
         
-        return final_chunks
+        return packed
     
     def _find_method_boundary(self, lines: List[str]) -> int:
         """Find a good split point (after a method)"""
@@ -3,7 +3,9 @@
 import os
 import json
 import logging
-from typing import Dict, List, Any
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Iterable, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -15,12 +17,13 @@ class ConversionValidator:
         """Initialize validator"""
         pass
     
-    def validate_project(self, project_path: str) -> Dict[str, Any]:
+    def validate_project(self, project_path: str, fail_fast: bool = False) -> Dict[str, Any]:
         """
         Validate generated project
         
         Args:
             project_path: Path to generated project
+            fail_fast: Stop at the first fatal error instead of running every check
             
         Returns:
             Validation result dictionary:
@@ -40,6 +43,13 @@ class ConversionValidator:
             "controllers": 0,
             "total_files": 0
         }
+        # Returned as-is on fail-fast exits (shares the lists above)
+        failed_result = {
+            "valid": False,
+            "errors": errors,
+            "warnings": warnings,
+            "stats": stats
+        }
         
         # Check if directory exists
         if not os.path.exists(project_path):
@@ -63,11 +73,15 @@ class ConversionValidator:
                         warnings.append("No dependencies in package.json")
             except Exception as e:
                 errors.append(f"Invalid package.json: {e}")
+        if fail_fast and errors:
+            return failed_result
         
         # Validate server.js
         server_path = os.path.join(project_path, "server.js")
         if not os.path.exists(server_path):
             errors.append("server.js not found")
+            if fail_fast:
+                return failed_result
         
         # Validate directory structure
         required_dirs = ["models", "repositories", "services", "routes"]
@@ -81,12 +95,9 @@ class ConversionValidator:
             else:
                 warnings.append(f"{dir_name}/ directory not found")
         
-        # Count total files
-        for root, dirs, files in os.walk(project_path):
-            # Exclude node_modules and .git
-            if 'node_modules' in root or '.git' in root:
-                continue
-            stats["total_files"] += len([f for f in files if f.endswith('.js')])
+        # Count total files (single walk, reused for syntax checking)
+        js_files = self._find_js_files(project_path)
+        stats["total_files"] = len(js_files)
         
         # Validate .env file
         env_path = os.path.join(project_path, ".env")
@@ -103,7 +114,7 @@ class ConversionValidator:
                 warnings.append("config/database.js not found")
         
         # Check for syntax errors in generated files (basic check)
-        self._check_syntax_errors(project_path, errors, warnings)
+        self._check_syntax_errors(js_files, errors, warnings, fail_fast=fail_fast)
         
         valid = len(errors) == 0
         
@@ -114,32 +125,64 @@ class ConversionValidator:
             "stats": stats
         }
     
-    def _check_syntax_errors(self, project_path: str, errors: List[str], warnings: List[str]):
-        """Basic syntax checking for JS files"""
-        import subprocess
-        
+    def _find_js_files(self, project_path: str) -> List[str]:
+        """Collect .js files in the project, skipping node_modules and .git"""
         js_files = []
-        for root, dirs, files in os.walk(project_path):
-            if 'node_modules' in root:
-                continue
-            for file in files:
-                if file.endswith('.js'):
-                    js_files.append(os.path.join(root, file))
-        
-        # Use node --check for basic syntax validation
-        syntax_errors = []
-        for js_file in js_files[:10]:  # Limit to first 10 files
+        pending_dirs = [project_path]
+        while pending_dirs:
+            current_dir = pending_dirs.pop()
             try:
-                result = subprocess.run(
-                    ['node', '--check', js_file],
-                    capture_output=True,
-                    timeout=5
-                )
-                if result.returncode != 0:
-                    syntax_errors.append(f"{js_file}: {result.stderr.decode('utf-8')[:200]}")
-            except Exception:
-                # Skip if node is not available or file cannot be checked
-                pass
+                with os.scandir(current_dir) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in ('node_modules', '.git'):
+                                pending_dirs.append(entry.path)
+                        elif entry.name.endswith('.js'):
+                            js_files.append(entry.path)
+            except OSError as e:
+                logger.warning(f"Cannot read directory {current_dir}: {e}")
+        return sorted(js_files)
+    
+    def _check_file_syntax(self, js_file: str) -> Optional[str]:
+        """Run node --check on a single file, returning an error string or None"""
+        try:
+            result = subprocess.run(
+                ['node', '--check', js_file],
+                capture_output=True,
+                timeout=5
+            )
+            if result.returncode != 0:
+                return f"{js_file}: {result.stderr.decode('utf-8')[:200]}"
+        except Exception:
+            # Skip if node is not available or file cannot be checked
+            pass
+        return None
+    
+    def _check_syntax_errors(
+        self,
+        js_files: List[str],
+        errors: List[str],
+        warnings: List[str],
+        fail_fast: bool = False
+    ):
+        """Basic syntax checking for JS files (stops at the first error when fail_fast is set)"""
+        files_to_check = js_files[:10]  # Limit to first 10 files
+        if not files_to_check:
+            return
+        
+        # Use node --check for basic syntax validation, one process per file in parallel
+        max_workers = min(len(files_to_check), os.cpu_count() or 4)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        syntax_errors = []
+        try:
+            for error in executor.map(self._check_file_syntax, files_to_check):
+                if error:
+                    syntax_errors.append(error)
+                    if fail_fast:
+                        break
+        finally:
+            # Drop checks that haven't started yet when stopping early
+            executor.shutdown(wait=True, cancel_futures=True)
         
         if syntax_errors:
             errors.extend(syntax_errors[:5])  # Limit errors
@@ -166,27 +209,58 @@ class ConversionValidator:
                 "warnings": warnings
             }
         
-        if not metadata.get("projectOverview"):
-            warnings.append("Project overview is missing")
+        return self.validate_metadata_stream(metadata.items())
+    
+    def validate_metadata_stream(self, items: Iterable[Tuple[str, Any]]) -> Dict[str, Any]:
+        """
+        Validate metadata supplied as top-level (key, value) pairs
+        
+        Allows validation while the metadata file is still being parsed
+        (e.g. with ijson.kvitems), stopping at the first fatal error.
+        
+        Args:
+            items: Iterable of top-level metadata (key, value) pairs
+            
+        Returns:
+            Validation result
+        """
+        errors = []
+        warnings = []
+        has_overview = False
+        modules = []
+        
+        for key, value in items:
+            if key == "projectOverview":
+                has_overview = bool(value)
+            elif key == "modules":
+                modules = value or []
+                if not modules:
+                    break
         
-        modules = metadata.get("modules", [])
         if not modules:
             errors.append("No modules found in metadata")
-        else:
-            # Check module completeness
-            incomplete = 0
-            for module in modules:
-                if not module.get("description") or module.get("description") == "":
-                    incomplete += 1
-                if not module.get("methods"):
-                    warnings.append(f"Module {module.get('name', 'Unknown')} has no methods")
-            
-            if incomplete > len(modules) * 0.5:
-                warnings.append(f"{incomplete} modules have incomplete metadata")
+            return {
+                "valid": False,
+                "errors": errors,
+                "warnings": warnings
+            }
+        
+        if not has_overview:
+            warnings.append("Project overview is missing")
+        
+        # Check module completeness
+        incomplete = 0
+        for module in modules:
+            if not module.get("description") or module.get("description") == "":
+                incomplete += 1
+            if not module.get("methods"):
+                warnings.append(f"Module {module.get('name', 'Unknown')} has no methods")
+        
+        if incomplete > len(modules) * 0.5:
+            warnings.append(f"{incomplete} modules have incomplete metadata")
         
         return {
             "valid": len(errors) == 0,
             "errors": errors,
             "warnings": warnings
         }
-